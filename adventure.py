@@ -18,117 +18,285 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 from __future__ import annotations
+import argparse
+import gc
+import hashlib
 import json
-from typing import Optional
+import marshal
+import os
+import sys
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Mapping, Optional
 
 from game_entities import Key, Location, Item, Player, Puzzle
-from proj1_event_logger import Event, EventList
+from game_commands import CommandTable
+from game_descriptions import DESCRIPTIONS_SUFFIX
+from game_graph import MapGraph
+from game_overlay import OverlayLocation, WorldOverlay
+from game_puzzles import PUZZLE_KINDS, LocationWeights, PuzzleAttempt, Validator, compile_puzzles, legacy_kind
+from game_render import Renderer
+from game_world import CompiledWorld, compile_world
+from proj1_event_logger import EventList
+
+MAX_WEIGHT = 11
+# The most locations whose text is cached when the descriptions are kept on disk
+RENDER_CACHE_SIZE = 1024
+
+Objective = tuple[list[int], Optional[list[str]]]
+World = tuple[dict[int, Location], dict[str, Item], dict[str, Key], dict[int, Puzzle], Objective]
+WorldRows = tuple[list[tuple], list[tuple], list[tuple], list[tuple], Objective]
 
 
 class AdventureGame:
     """A text adventure game class storing all location, item, and map data.
 
+    The world itself is shared and never changes during play: the items at and visited flag of each location in
+    this game are kept in an overlay (see game_overlay), and get_location returns the locations as they are in
+    this game. fork returns another game in the same world that costs almost nothing to create.
+
     Instance Attributes:
         - _locations: A dictionary mapping location IDs (int) to Location objects representing
-        every location in the game.
-        - _items: A dictionary mapping item names (str) to Item objects representing all items available in the game.
+        every location in the game (or a LocationTable of views, if the world is compiled).
+        - _items: A dictionary mapping item names (str) to Item objects representing all items available in the game
+        (or an ItemTable of views, if the world is compiled).
         - current_location_id: An integer representing the ID of the current location.
         - ongoing: A boolean flag indicating whether the game is still active.
+        - goal_location_ids: The IDs of the locations the player must bring the goal items to.
+        - goal_items: The names of the items the player must bring to a goal location to win.
         - _keys: A dictionary mapping key names (str) to all Key objects.
         - _puzzles: A dictionary mapping puzzle IDs (int) to all Puzzle objects.
+        - _item_order: The names of all items, in the order they appear in the game data.
+        - _item_names: The names of all items, for fast membership tests.
+        - _key_order: The names of all keys, in the order they appear in the game data.
+        - _key_names: The names of all keys, for fast membership tests.
+        - _validators: A dictionary mapping each puzzle ID to the validator compiled from it.
+        - _graph: The compiled index of the map, or None if it has not been needed since the world was loaded.
+        - _commands: The table of every command of the world, or None if it has not been needed since the world
+        was loaded.
+        - _renderer: The cache of the text shown for each location, or None if it has not been needed since the
+        world was loaded.
+        - _world: The columns _locations and _items are views of, or None if they are Location and Item objects.
+        - _overlay: The items at and visited flag of every location in this game, as changes to _locations.
+        - _fingerprint: A checksum of the map, items and keys of the world, or None if it has not been needed
+        since the world was loaded.
+        - _goal_placement: A dictionary mapping each goal item to the ID of the location it starts at in the
+        world (before any game changes it), with the number of them at a goal location, or None if it has not
+        been needed since the world was loaded.
 
     Representation Invariants:
         - current_location_id is always a key in _locations
+        - all(loc_id in _locations for loc_id in goal_location_ids)
+        - goal_items <= _item_names | _key_names
+        - set(_item_order) == _item_names == set(_items)
+        - set(_key_order) == _key_names == set(_keys)
     """
 
-    _locations: dict[int, Location]
-    _items: dict[str, Item]
+    _locations: Mapping[int, Location]
+    _items: Mapping[str, Item]
     current_location_id: int
     ongoing: bool
+    goal_location_ids: tuple[int, ...]
+    goal_items: frozenset[str]
     _keys: dict[str, Key]
     _puzzles: dict[int, Puzzle]
-
-    def __init__(self, game_data_file: str, initial_location_id: int) -> None:
+    _item_order: tuple[str, ...]
+    _item_names: frozenset[str]
+    _key_order: tuple[str, ...]
+    _key_names: frozenset[str]
+    _validators: dict[int, Validator]
+    _graph: Optional[MapGraph]
+    _commands: Optional[CommandTable]
+    _renderer: Optional[Renderer]
+    _world: Optional[CompiledWorld]
+    _overlay: WorldOverlay
+    _goal_placement: Optional[tuple[dict[str, int], int]]
+    _fingerprint: Optional[int]
+
+    def __init__(self, game_data_file: str, initial_location_id: int, use_snapshot: bool = True,
+                 compiled: bool = False, lazy_descriptions: bool = False) -> None:
         """
         Initialize a new text adventure game.
 
         Parameters:
             game_data_file: The JSON file containing the game data.
             initial_location_id: The starting location ID.
+            use_snapshot: Whether to load from (and refresh) the compiled snapshot of game_data_file.
+            compiled: Whether to store the locations and items as columns (see game_world.CompiledWorld), which
+              uses much less memory for large maps. get_location and get_item then return views.
+            lazy_descriptions: Whether to keep the location descriptions in a memory-mapped sidecar file next to
+              game_data_file (see game_descriptions.DescriptionStore) and read each one only when it is shown.
+              This implies compiled.
         """
-        self._locations, self._items = self._load_game_data1(game_data_file)
-        self._keys, self._puzzles = self._load_game_data2(game_data_file)
+        self.load_world(game_data_file, use_snapshot, compiled, lazy_descriptions)
         self.current_location_id = initial_location_id
         self.ongoing = True
 
-    @staticmethod
-    def _load_game_data1(filename: str) -> tuple[dict[int, Location], dict[str, Item]]:
-        """Load locations and items from a JSON file with the given filename and
-        return a tuple consisting of (1) a dictionary of locations mapping each game location's ID to a Location object,
-        and (2) a dictionary of items mapping each game item name to an Item object."""
-        with open(filename, 'r') as f:
-            data = json.load(f)
-
-        locations = {}
-        for loc_data in data['locations']:
-            location_obj = Location(
-                loc_data['id'],
-                loc_data['name'],
-                loc_data['brief_description'],
-                loc_data['long_description'],
-                loc_data['available_commands'],
-                loc_data['items']
-            )
-            locations[loc_data['id']] = location_obj
-
-        items = {}
-        for item_data in data['items']:
-            item_obj = Item(
-                item_data['name'],
-                item_data['weight'],
-                item_data['the_key'],
-                item_data['puzzle_to_obtain']
-            )
-            items[item_data['name']] = item_obj
-
-        return locations, items
+    def load_world(self, game_data_file: str, use_snapshot: bool = True, compiled: bool = False,
+                   lazy_descriptions: bool = False) -> None:
+        """
+        (Re)load every location, item, key and puzzle of this game from game_data_file, rebuild the
+        item and key catalogs, and compile each puzzle's validator. This is the only place the catalogs change.
+        """
+        if lazy_descriptions:
+            compiled = True
+            descriptions_path = game_data_file + DESCRIPTIONS_SUFFIX
+
+            def build(rows: WorldRows) -> World:
+                """Compile the world, keeping its descriptions in the sidecar file."""
+                return compile_world(rows, descriptions_path)
+        else:
+            build = compile_world if compiled else _build_world
+        if use_snapshot:
+            world = _load_snapshot(game_data_file, build)
+        else:
+            world = self._load_game_data(game_data_file, build)
+        self._locations, self._items, self._keys, self._puzzles, (goal_ids, goal_items) = world
+        self._world = self._locations.world if compiled else None
+        self._item_order = tuple(self._items)
+        self._item_names = frozenset(self._item_order)
+        self._key_order = tuple(self._keys)
+        self._key_names = frozenset(self._key_order)
+        self.goal_location_ids = tuple(goal_ids)
+        self.goal_items = self._item_names if goal_items is None else frozenset(goal_items)
+        self._validators = compile_puzzles(self._puzzles.values())
+        self._graph = None
+        self._commands = None
+        self._renderer = None
+        self._overlay = WorldOverlay(self._locations)
+        self._goal_placement = None
+        self._fingerprint = None
+
+    def fork(self, initial_location_id: int) -> AdventureGame:
+        """
+        Return a new, ongoing game in this world that starts at initial_location_id.
+
+        The new game shares the whole world with this one, along with the compiled validators, the map index,
+        the command table and the renderer (which are built now if they have not been yet). It starts with a copy
+        of this game's overlay, so the items and visited flags are as they are in this game now, but from then on
+        each game's changes are its own. Forking a game that has not been played copies nothing but a few
+        references, whatever the size of the world.
+        """
+        self.get_graph()
+        self.get_command_table()
+        self.get_renderer()
+        self._initial_goal_placement()
+        self.fingerprint()
+        game = AdventureGame.__new__(AdventureGame)
+        game.__dict__.update(self.__dict__)
+        game._overlay = self._overlay.copy()
+        game.current_location_id = initial_location_id
+        game.ongoing = True
+        return game
 
     @staticmethod
-    def _load_game_data2(filename: str) -> tuple[dict[str, Key], dict[int, Puzzle]]:
-        """Load locations and items from a JSON file with the given filename and
-        return a tuple consisting of (1) a dictionary of keys mapping each game key name to a Key object,
-        and (2) a dictionary of puzzles mapping each game puzzle ID to a Puzzle object."""
-        with open(filename, 'r') as f:
-            data = json.load(f)
-
-        keys = {}
-        for key_data in data['keys']:
-            key_obj = Key(
-                key_data['key_name'],
-                key_data['weight'],
-                key_data['puzzle_to_obtain'],
-                key_data['the_item']
-            )
-            keys[key_data['key_name']] = key_obj
-
-        puzzles = {}
-        for puzzle_data in data['puzzles']:
-            puzzle_obj = Puzzle(
-                puzzle_data['id_puzzle'],
-                puzzle_data['description'],
-                puzzle_data['answer']
-            )
-            puzzles[puzzle_data['id_puzzle']] = puzzle_obj
-
-        return keys, puzzles
+    def _load_game_data(filename: str, build: Optional[Callable[[WorldRows], World]] = None) -> World:
+        """Load the game world from a JSON file with the given filename, parsing it only once (and building it
+        with build, by default _build_world), and
+        return a tuple consisting of (1) a dictionary of locations mapping each game location's ID to a Location object,
+        (2) a dictionary of items mapping each game item name to an Item object,
+        (3) a dictionary of keys mapping each game key name to a Key object,
+        (4) a dictionary of puzzles mapping each game puzzle ID to a Puzzle object,
+        and (5) the goal location IDs and required item names (or None for all items) of the game."""
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        with _gc_paused():
+            return (build or _build_world)(_world_rows(json.loads(raw)))
 
     def get_location(self, loc_id: Optional[int] = None) -> Location:
         """Return Location object associated with the provided location ID.
         If no ID is provided, return the Location object associated with the current location.
         """
         if loc_id is None:
-            return self._locations[self.current_location_id]
-        return self._locations[loc_id]
+            loc_id = self.current_location_id
+        return OverlayLocation(self._locations[loc_id], self._overlay)
+
+    def describe(self, loc_id: int) -> str:
+        """Return the long description of the location with the given ID."""
+        return self._locations[loc_id].long_description
+
+    def get_locations(self) -> Iterable[Location]:
+        """Return every Location object in the game, as it is in this game."""
+        overlay = self._overlay
+        return [OverlayLocation(location, overlay) for location in self._locations.values()]
+
+    def goal_item_locations(self) -> tuple[Mapping[str, int], int]:
+        """Return a dictionary mapping each goal item that is at a location to the ID of that location, and the
+        number of those locations that are goal locations. The dictionary must not be changed.
+
+        Until this game changes the items at some location, the same dictionary is returned every time (and by
+        every fork of the game); after that, this takes time proportional to the number of locations whose items
+        were changed, not to the size of the world.
+        """
+        placement, delivered = self._initial_goal_placement()
+        changed = list(self._overlay.changed_items())
+        if not changed:
+            return placement, delivered
+        placement = dict(placement)
+        goal_items = self.goal_items
+        for loc_id, items in changed:
+            for item in self._locations[loc_id].items:
+                if placement.get(item) == loc_id:
+                    del placement[item]
+            for item in items:
+                if item in goal_items:
+                    placement[item] = loc_id
+        goal_ids = self.goal_location_ids
+        return placement, sum(1 for loc_id in placement.values() if loc_id in goal_ids)
+
+    def _initial_goal_placement(self) -> tuple[dict[str, int], int]:
+        """Return what goal_item_locations returns for a game that has not changed the world. It is built the
+        first time it is needed after the world is loaded, and shared from then on."""
+        if self._goal_placement is None:
+            goal_items, goal_ids = self.goal_items, self.goal_location_ids
+            placement = {item: location.id_num for location in self._locations.values()
+                         for item in location.items if item in goal_items}
+            self._goal_placement = (placement, sum(1 for loc_id in placement.values() if loc_id in goal_ids))
+        return self._goal_placement
+
+    def get_graph(self) -> MapGraph:
+        """Return the compiled index of the map. It is built the first time it is needed after the world is
+        loaded, and shared from then on."""
+        if self._graph is None and self._world is not None:
+            self._graph = self._world.graph()
+        elif self._graph is None:
+            self._graph = MapGraph(self._locations.values())
+        return self._graph
+
+    def get_overlay(self) -> WorldOverlay:
+        """Return the overlay of the changes this game has made to the items and visited flags of the world."""
+        return self._overlay
+
+    def fingerprint(self) -> int:
+        """Return a 32-bit checksum of the locations and their commands, and the names of the items and keys of
+        the world, which tells apart worlds that a saved session (see game_save) could not be restored into.
+        It is computed the first time it is needed after the world is loaded."""
+        if self._fingerprint is None:
+            checksum = zlib.crc32('\0'.join(self._item_order + self._key_order).encode('utf-8'))
+            for location in self._locations.values():
+                commands = location.available_commands
+                line = [str(location.id_num)] + [command + '\0' + str(commands[command]) for command in commands]
+                checksum = zlib.crc32('\0'.join(line).encode('utf-8'), checksum)
+            self._fingerprint = checksum
+        return self._fingerprint
+
+    def get_command_table(self) -> CommandTable:
+        """Return the table of every command of the world. It is built the first time it is needed after the
+        world is loaded, and shared from then on."""
+        if self._commands is None:
+            self._commands = CommandTable(self._item_order + self._key_order, self.get_location)
+        return self._commands
+
+    def get_renderer(self) -> Renderer:
+        """Return the renderer of the text shown for each location. It is created the first time it is needed
+        after the world is loaded, and shared from then on.
+
+        If the descriptions are kept on disk, only the most recently shown locations' text is cached.
+        """
+        if self._renderer is None:
+            lazy = self._world is not None and self._world.descriptions is not None
+            self._renderer = Renderer(RENDER_CACHE_SIZE if lazy else None)
+        return self._renderer
 
     def get_item(self, item_name: str) -> Item:
         """
@@ -142,24 +310,46 @@ class AdventureGame:
         """
         return self._keys[key_name]
 
-    def get_the_items(self) -> list[str]:
+    def get_the_items(self) -> tuple[str, ...]:
         """
-        Return a list of all item names in the game.
+        Return the names of all items in the game, in the order they appear in the game data.
+        The same tuple is returned every time until the world is reloaded.
         """
-        the_list = []
-        for the_item in self._items:
-            the_list.append(the_item)
-        return the_list
+        return self._item_order
+
+    def get_item_names(self) -> frozenset[str]:
+        """
+        Return the set of all item names in the game.
+        The same set is returned every time until the world is reloaded.
+        """
+        return self._item_names
+
+    def get_the_keys(self) -> tuple[str, ...]:
+        """
+        Return the names of all keys in the game, in the order they appear in the game data.
+        The same tuple is returned every time until the world is reloaded.
+        """
+        return self._key_order
+
+    def get_key_names(self) -> frozenset[str]:
+        """
+        Return the set of all key names in the game.
+        The same set is returned every time until the world is reloaded.
+        """
+        return self._key_names
+
+    def item_weight(self, item_str: str) -> float:
+        """
+        Return the weight of the given item, or 0 if it is a key.
+        """
+        item = self._items.get(item_str)
+        return 0.0 if item is None else item.weight
 
     def check_weight(self, user: Player, item_str: str) -> bool:
         """
         Check if adding the specified item keeps the player's total inventory weight within the allowed limit.
         """
-        added_weight = 0
-        if item_str in self.get_the_items():
-            added_weight = self.get_item(item_str).weight
-
-        if self.sum_inv_weight(user) + added_weight <= 11:
+        if self.sum_inv_weight(user) + self.item_weight(item_str) <= MAX_WEIGHT:
             return True
         return False
 
@@ -167,102 +357,254 @@ class AdventureGame:
         """
         Check if the player has the required key (if any) for the specified item.
         """
-        need_key = None
-        if item_str in self.get_the_items():
-            need_key = self.get_item(item_str).the_key
+        item = self._items.get(item_str)
+        need_key = None if item is None else item.the_key
 
-        if need_key is None or (need_key is not None and need_key in user.get_inventory()):
+        if need_key is None or user.has_item(need_key):
             return True
         return False
 
-    def check_puzzle(self, item_str: str, logger: EventList, loc: Location) -> bool:
+    def check_puzzle(self, item_str: str, logger: EventList, loc: Location,
+                     out: Callable[[str], None] = print, weights: Optional[LocationWeights] = None) -> bool:
         """
         Check if the item has a puzzle that the player needs to solve in order to obtain it.
+        Any hint shown for a failed puzzle is printed, or passed to out instead.
+        Weight puzzles read the location's total weight from weights, if it is given.
         """
-        if item_str in self.get_the_items():
-            need_puzzle = self.get_item(item_str).puzzle_to_obtain
-        else:
-            need_puzzle = self.get_key(item_str).puzzle_to_obtain
+        need_puzzle = self.get_puzzle_for(item_str)
 
-        if need_puzzle is None or (need_puzzle is not None and self.puzzle_choose(need_puzzle, logger, loc)):
+        if need_puzzle is None or (need_puzzle is not None
+                                   and self.puzzle_choose(need_puzzle, logger, loc, out, weights)):
             return True
         return False
 
+    def get_puzzle_for(self, item_str: str) -> Optional[int]:
+        """
+        Return the ID of the puzzle that must be solved to obtain the given item (or key), or None if there is none.
+        """
+        if item_str in self._item_names:
+            return self._items[item_str].puzzle_to_obtain
+        return self._keys[item_str].puzzle_to_obtain
+
+    def get_puzzle(self, puzzle_id: int) -> Puzzle:
+        """
+        Return the Puzzle object with the given ID.
+        """
+        return self._puzzles[puzzle_id]
+
     def sum_inv_weight(self, user: Player) -> float:
         """
         Return the total weight of items in the player's inventory.
+
+        Preconditions:
+            - every item in the player's inventory was weighed with self.item_weight
         """
-        total = 0.0
-        for item_str in user.get_inventory():
-            if item_str in self.get_the_items():
-                total += self.get_item(item_str).weight
-        return total
+        return user.get_weight()
 
-    def puzzle_choose(self, puzzle_id: int, logger: EventList, loc: Location) -> bool:
+    def puzzle_choose(self, puzzle_id: int, logger: EventList, loc: Location,
+                      out: Callable[[str], None] = print, weights: Optional[LocationWeights] = None) -> bool:
         """
-        Select and run the appropriate puzzle based on the puzzle ID.
+        Run the puzzle with the given ID with its validator (see game_puzzles). Puzzles solved by typing in an
+        answer prompt the user as in logic_puzzle; any other puzzle is checked against the state of the game.
         """
-        if puzzle_id == 1:
+        if self.is_answer_puzzle(puzzle_id):
             return self.logic_puzzle(puzzle_id)
-        elif puzzle_id == 2:
-            return self.order_puzzle(puzzle_id, logger)
-        else:
-            return self.weight_puzzle(puzzle_id, loc)
+        return self._check_state(puzzle_id, logger, loc, out, weights)
+
+    def puzzle_kind(self, puzzle_id: int) -> str:
+        """
+        Return the name of the kind of the puzzle with the given ID, e.g. 'logic' (see logic_puzzle), 'order'
+        (see order_puzzle) or 'weight' (see weight_puzzle).
+        """
+        return self._puzzles[puzzle_id].kind
+
+    def is_answer_puzzle(self, puzzle_id: int) -> bool:
+        """
+        Return whether the puzzle with the given ID is solved by the player typing in an answer
+        (see logic_puzzle and check_answer), rather than by the state of the game.
+        """
+        return PUZZLE_KINDS[self._puzzles[puzzle_id].kind].answered
+
+    def check_answer(self, puzzle_id: int, answer: str) -> bool:
+        """
+        Return whether the given answer solves the puzzle with the given ID.
+        """
+        return self._validators[puzzle_id](PuzzleAttempt(answer, None, None, None, self.item_weight))
 
     def logic_puzzle(self, puzzle_id: int) -> bool:
         """
         Run a logic puzzle by repeatedly prompting the user until the correct answer is given or they quit.
         """
         the_answer = input(self._puzzles[puzzle_id].description).lower()
-        while the_answer != self._puzzles[puzzle_id].answer:
+        while not self.check_answer(puzzle_id, the_answer):
             the_answer = input("Wrong Answer! Try again. Enter 'q' if you would want to quit puzzle: ")
             if the_answer.lower() == 'q':
                 return False
         return True
 
-    def order_puzzle(self, puzzle_id: int, logger: EventList) -> bool:
+    def order_puzzle(self, puzzle_id: int, logger: EventList, out: Callable[[str], None] = print) -> bool:
         """
         Run an order puzzle using the event log to verify the correct sequence.
         """
-        if (logger.last.prev.id_num == self._puzzles[puzzle_id].answer[1]
-                and logger.last.prev.prev.id_num == self._puzzles[puzzle_id].answer[0]):
-            return True
-        print(self._puzzles[puzzle_id].description + '\n')
-        return False
+        return self._check_state(puzzle_id, logger, None, out, None)
 
-    def weight_puzzle(self, puzzle_id: int, loc: Location) -> bool:
+    def weight_puzzle(self, puzzle_id: int, loc: Location, out: Callable[[str], None] = print,
+                      weights: Optional[LocationWeights] = None) -> bool:
         """
         Run a weight puzzle by checking if the total weight of items in the location equals the expected answer.
+        The total is read from weights if it is given, and summed otherwise.
+        """
+        return self._check_state(puzzle_id, None, loc, out, weights)
+
+    def _check_state(self, puzzle_id: int, logger: Optional[EventList], loc: Optional[Location],
+                     out: Callable[[str], None], weights: Optional[LocationWeights]) -> bool:
         """
-        total = 0.0
-        for item_str in loc.items:
-            if item_str in self.get_the_items():
-                total += self.get_item(item_str).weight
-        if total == self._puzzles[puzzle_id].answer:
+        Return whether the state of the game solves the puzzle with the given ID, printing (or passing to out)
+        its description if it does not.
+        """
+        if self._validators[puzzle_id](PuzzleAttempt(None, logger, loc, weights, self.item_weight)):
             return True
-        print(self._puzzles[puzzle_id].description + '\n')
+        out(self._puzzles[puzzle_id].description + '\n')
         return False
 
-    def look(self, loc: Location) -> None:
+    def look(self, loc: Location, out: Callable[[str], None] = print) -> None:
         """
         Print a description of the given location. Long description if player hasn't been before '
-        and brief is the player has
+        and brief is the player has. The text is passed to out instead if it is given.
+
+        The description is built by the game's renderer, and printed (or passed to out) in one call.
         """
-        print("Location " + str(loc.id_num))
-        if loc.visited:
-            print("You are now at " + loc.name
-                  + "! Since you have been here before, here's a BRIEF description of this place.\n"
-                  + loc.brief_description + "\n")
-        else:
-            print("You are now at " + loc.name
-                  + "! Since you have NEVER been here before, here's a LONG description of this fabulous place!\n"
-                  + loc.long_description + "\n")
-        if len(location.items) != 0:
-            print("This location also has item(s):")
-            location.display_items()
-        else:
-            print("This location has NO items.")
-            print()
+        out(self.get_renderer().look(loc))
+
+
+SNAPSHOT_SUFFIX = '.snapshot'
+SNAPSHOT_VERSION = (3, marshal.version, sys.version_info[:2])
+
+
+def _world_rows(data: dict) -> WorldRows:
+    """Return the parsed game data as plain tuples of constructor arguments for the Location, Item, Key
+    and Puzzle objects it describes. This is the form that is stored in a snapshot."""
+    return ([(loc_data['id'], loc_data['name'], loc_data['brief_description'], loc_data['long_description'],
+              loc_data['available_commands'], loc_data['items']) for loc_data in data['locations']],
+            [(item_data['name'], item_data['weight'], item_data['the_key'], item_data['puzzle_to_obtain'])
+             for item_data in data['items']],
+            [(key_data['key_name'], key_data['weight'], key_data['puzzle_to_obtain'], key_data['the_item'])
+             for key_data in data['keys']],
+            [(puzzle_data['id_puzzle'], puzzle_data['description'], puzzle_data['answer'],
+              puzzle_data.get('kind') or legacy_kind(puzzle_data['id_puzzle']))
+             for puzzle_data in data['puzzles']],
+            _objective(data))
+
+
+def _objective(data: dict) -> Objective:
+    """Return the goal location IDs and required item names (None meaning every item) of the parsed game data.
+
+    Both are read from the optional "objective" section; by default every item must be brought to the
+    first location listed.
+    """
+    objective = data.get('objective', {})
+    return objective.get('locations', [data['locations'][0]['id']]), objective.get('items')
+
+
+def _build_world(rows: WorldRows) -> World:
+    """Return the (locations, items, keys, puzzles) dictionaries built from the given rows, followed by the
+    objective."""
+    location_rows, item_rows, key_rows, puzzle_rows, objective = rows
+    # The items of the shared locations are tuples, since only a game's overlay may change them
+    return ({row[0]: Location(*row[:5], tuple(row[5])) for row in location_rows},
+            {row[0]: Item(*row) for row in item_rows},
+            {row[0]: Key(*row) for row in key_rows},
+            {row[0]: Puzzle(*row) for row in puzzle_rows},
+            objective)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Disable the cyclic garbage collector for the duration of the block.
+
+    Building a world allocates one container per entity but never creates garbage cycles, so letting the
+    collector repeatedly scan the half-built world only slows large loads down.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _load_snapshot(filename: str, build: Callable[[WorldRows], World] = _build_world) -> World:
+    """Return the game world stored in filename, built from its rows with build, loading the rows from the
+    compiled snapshot next to filename whenever that snapshot is still valid.
+
+    A snapshot is keyed by the absolute path, modification time and SHA-256 hash of filename. If the path and
+    modification time match, the snapshot is trusted without reading filename at all; otherwise filename is
+    read once and the snapshot is used only if the content hash still matches. A stale or missing snapshot is
+    (re)written after parsing. Failing to write the snapshot (e.g. in a read-only directory) is not an error.
+    """
+    path = os.path.abspath(filename)
+    snapshot_file = filename + SNAPSHOT_SUFFIX
+    mtime = os.stat(filename).st_mtime_ns
+
+    with _gc_paused():
+        rows = _read_snapshot(snapshot_file, lambda header: header[:3] == (SNAPSHOT_VERSION, path, mtime))
+        if rows is None:
+            with open(filename, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+
+            rows = _read_snapshot(snapshot_file,
+                                  lambda header: header[0] == SNAPSHOT_VERSION and header[3] == digest)
+            if rows is None:
+                rows = _world_rows(json.loads(raw))
+            _write_snapshot(snapshot_file, (SNAPSHOT_VERSION, path, mtime, digest), rows)
+
+        return build(rows)
+
+
+def _read_snapshot(snapshot_file: str, is_valid: Callable[[tuple], bool]) -> Optional[WorldRows]:
+    """Return the world rows stored in snapshot_file if the file exists and its header satisfies is_valid,
+    or None otherwise.
+
+    A snapshot file is the 4-byte length of the marshalled header, the header itself, then the marshalled rows.
+    """
+    try:
+        with open(snapshot_file, 'rb') as f:
+            blob = f.read()
+        header_size = int.from_bytes(blob[:4], 'little')
+        header = marshal.loads(blob[4:4 + header_size])
+        if isinstance(header, tuple) and len(header) == 4 and is_valid(header):
+            return marshal.loads(memoryview(blob)[4 + header_size:])
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    return None
+
+
+def _write_snapshot(snapshot_file: str, header: tuple, rows: WorldRows) -> None:
+    """Atomically write the given header and world rows to snapshot_file, ignoring any filesystem errors."""
+    tmp_file = snapshot_file + '.' + str(os.getpid()) + '.tmp'
+    try:
+        header_blob = marshal.dumps(header)
+        with open(tmp_file, 'wb') as f:
+            f.write(len(header_blob).to_bytes(4, 'little'))
+            f.write(header_blob)
+            f.write(marshal.dumps(rows))
+        os.replace(tmp_file, snapshot_file)
+    except OSError:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    """Return the command-line options of the game."""
+    parser = argparse.ArgumentParser(description="Play the text adventure game.")
+    parser.add_argument('--data', default='game_data.json', help="the game data file")
+    parser.add_argument('--start', type=int, default=1, help="the ID of the location to start at")
+    parser.add_argument('--profile', metavar='PATH', help="profile the game and save the results to PATH as JSON")
+    parser.add_argument('--profile-stats', metavar='PATH',
+                        help="profile the game and save the results to PATH in the format of cProfile")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
@@ -276,172 +618,27 @@ if __name__ == "__main__":
     #     'disable': ['R1705', 'E9998', 'E9999']
     # })
 
-    player = Player([], 0)
-    game_log = EventList()
-    game = AdventureGame('game_data.json', 1)
-    menu = ["look", "inventory", "score", "undo", "log", "weights", "quit"]
-    picked_items = []
-    choice = None
-    menu_off = True
-    location_change = True
-    game_finished = False
-    bonus_awarded = False
-    item_choice = None
-    drop_choice = None
-    steps_remaining = 30
-
-    print("GAME OBJECTIVE: Collect the items: Monitor, USB Drive, Laptop Charger, and Lucky Mug, by solving "
-          "various puzzles and obtaining keys, and bring all these items back and DROP them "
-          "ALL at UNIVERSITY COLLEGE (UC)!\n")
-
-    while game.ongoing and set(game.get_location(1).items) != set(game.get_the_items()):
-        location = game.get_location()
-
-        if menu_off:
-            game.look(location)
-        if menu_off and location_change:
-            game_log.add_event(Event(game.get_location().id_num, game.get_location().long_description), choice)
-
-        menu_off = True
-        location_change = True
-
-        print("Allowed Moving Steps Remaining: " + str(steps_remaining) + "\n")
-        print("What to do? Choose from: look, inventory, score, weights, undo, log, quit")
-        print("At this location, you can also:")
-        for action in location.available_commands:
-            print("-", action)
-        print("- pickitem")
-        print("- dropitem")
-
-        choice = input("\nEnter action: ").lower().strip()
-        while (choice not in location.available_commands and choice not in menu
-               and choice not in ['pickitem', 'dropitem']):
-            print("That was an invalid option. Try again.")
-            choice = input("\nEnter action: ").lower().strip()
-        print("========")
-        print("You decided to:", choice)
-
-        if choice not in menu:
-            bonus_awarded = False
-
-        if choice in menu:
-            menu_off = False
-            if choice == "log":
-                game_log.display_events()
-                print()
-            elif choice == "look":
-                game.look(location)
-            elif choice == "score":
-                print("\nPlayer's Score: " + str(player.score))
-            elif choice == "undo":
-                if game_log.last.id_num != game_log.last.prev.id_num:
-                    game.get_location(game_log.last.id_num).visited = False
-                    game_log.remove_last_event()
-                    game.current_location_id = game_log.last.id_num
-                    game.get_location(game_log.last.id_num).visited = False
-                    steps_remaining += 1
-                else:
-                    if 'Picked' in game_log.last.prev.next_command:
-                        game.get_location(game_log.last.id_num).items.append(item_choice)
-                        player.remove_item(item_choice)
-
-                        if bonus_awarded:
-                            picked_items.remove(item_choice)
-                            player.score -= 5
-                        bonus_awarded = False
-                    else:
-                        game.get_location(game_log.last.id_num).items.remove(drop_choice)
-                        player.add_item(drop_choice)
-
-                    game_log.remove_last_event()
-
-            elif choice == "inventory":
-                player.display_inventory()
-                print("Your current inventory weight is " + str(game.sum_inv_weight(player)) + " lbs\n")
-            elif choice == "weights":
-                print("Item Weights:")
-                for item in game.get_the_items():
-                    print(item + " Weight: " + str(game.get_item(item).weight))
-                print("All the Keys have a Weight of 0 lbs\n")
-            elif choice == "quit":
-                print("\nSad to see you quit the game. Have a good one!\n")
-                game.ongoing = False
-
-        elif choice == 'pickitem':
-            location_change = False
-            if len(location.items) != 0:
-                print("\nThe available items here are:")
-                location.display_items()
-
-                item_choice = input("Pick your item: ")
-                while item_choice not in location.items:
-                    print("You need to select a valid item from that list. Try again.")
-                    item_choice = input("Pick your item: ")
-
-                weight_ok = game.check_weight(player, item_choice)
-
-                if weight_ok and item_choice in picked_items:
-                    player.add_item(item_choice)
-                    location.items.remove(item_choice)
-                    game_log.add_event(Event(game.get_location().id_num, game.get_location().long_description),
-                                       "Picked up Item " + item_choice)
-                else:
-                    key_ok = game.check_key(player, item_choice)
-                    puzzle_ok = game.check_puzzle(item_choice, game_log, location)
-
-                    if weight_ok and key_ok and puzzle_ok:
-                        player.add_item(item_choice)
-                        location.items.remove(item_choice)
-                        game_log.add_event(Event(game.get_location().id_num, game.get_location().long_description),
-                                           "Picked up Item " + item_choice)
-                        if item_choice not in picked_items:
-                            player.score += 5
-                            picked_items.append(item_choice)
-                            bonus_awarded = True
-                    else:
-                        if not weight_ok:
-                            print("You cannot pick this item because you are overweight.")
-                        if not key_ok:
-                            print("You don't have a required key for this item.")
-                        if not puzzle_ok:
-                            print("Failed puzzle")
-                    player.display_inventory()
-            else:
-                print("There are no items in this location!\n")
-
-        elif choice == 'dropitem':
-            location_change = False
-            if player.get_inventory():
-                player.display_inventory()
-                drop_choice = input("Pick item to drop: ")
-                while drop_choice not in player.get_inventory():
-                    print("You need to select a valid item from your inventory. Try again.")
-                    drop_choice = input("Pick item to drop: ")
-                location.items.append(drop_choice)
-                player.remove_item(drop_choice)
-                player.display_inventory()
-                game_log.add_event(Event(game.get_location().id_num, game.get_location().long_description),
-                                   "Dropped Item " + drop_choice)
-            else:
-                print("You have no items to drop!\n")
-        else:
-            if steps_remaining <= 0:
-                print("No moving steps remaining. You cannot move to a new location. Game over!")
-                game.ongoing = False
-                game_finished = True
-            else:
-                steps_remaining -= 1
-                result = location.available_commands[choice]
-                game.current_location_id = result
-
-        if menu_off:
-            location.visited = True
-
-    if set(game.get_location(1).items) == set(game.get_the_items()):
-        print("Congratulations! You have won the game!")
-        game_finished = True
-
-    if game_finished:
-        print("You had " + str(steps_remaining) + " step(s) remaining.")
-        final_score = player.score + steps_remaining
-        print("Your final score is " + str(final_score))
+    # The game is made from the imported adventure module, not this script's copy of it, since that is the one
+    # the rest of the engine (and the profiler) uses
+    import adventure
+    from game_profile import Profiler
+    from game_render import BufferedSink
+    from game_session import GameSession
+
+    options = _parse_args(sys.argv[1:])
+    profiler = Profiler()
+    if options.profile is not None or options.profile_stats is not None:
+        profiler.enable()
+
+    # Everything shown in a turn is written to the console at once
+    session = GameSession(adventure.AdventureGame(options.data, options.start), sink=BufferedSink(sys.stdout.write))
+    result = session.start()
+    while result.ongoing:
+        result = session.step(input(result.prompt))
+
+    if profiler.enabled:
+        profiler.disable()
+        if options.profile is not None:
+            profiler.dump_json(options.profile)
+        if options.profile_stats is not None:
+            profiler.dump_stats(options.profile_stats)
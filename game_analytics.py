@@ -0,0 +1,345 @@
+"""CSC111 Project 1: Text Adventure Game - Analytics
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains EventCorpus, which holds a large number of recorded event logs (from simulations,
+event lists or journals) and computes statistics over all of them at once: how often each location is
+visited, how often the player moves from one location to another, how many steps winning games took, how
+often each item is picked up and dropped, and how often moves are undone.
+
+The logs are stored one after another in flat arrays, with an array of offsets marking where each log starts
+(a ragged layout), so a corpus of millions of logs takes a few bytes per event. The statistics are computed in
+passes over the flat arrays that run in C (counting with collections.Counter, scanning with bytes.count and
+regular expressions), instead of in Python loops over every event of every log.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import re
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate, chain, islice, repeat
+from operator import add, mul
+from typing import Iterable, Optional, Sequence
+
+from adventure import AdventureGame
+from game_commands import DROP_PREFIX, PICK_PREFIX
+from proj1_event_logger import CompactEventList, EventList
+
+# The kinds of event, stored one byte per event: the first event of a log, or one of a log added without its
+# commands; a move; a pickup; and a drop
+_NONE, _MOVE, _PICK, _DROP = range(4)
+# Matches every pickup and drop in the kinds of the events of a corpus
+_ITEM_EVENT = re.compile(bytes([ord('['), _PICK, _DROP, ord(']')]))
+
+
+class EventCorpus:
+    """
+    A collection of recorded event logs, stored in flat arrays.
+
+    The events of log i are those at indexes offsets[i] to offsets[i + 1] - 1 of location_ids and command_ids.
+    The statistics that depend on commands (moves, pickups and drops) ignore the logs that were added without
+    them.
+
+    Instance Attributes:
+        - offsets: The index of the first event of each log, followed by the total number of events.
+        - location_ids: The location ID of every event of every log.
+        - command_ids: The id of the command that led to every event of every log (its index in commands), or -1
+          for the first event of a log and every event of a log added without its commands.
+        - commands: The command with each id, interned by this corpus as its logs are added.
+        - undos: The number of events that were undone (and not redone) in each log.
+
+    Representation Invariants:
+        - len(self.offsets) == len(self) + 1 and self.offsets[0] == 0
+        - len(self.location_ids) == len(self.command_ids) == self.offsets[-1]
+        - len(self.undos) == len(self)
+    """
+    # Private Instance Attributes:
+    #   - _kinds: The kind (_NONE, _MOVE, _PICK or _DROP) of every event of every log.
+    #   - _has_commands: For each log, 1 if it was added with its commands and 0 otherwise.
+    #   - _command_kinds: A dictionary mapping the id of each command seen so far to its kind.
+    #   - _command_index: A dictionary mapping each command in commands to its id.
+    offsets: array
+    location_ids: array
+    command_ids: array
+    commands: list[str]
+    undos: array
+    _kinds: bytearray
+    _has_commands: bytearray
+    _command_kinds: dict[int, int]
+    _command_index: dict[str, int]
+
+    def __init__(self) -> None:
+        """Initialize an empty corpus."""
+        self.offsets = array('q', [0])
+        self.location_ids = array('i')
+        self.command_ids = array('i')
+        self.commands = []
+        self.undos = array('i')
+        self._kinds = bytearray()
+        self._has_commands = bytearray()
+        self._command_kinds = {-1: _NONE}
+        self._command_index = {}
+
+    def __len__(self) -> int:
+        """Return the number of logs in this corpus."""
+        return len(self.offsets) - 1
+
+    def num_events(self) -> int:
+        """Return the total number of events of every log in this corpus."""
+        return self.offsets[-1]
+
+    def add(self, id_log: Sequence[int], commands: Optional[Sequence[Optional[str]]] = None,
+            undos: int = 0) -> None:
+        """Add a log of events at the locations with the IDs in id_log, in which undos events were undone.
+
+        If commands are given, commands[i] is the command that led to event i (and commands[0] is None), as
+        in a GameState or a journal; EventList.next_command is the command that leads away from an event.
+
+        Preconditions:
+            - commands is None or len(commands) == len(id_log)
+            - undos >= 0
+        """
+        self.location_ids.extend(id_log)
+        self.offsets.append(len(self.location_ids))
+        self.undos.append(undos)
+        if commands is None:
+            self.command_ids.extend(array('i', [-1]) * len(id_log))
+            self._kinds.extend(bytes(len(id_log)))
+            self._has_commands.append(0)
+        else:
+            ids = [self._intern(command) for command in commands]
+            if ids:
+                ids[0] = -1
+            self.command_ids.extend(ids)
+            command_kinds = self._command_kinds
+            for command_id in ids:
+                if command_id not in command_kinds:
+                    command_kinds[command_id] = _command_kind(self.commands[command_id])
+            self._kinds.extend(map(command_kinds.__getitem__, ids))
+            self._has_commands.append(1)
+
+    def add_id_logs(self, id_logs: Iterable[Sequence[int]]) -> None:
+        """Add every log in id_logs (e.g. the get_id_log() of simulations), without their commands.
+
+        This does the same as calling add on each log, but extends each array once for all of them.
+        """
+        id_logs = list(id_logs)
+        start = len(self.location_ids)
+        self.location_ids.extend(chain.from_iterable(id_logs))
+        added = len(self.location_ids) - start
+        self.offsets.extend(islice(accumulate(map(len, id_logs), initial=start), 1, None))
+        self.undos.extend(array('i', [0]) * len(id_logs))
+        self.command_ids.extend(array('i', [-1]) * added)
+        self._kinds.extend(bytes(added))
+        self._has_commands.extend(bytes(len(id_logs)))
+
+    def add_event_list(self, log: EventList | CompactEventList, undos: int = 0) -> None:
+        """Add the events of log, with their commands, in which undos events were undone."""
+        id_log, commands = [], []
+        command = None
+        event = log.first
+        while event is not None:
+            id_log.append(event.id_num)
+            commands.append(command)
+            command = event.next_command
+            event = event.next
+        self.add(id_log, commands, undos)
+
+    def add_journal(self, path: str) -> None:
+        """Add the events of the journal of a JournalEventList at path, with their commands, counting the events
+        it records as undone."""
+        id_log, commands = [], []
+        undos = 0
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if 'undo' in record:
+                    id_log.pop()
+                    commands.pop()
+                    undos += 1
+                else:
+                    id_log.append(record['id'])
+                    commands.append(record['command'])
+        self.add(id_log, commands, undos)
+
+    def log(self, index: int) -> list[int]:
+        """Return the location IDs of the events of the log with the given index."""
+        return self.location_ids[self.offsets[index]:self.offsets[index + 1]].tolist()
+
+    def lengths(self) -> array:
+        """Return the number of events of each log."""
+        offsets = self.offsets
+        return array('q', map(int.__sub__, islice(offsets, 1, None), offsets))
+
+    def visit_counts(self) -> Counter[int]:
+        """Return the number of events at each location, over every log."""
+        return Counter(self.location_ids)
+
+    def transition_counts(self) -> Counter[tuple[int, int]]:
+        """Return the number of times each (location ID, location ID) pair appears as consecutive events of
+        the same log. Pickups and drops appear as transitions from a location to itself.
+
+        Preconditions:
+            - all(loc_id >= 0 for loc_id in self.location_ids)
+        """
+        ids = self.location_ids
+        if not ids:
+            return Counter()
+        # Each pair is counted as the single integer source * width + target, which is faster than a tuple
+        width = max(ids) + 1
+        codes = Counter(map(add, map(mul, ids, repeat(width)), islice(ids, 1, None)))
+        # The pairs made of the last event of one log and the first event of the next are not transitions
+        for start in set(islice(self.offsets, 1, len(self.offsets) - 1)):
+            if 0 < start < len(ids):
+                code = ids[start - 1] * width + ids[start]
+                codes[code] -= 1
+                if codes[code] == 0:
+                    del codes[code]
+        return Counter({divmod(code, width): count for code, count in codes.items()})
+
+    def transition_matrix(self, location_ids: Optional[Sequence[int]] = None) -> tuple[list[int], list[list[float]]]:
+        """Return the given location IDs (by default, every location visited, in increasing order) and the
+        first-order transition matrix between them: row i holds the probability that an event at location_ids[i]
+        is followed by one at each of the locations. Rows of locations never followed by anything are all 0.
+        """
+        counts = self.transition_counts()
+        if location_ids is None:
+            location_ids = sorted(self.visit_counts())
+        index = {loc_id: i for i, loc_id in enumerate(location_ids)}
+        matrix = [[0.0] * len(location_ids) for _ in location_ids]
+        for (source, target), count in counts.items():
+            if source in index and target in index:
+                matrix[index[source]][index[target]] = count
+        for row in matrix:
+            total = sum(row)
+            if total > 0:
+                row[:] = [count / total for count in row]
+        return list(location_ids), matrix
+
+    def move_counts(self) -> array:
+        """Return the number of moves (the steps used) in each log, which is 0 for logs added without their
+        commands."""
+        kinds, offsets = self._kinds, self.offsets
+        return array('q', map(kinds.count, [_MOVE] * len(self), offsets, islice(offsets, 1, None)))
+
+    def item_counts(self) -> tuple[Counter[str], Counter[str]]:
+        """Return the number of times each item (or key) was picked up, and the number of times each was
+        dropped, over every log."""
+        picked, dropped = Counter(), Counter()
+        for command_id, count in Counter(self.command_ids).items():
+            kind = self._command_kinds[command_id]
+            if kind == _PICK:
+                picked[self.commands[command_id][len(PICK_PREFIX):]] += count
+            elif kind == _DROP:
+                dropped[self.commands[command_id][len(DROP_PREFIX):]] += count
+        return picked, dropped
+
+    def undo_rate(self) -> float:
+        """Return the fraction of the events added to the logs that were undone (0 for an empty corpus)."""
+        undone = sum(self.undos)
+        added = self.num_events() + undone
+        return undone / added if added > 0 else 0.0
+
+    def undo_rates(self) -> array:
+        """Return the fraction of the events added to each log that were undone."""
+        return array('d', [undone / (undone + length) if undone + length > 0 else 0.0
+                           for undone, length in zip(self.undos, self.lengths())])
+
+    def wins(self, game: AdventureGame) -> bytearray:
+        """Return, for each log, 1 if it ends with every goal item of game at a goal location and 0 otherwise
+        (always 0 for logs added without their commands).
+
+        Only the pickups and drops of the logs are looked at, so this takes time proportional to their number.
+
+        Preconditions:
+            - game has not been played, so its items are where the world starts them
+            - every log was recorded in game's world
+        """
+        goal_items, goal_ids = game.goal_items, game.goal_location_ids
+        start, delivered = game.goal_item_locations()
+        start_won = delivered == len(goal_items)
+        won = bytearray(self._has_commands) if start_won else bytearray(len(self))
+        offsets, location_ids, command_ids = self.offsets, self.location_ids, self.command_ids
+        commands, command_kinds = self.commands, self._command_kinds
+        log_index, log_end, placement = -1, 0, None
+        for match in _ITEM_EVENT.finditer(self._kinds):
+            pos = match.start()
+            if pos >= log_end:
+                if placement is not None:
+                    won[log_index] = _all_delivered(placement, goal_items, goal_ids)
+                log_index = bisect_right(offsets, pos) - 1
+                log_end = offsets[log_index + 1]
+                placement = dict(start)
+            command_id = command_ids[pos]
+            if command_kinds[command_id] == _PICK:
+                item = commands[command_id][len(PICK_PREFIX):]
+                placement.pop(item, None)
+            else:
+                item = commands[command_id][len(DROP_PREFIX):]
+                if item in goal_items:
+                    placement[item] = location_ids[pos]
+        if placement is not None:
+            won[log_index] = _all_delivered(placement, goal_items, goal_ids)
+        return won
+
+    def steps_to_win(self, game: AdventureGame) -> Counter[int]:
+        """Return the number of won logs (see wins) that took each number of steps.
+
+        Preconditions:
+            - game has not been played, so its items are where the world starts them
+            - every log was recorded in game's world
+        """
+        return Counter(steps for steps, won in zip(self.move_counts(), self.wins(game)) if won)
+
+    def _intern(self, command: Optional[str]) -> int:
+        """Return the id of the given command, adding it to commands if necessary (-1 for None)."""
+        if command is None:
+            return -1
+        command_id = self._command_index.get(command)
+        if command_id is None:
+            command_id = len(self.commands)
+            self.commands.append(command)
+            self._command_index[command] = command_id
+        return command_id
+
+
+def _command_kind(command: Optional[str]) -> int:
+    """Return the kind of the event the given command led to (None for the first event of a log)."""
+    if command is None:
+        return _NONE
+    elif command.startswith(PICK_PREFIX):
+        return _PICK
+    elif command.startswith(DROP_PREFIX):
+        return _DROP
+    else:
+        return _MOVE
+
+
+def _all_delivered(placement: dict[str, int], goal_items: frozenset[str], goal_ids: frozenset[int]) -> int:
+    """Return 1 if every goal item is placed at a goal location in placement, and 0 otherwise."""
+    return int(len(placement) == len(goal_items) and all(loc_id in goal_ids for loc_id in placement.values()))
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
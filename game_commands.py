@@ -0,0 +1,240 @@
+"""CSC111 Project 1: Text Adventure Game - Command Compiler
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a compiler that parses every command of a game into a typed token once, and
+turns walkthrough scripts (in the format AdventureGameSimulation uses) into arrays of integers, rejecting
+malformed scripts before any of their commands are run.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from game_entities import Location
+
+PICK_PREFIX = 'Picked up Item '
+DROP_PREFIX = 'Dropped Item '
+# Points awarded the first time each item or key is picked up
+PICK_BONUS = 5
+MENU = ("look", "inventory", "score", "undo", "redo", "log", "weights", "quit")
+ITEM_ACTIONS = ("pickitem", "dropitem")
+
+# The kinds of token a command can compile to
+MOVE, PICK, DROP, MENU_COMMAND, ITEM_ACTION = range(5)
+# The token id of a command that is not a command of the game
+INVALID = -1
+
+
+class ScriptError(ValueError):
+    """
+    Raised when a walkthrough script contains a command that cannot be carried out.
+
+    Instance Attributes:
+        - index: The position of the offending command in the script.
+        - command: The offending command.
+    """
+    index: int
+    command: str
+
+    def __init__(self, index: int, command: str, reason: str) -> None:
+        """Initialize an error for the command at the given index of a script, which failed for reason."""
+        super().__init__(f'Command {index} ({command!r}): {reason}')
+        self.index = index
+        self.command = command
+
+
+@dataclass
+class CompiledScript:
+    """
+    A walkthrough script compiled against a game.
+
+    Instance Attributes:
+        - tokens: The token id of each command.
+        - location_ids: The location ID of every event the script logs: the starting location, then the
+          location after each command.
+        - inventory: The names of the items held at the end, in the order they were picked up.
+
+    Representation Invariants:
+        - len(self.location_ids) == len(self.tokens) + 1
+    """
+    tokens: array
+    location_ids: array
+    inventory: list[str]
+
+
+class CommandTable:
+    """
+    The table of the commands of one game world, each interned as an integer token id.
+
+    A token id has a kind (MOVE, PICK, DROP, MENU_COMMAND or ITEM_ACTION) and an argument: the index of the
+    item or key for PICK and DROP, the position in MENU or ITEM_ACTIONS for menu commands and item actions,
+    and -1 for moves (whose target depends on the location they are made at).
+
+    Menu commands and item actions are interned up front. Movement commands are interned the first time a
+    location they are available at is looked at, and pickups and drops the first time they are looked up,
+    so building a table costs nothing for the size of the world, and looking up arbitrary input never grows it
+    beyond the commands of the world.
+
+    Instance Attributes:
+        - texts: The command of each token id.
+        - kinds: The kind of each token id.
+        - args: The argument of each token id.
+        - entities: The names of every item and key, indexed by the arguments of PICK and DROP tokens.
+
+    Representation Invariants:
+        - len(self.texts) == len(self.kinds) == len(self.args)
+    """
+    # Private Instance Attributes:
+    #   - _ids: A dictionary mapping each interned command to its token id.
+    #   - _entity_index: A dictionary mapping each item and key name to its index in entities, built on first use.
+    #   - _get_location: Returns the Location with the given ID.
+    #   - _moves: For each location whose moves have been needed, a dictionary mapping the token id of each of
+    #     its movement commands to the ID of the location it leads to.
+    texts: list[str]
+    kinds: array
+    args: array
+    entities: tuple[str, ...]
+    _ids: dict[str, int]
+    _entity_index: Optional[dict[str, int]]
+    _get_location: Callable[[int], Location]
+    _moves: dict[int, dict[int, int]]
+
+    def __init__(self, entities: tuple[str, ...], get_location: Callable[[int], Location]) -> None:
+        """Initialize the command table of the world with the given item and key names, whose locations are
+        looked up by ID with get_location."""
+        self.texts = []
+        self.kinds = array('b')
+        self.args = array('i')
+        self.entities = entities
+        self._ids = {}
+        self._entity_index = None
+        self._get_location = get_location
+        self._moves = {}
+        for i, command in enumerate(MENU):
+            self._add(command, MENU_COMMAND, i)
+        for i, command in enumerate(ITEM_ACTIONS):
+            self._add(command, ITEM_ACTION, i)
+
+    def _add(self, command: str, kind: int, arg: int) -> int:
+        """Add a new token id for the given command and return it."""
+        token = len(self.texts)
+        self._ids[command] = token
+        self.texts.append(command)
+        self.kinds.append(kind)
+        self.args.append(arg)
+        return token
+
+    def token(self, command: str, location_id: Optional[int] = None) -> int:
+        """Return the token id of the given command, or INVALID if it is not a command of this world.
+
+        A movement command is only found if it has been interned already or it is available at the location
+        with the given ID (if one is given).
+        """
+        token = self._ids.get(command)
+        if token is not None:
+            return token
+        if command.startswith(PICK_PREFIX) or command.startswith(DROP_PREFIX):
+            pick = command.startswith(PICK_PREFIX)
+            index = self.entity_index().get(command[len(PICK_PREFIX if pick else DROP_PREFIX):])
+            if index is not None:
+                return self._add(command, PICK if pick else DROP, index)
+        if location_id is not None:
+            self._moves_at(location_id)
+        return self._ids.get(command, INVALID)
+
+    def shared(self, command: str) -> str:
+        """Return this table's copy of the given command if it is a command of this world, so that every log of
+        the world holding it shares one string, and command itself otherwise."""
+        token = self.token(command)
+        return command if token == INVALID else self.texts[token]
+
+    def entity_index(self) -> dict[str, int]:
+        """Return a dictionary mapping each item and key name to its index in entities. It is built on first use
+        and shared from then on, so it must not be changed."""
+        if self._entity_index is None:
+            self._entity_index = {name: i for i, name in enumerate(self.entities)}
+        return self._entity_index
+
+    def move_target(self, location_id: int, token: int) -> Optional[int]:
+        """Return the ID of the location the move with the given token id leads to from the location with the
+        given ID, or None if it is not a movement command there."""
+        return self._moves_at(location_id).get(token)
+
+    def _moves_at(self, location_id: int) -> dict[int, int]:
+        """Return a dictionary mapping the token id of each movement command at the location with the given ID
+        to the ID of the location it leads to, interning the commands if necessary."""
+        moves = self._moves.get(location_id)
+        if moves is None:
+            moves = {}
+            for command, target in self._get_location(location_id).available_commands.items():
+                token = self._ids.get(command)
+                moves[self._add(command, MOVE, -1) if token is None else token] = target
+            self._moves[location_id] = moves
+        return moves
+
+    def compile(self, initial_location_id: int, commands: Iterable[str],
+                inventory: Iterable[str] = ()) -> CompiledScript:
+        """Return the given walkthrough script compiled from initial_location_id, with the given items held at
+        the start.
+
+        Raise a ScriptError, before any command is carried out, if a command is not a movement command at
+        the location it is made at, picks up an unknown item, drops an item that is not held, or is a menu
+        command or item action (neither of which logs an event).
+        """
+        tokens = array('i')
+        location_ids = array('i', [initial_location_id])
+        held = list(inventory)
+        here = initial_location_id
+        moves = self._moves_at(here)
+        ids, kinds, args, moves_by_location = self._ids, self.kinds, self.args, self._moves
+        for index, command in enumerate(commands):
+            token = ids.get(command, INVALID)
+            if token == INVALID:
+                token = self.token(command, here)
+            target = moves.get(token)
+            if target is not None:
+                here = target
+                moves = moves_by_location.get(here)
+                if moves is None:
+                    moves = self._moves_at(here)
+            elif token != INVALID and kinds[token] == PICK:
+                held.append(self.entities[args[token]])
+            elif token != INVALID and kinds[token] == DROP:
+                name = self.entities[args[token]]
+                if name not in held:
+                    raise ScriptError(index, command, f'{name!r} is not being held')
+                held.remove(name)
+            elif token != INVALID and kinds[token] != MOVE:
+                raise ScriptError(index, command, 'menu commands and item actions do not log events')
+            elif command.startswith(PICK_PREFIX) or command.startswith(DROP_PREFIX):
+                raise ScriptError(index, command, 'there is no such item or key')
+            else:
+                raise ScriptError(index, command, f'not a command at location {here}')
+            tokens.append(token)
+            location_ids.append(here)
+        return CompiledScript(tokens, location_ids, held)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
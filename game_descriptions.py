@@ -0,0 +1,154 @@
+"""CSC111 Project 1: Text Adventure Game - Description Store
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a store for location descriptions that keeps them on disk instead of in memory.
+Only the byte offset of each description is kept; its text is decoded from a memory-mapped sidecar file the
+first time it is shown, and the most recently shown descriptions are cached.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+# The suffix of the sidecar file holding the descriptions of a game data file
+DESCRIPTIONS_SUFFIX = '.descriptions'
+# The default number of decoded descriptions kept in memory
+DESCRIPTION_CACHE_SIZE = 256
+# The size in bytes of the header of a sidecar file: the SHA-256 digest of the rest of the file
+_HEADER_SIZE = 32
+
+
+class DescriptionStore:
+    """
+    A read-only table of texts stored in a memory-mapped sidecar file.
+
+    The sidecar file is the SHA-256 digest of its body followed by the body: every text encoded as UTF-8, one
+    after another. Text i is the bytes from offsets[i] to offsets[i + 1] of the body.
+
+    Instance Attributes:
+        - path: The path of the sidecar file.
+        - offsets: The start of each text in the body; offsets[-1] is the length of the body.
+        - cache_size: The most decoded texts kept in memory.
+
+    Representation Invariants:
+        - len(self.offsets) >= 1
+        - len(self._cache) <= self.cache_size
+    """
+    # Private Instance Attributes:
+    #   - _map: The memory-mapped sidecar file, or None if the body is empty.
+    #   - _cache: The most recently read texts, by index, least recently read first.
+    path: str
+    offsets: array
+    cache_size: int
+    _map: Optional[mmap.mmap]
+    _cache: OrderedDict[int, str]
+
+    def __init__(self, path: str, offsets: array, cache_size: int = DESCRIPTION_CACHE_SIZE) -> None:
+        """Open the sidecar file at path, whose texts start at the given offsets.
+
+        Preconditions:
+            - the file at path was written by DescriptionStore.write with texts at these offsets
+        """
+        self.path = path
+        self.offsets = offsets
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._map = None
+        if offsets[-1] > 0:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def write(cls, path: str, texts: Iterable[str], cache_size: int = DESCRIPTION_CACHE_SIZE) -> DescriptionStore:
+        """Return a store of the given texts, in order, backed by the sidecar file at path.
+
+        The file is only (atomically) rewritten if it does not already hold exactly these texts, so that other
+        processes that have it mapped are not disturbed.
+        """
+        offsets = array('q', [0])
+        chunks = []
+        for text in texts:
+            chunk = text.encode('utf-8')
+            chunks.append(chunk)
+            offsets.append(offsets[-1] + len(chunk))
+        body = b''.join(chunks)
+        digest = hashlib.sha256(body).digest()
+
+        if _read_header(path, _HEADER_SIZE + len(body)) != digest:
+            tmp_file = path + '.' + str(os.getpid()) + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(digest)
+                f.write(body)
+            os.replace(tmp_file, path)
+        return cls(path, offsets, cache_size)
+
+    def __len__(self) -> int:
+        """Return the number of texts in this store."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        """Return the text with the given index, decoding it from the sidecar file unless it is cached."""
+        text = self._cache.get(index)
+        if text is not None:
+            self._cache.move_to_end(index)
+            return text
+        start, end = self.offsets[index], self.offsets[index + 1]
+        text = '' if start == end else self._map[_HEADER_SIZE + start:_HEADER_SIZE + end].decode('utf-8')
+        self._cache[index] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def __getstate__(self) -> dict:
+        """Return the state of this store for pickling: everything but the mapped file and the cache."""
+        return {'path': self.path, 'offsets': self.offsets, 'cache_size': self.cache_size}
+
+    def __setstate__(self, state: dict) -> None:
+        """Reopen the store whose state was returned by __getstate__."""
+        self.__init__(state['path'], state['offsets'], state['cache_size'])
+
+    def close(self) -> None:
+        """Unmap the sidecar file. Afterwards, only cached texts can be read."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def _read_header(path: str, expected_size: int) -> Optional[bytes]:
+    """Return the header of the sidecar file at path, or None if there is no such file or it is not
+    expected_size bytes long."""
+    try:
+        if os.path.getsize(path) != expected_size:
+            return None
+        with open(path, 'rb') as f:
+            return f.read(_HEADER_SIZE)
+    except OSError:
+        return None
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
@@ -18,8 +18,8 @@ please consult our Course Syllabus.
 
 This file is Copyright (c) 2025 CSC111 Teaching Team
 """
-from dataclasses import dataclass
-from typing import Any, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
 
 
 @dataclass
@@ -30,21 +30,65 @@ class Player:
     Instance Attributes:
         - _inventory: A list of item (or key) names currently held by the player.
         - score: The player's current score.
+        - item_weight: Returns the weight of the item (or key) with the given name (e.g. AdventureGame.item_weight),
+          used to weigh the starting inventory and every item added without a weight. It may be None if every
+          item is added with its weight.
+        - _weights: A dictionary mapping each name in _inventory to the weight it was added with.
+        - _total_weight: The sum of the values of _weights.
+
+    Representation Invariants:
+        - set(self._inventory) == set(self._weights)
+        - len(self._inventory) == len(self._weights)
     """
     _inventory: list[str]
     score: int
+    item_weight: Optional[Callable[[str], float]] = field(default=None, repr=False, compare=False)
+    _weights: dict[str, float] = field(default_factory=dict, repr=False, compare=False)
+    _total_weight: float = field(default=0.0, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Index and weigh the starting inventory.
+
+        Raise a ValueError if the player starts with items but item_weight is None.
+        """
+        for item in self._inventory:
+            weight = self._weigh(item)
+            self._weights[item] = weight
+            self._total_weight += weight
 
-    def add_item(self, item_to_be_added: str) -> None:
+    def add_item(self, item_to_be_added: str, weight: Optional[float] = None) -> None:
         """
-        Add an item (or key) to the player's inventory.
+        Add an item (or key) to the player's inventory, weighing it with item_weight unless its weight is given.
+
+        Raise a ValueError if no weight is given and item_weight is None.
+
+        Preconditions:
+            - not self.has_item(item_to_be_added)
         """
+        if weight is None:
+            weight = self._weigh(item_to_be_added)
         self._inventory.append(item_to_be_added)
+        self._weights[item_to_be_added] = weight
+        self._total_weight += weight
 
     def remove_item(self, item_to_be_removed: str) -> None:
         """
         Remove an item (or key) from the player's inventory.
         """
         self._inventory.remove(item_to_be_removed)
+        self._total_weight -= self._weights.pop(item_to_be_removed)
+
+    def has_item(self, item: str) -> bool:
+        """
+        Return whether the player is holding the given item (or key).
+        """
+        return item in self._weights
+
+    def get_weight(self) -> float:
+        """
+        Return the total weight of the player's inventory.
+        """
+        return self._total_weight
 
     def get_inventory(self) -> list[str]:
         """
@@ -52,17 +96,25 @@ class Player:
         """
         return self._inventory
 
-    def display_inventory(self) -> None:
+    def _weigh(self, item: str) -> float:
+        """
+        Return the weight of the given item (or key) from item_weight, raising a ValueError if it is None.
+        """
+        if self.item_weight is None:
+            raise ValueError(f'item_weight is needed to weigh {item!r}')
+        return self.item_weight(item)
+
+    def display_inventory(self, out: Callable[[str], None] = print) -> None:
         """
-        Print the player's inventory to the console.
+        Print the player's inventory to the console, or pass each line to out instead.
         """
-        print("Your inventory has items:")
+        out("Your inventory has items:")
         if len(self._inventory) == 0:
-            print("NO ITEMS")
+            out("NO ITEMS")
         else:
             for item in self._inventory:
-                print("- " + item)
-        print()
+                out("- " + item)
+        out("")
 
 
 @dataclass
@@ -76,7 +128,7 @@ class Location:
         - brief_description: A short description of the location.
         - long_description: A detailed description of the location.
         - available_commands: A dictionary mapping command strings to the next location ID.
-        - items: A list of item names available at this location.
+        - items: The names of the items available at this location.
         - visited: A boolean indicating whether the location has been visited.
 
     Representation Invariants:
@@ -88,16 +140,16 @@ class Location:
     brief_description: str
     long_description: str
     available_commands: dict[str, int]
-    items: list[str]
+    items: tuple[str, ...]
     visited: bool = False
 
-    def display_items(self) -> None:
+    def display_items(self, out: Callable[[str], None] = print) -> None:
         """
-        Print the list of items available at this location.
+        Print the list of items available at this location, or pass each line to out instead.
         """
         for item in self.items:
-            print("- " + item)
-        print()
+            out("- " + item)
+        out("")
 
 
 @dataclass
@@ -109,10 +161,13 @@ class Puzzle:
         -id_puzzle: The unique identifier for the puzzle.
         -description: A description or prompt for the puzzle.
         -answer: The correct answer to the puzzle (of any type).
+        -kind: The name of the kind of puzzle (see game_puzzles), which decides how it is solved. Game data that
+         does not name one is given game_puzzles.legacy_kind when it is loaded.
     """
     id_puzzle: int
     description: str
     answer: Any
+    kind: str
 
 
 @dataclass
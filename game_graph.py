@@ -0,0 +1,291 @@
+"""CSC111 Project 1: Text Adventure Game - Map Graph
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a compiled index of the game map, used to answer reachability, distance and
+route questions about the map in (amortized) constant time.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from game_entities import Location
+
+# Maps with at most this many locations get every shortest-path distance computed up front
+ALL_PAIRS_LIMIT = 512
+# The number of single-source shortest-path rows kept for larger maps
+ROW_CACHE_SIZE = 64
+# The distance recorded for a location that cannot be reached
+UNREACHABLE = -1
+
+
+class MapGraph:
+    """
+    A compiled, read-only index of the map formed by every location's available commands.
+
+    Locations are numbered 0 to n - 1 in the order given (their index). The command edges leaving the
+    location with index i are targets[offsets[i]:offsets[i + 1]], labelled with the commands at the same
+    positions of edge_commands.
+
+    For maps with at most ALL_PAIRS_LIMIT locations, the distance and BFS-parent of every pair of locations
+    is computed when the graph is built. For larger maps, a breadth-first search is run the first time
+    each source location is queried and the most recent ROW_CACHE_SIZE results are kept.
+
+    Instance Attributes:
+        - location_ids: The location ID of each index.
+        - offsets: The start of each location's edges in targets; offsets[n] == len(targets).
+        - targets: The index of the location each edge leads to.
+        - edge_commands: The command of each edge.
+
+    Representation Invariants:
+        - len(self.offsets) == len(self.location_ids) + 1
+        - len(self.targets) == len(self.edge_commands) == self.offsets[-1]
+    """
+    # Private Instance Attributes:
+    #   - _index: A dictionary mapping each location ID to its index.
+    #   - _all_pairs: For small maps, the distance row and BFS-parent row of every source index.
+    #   - _rows: For large maps, the most recently used distance and BFS-parent rows, by source index.
+    #   - _reverse_rows: The cached distance rows *to* each target index.
+    #   - _incoming: The indexes of the locations with an edge into each index, built on first use.
+    location_ids: list[int]
+    offsets: array
+    targets: array
+    edge_commands: list[str]
+    _index: dict[int, int]
+    _all_pairs: Optional[list[tuple[array, array]]]
+    _rows: OrderedDict[int, tuple[array, array]]
+    _reverse_rows: OrderedDict[int, array]
+    _incoming: Optional[list[list[int]]]
+
+    def __init__(self, locations: Iterable[Location]) -> None:
+        """Compile the map formed by the available commands of the given locations.
+
+        Preconditions:
+            - every command of every location leads to one of the given locations
+        """
+        locations = list(locations)
+        self.location_ids = [location.id_num for location in locations]
+        self._index = {loc_id: i for i, loc_id in enumerate(self.location_ids)}
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.edge_commands = []
+        for location in locations:
+            for command, target_id in location.available_commands.items():
+                self.targets.append(self._index[target_id])
+                self.edge_commands.append(command)
+            self.offsets.append(len(self.targets))
+        self._prepare()
+
+    @classmethod
+    def from_csr(cls, location_ids: list[int], offsets: array, targets: array, edge_commands: list[str]) -> MapGraph:
+        """Return the map whose edges are already laid out as in the class docstring. The arrays are shared,
+        not copied.
+
+        Preconditions:
+            - len(offsets) == len(location_ids) + 1
+            - len(targets) == len(edge_commands) == offsets[-1]
+        """
+        graph = cls.__new__(cls)
+        graph.location_ids = location_ids
+        graph._index = {loc_id: i for i, loc_id in enumerate(location_ids)}
+        graph.offsets = offsets
+        graph.targets = targets
+        graph.edge_commands = edge_commands
+        graph._prepare()
+        return graph
+
+    def _prepare(self) -> None:
+        """Set up the distance caches, computing every distance now if the map is small enough."""
+        self._rows = OrderedDict()
+        self._reverse_rows = OrderedDict()
+        self._incoming = None
+        if len(self.location_ids) <= ALL_PAIRS_LIMIT:
+            self._all_pairs = [self._bfs(source) for source in range(len(self.location_ids))]
+        else:
+            self._all_pairs = None
+
+    def __len__(self) -> int:
+        """Return the number of locations in this map."""
+        return len(self.location_ids)
+
+    def index_of(self, location_id: int) -> int:
+        """Return the index of the location with the given ID."""
+        return self._index[location_id]
+
+    def distance(self, from_id: int, to_id: int) -> Optional[int]:
+        """Return the fewest moves needed to go from one location to another, or None if it is not possible."""
+        dist = self._row(self._index[from_id])[0][self._index[to_id]]
+        return None if dist == UNREACHABLE else dist
+
+    def distance_to(self, from_id: int, to_id: int) -> Optional[int]:
+        """Return the same value as self.distance(from_id, to_id).
+
+        Unlike distance, the search is rooted at to_id and cached per target, which is faster when many
+        different locations are measured against the same few targets (such as the goal locations).
+        """
+        if self._all_pairs is not None:
+            return self.distance(from_id, to_id)
+        target = self._index[to_id]
+        row = self._reverse_rows.get(target)
+        if row is None:
+            row = self._reverse_bfs(target)
+            self._reverse_rows[target] = row
+            if len(self._reverse_rows) > ROW_CACHE_SIZE:
+                self._reverse_rows.popitem(last=False)
+        else:
+            self._reverse_rows.move_to_end(target)
+        dist = row[self._index[from_id]]
+        return None if dist == UNREACHABLE else dist
+
+    def can_reach(self, from_id: int, to_id: int, max_moves: int) -> bool:
+        """Return whether to_id can be reached from from_id in at most max_moves moves."""
+        dist = self.distance(from_id, to_id)
+        return dist is not None and dist <= max_moves
+
+    def path(self, from_id: int, to_id: int) -> Optional[list[int]]:
+        """Return the IDs of the locations along a shortest route from one location to another (including both
+        ends), or None if there is no route."""
+        source, target = self._index[from_id], self._index[to_id]
+        dist, parent = self._row(source)
+        if dist[target] == UNREACHABLE:
+            return None
+        indexes = [target]
+        while indexes[-1] != source:
+            indexes.append(parent[indexes[-1]])
+        return [self.location_ids[i] for i in reversed(indexes)]
+
+    def route(self, from_id: int, to_id: int) -> Optional[list[str]]:
+        """Return the commands that follow a shortest route from one location to another, or None if there is
+        no route."""
+        path = self.path(from_id, to_id)
+        if path is None:
+            return None
+        return [self.command_between(path[i], path[i + 1]) for i in range(len(path) - 1)]
+
+    def hint(self, from_id: int, to_id: int) -> Optional[str]:
+        """Return the first command of a shortest route from one location to another, or None if there is no
+        such command (because the locations are the same or there is no route)."""
+        path = self.path(from_id, to_id)
+        if path is None or len(path) < 2:
+            return None
+        return self.command_between(path[0], path[1])
+
+    def command_between(self, from_id: int, to_id: int) -> str:
+        """Return a command leading directly from one location to the other.
+
+        Preconditions:
+            - to_id is one move away from from_id
+        """
+        source, target = self._index[from_id], self._index[to_id]
+        for edge in range(self.offsets[source], self.offsets[source + 1]):
+            if self.targets[edge] == target:
+                return self.edge_commands[edge]
+        raise ValueError(f'No command leads from location {from_id} to location {to_id}')
+
+    def within(self, from_id: int, max_moves: int) -> dict[int, int]:
+        """Return a dictionary mapping the ID of every location at most max_moves moves from from_id to its
+        distance. Only that neighbourhood is searched, however large the map."""
+        source = self._index[from_id]
+        found = {source: 0}
+        frontier = [source]
+        offsets, targets = self.offsets, self.targets
+        for depth in range(1, max_moves + 1):
+            next_frontier = []
+            for node in frontier:
+                for edge in range(offsets[node], offsets[node + 1]):
+                    target = targets[edge]
+                    if target not in found:
+                        found[target] = depth
+                        next_frontier.append(target)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return {self.location_ids[i]: dist for i, dist in found.items()}
+
+    def _row(self, source: int) -> tuple[array, array]:
+        """Return the distance row and BFS-parent row of the given source index."""
+        if self._all_pairs is not None:
+            return self._all_pairs[source]
+        row = self._rows.get(source)
+        if row is None:
+            row = self._bfs(source)
+            self._rows[source] = row
+            if len(self._rows) > ROW_CACHE_SIZE:
+                self._rows.popitem(last=False)
+        else:
+            self._rows.move_to_end(source)
+        return row
+
+    def _bfs(self, source: int) -> tuple[array, array]:
+        """Return the distance from the given source index to every index, and the index before each one on a
+        shortest route (UNREACHABLE for both where there is no route)."""
+        n = len(self.location_ids)
+        dist = array('i', [UNREACHABLE]) * n
+        parent = array('i', [UNREACHABLE]) * n
+        dist[source] = 0
+        parent[source] = source
+        frontier = [source]
+        offsets, targets = self.offsets, self.targets
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for edge in range(offsets[node], offsets[node + 1]):
+                    target = targets[edge]
+                    if dist[target] == UNREACHABLE:
+                        dist[target] = depth
+                        parent[target] = node
+                        next_frontier.append(target)
+            frontier = next_frontier
+        return dist, parent
+
+    def _reverse_bfs(self, target: int) -> array:
+        """Return the distance from every index to the given target index."""
+        n = len(self.location_ids)
+        if self._incoming is None:
+            incoming = [[] for _ in range(n)]
+            for node in range(n):
+                for edge in range(self.offsets[node], self.offsets[node + 1]):
+                    incoming[self.targets[edge]].append(node)
+            self._incoming = incoming
+        incoming = self._incoming
+        dist = array('i', [UNREACHABLE]) * n
+        dist[target] = 0
+        frontier = [target]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for source in incoming[node]:
+                    if dist[source] == UNREACHABLE:
+                        dist[source] = depth
+                        next_frontier.append(source)
+            frontier = next_frontier
+        return dist
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
@@ -0,0 +1,227 @@
+"""CSC111 Project 1: Text Adventure Game - World Overlay
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the copy-on-write overlay that holds the state of the world a game changes as it
+is played: the items at each location and whether it has been visited. The locations themselves are shared,
+and never written to, so any number of games can be played at once in one loaded world.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from typing import Callable, Iterable, Iterator, Mapping
+
+from game_entities import Location
+
+
+class WorldOverlay:
+    """
+    The items at and visited flag of every location of one game, stored as the changes made to a shared world.
+
+    A location's items are copied into the overlay the first time they change; until then they are read from
+    the shared location. A new overlay holds nothing, so it costs the same for any size of world.
+
+    Instance Attributes:
+        - base: The shared locations, by ID, which are never written to.
+    """
+    # Private Instance Attributes:
+    #   - _items: A dictionary mapping the ID of each location whose items have changed to its items.
+    #   - _visited: A dictionary mapping the ID of each location whose visited flag has been set to that flag.
+    __slots__ = ('base', '_items', '_visited')
+    base: Mapping[int, Location]
+    _items: dict[int, list[str]]
+    _visited: dict[int, bool]
+
+    def __init__(self, base: Mapping[int, Location]) -> None:
+        """Initialize an overlay of base with no changes."""
+        self.base = base
+        self._items = {}
+        self._visited = {}
+
+    def copy(self) -> WorldOverlay:
+        """Return a new overlay of the same world with the same changes, which can be changed independently."""
+        overlay = WorldOverlay(self.base)
+        overlay._items = {loc_id: list(items) for loc_id, items in self._items.items()}
+        overlay._visited = dict(self._visited)
+        return overlay
+
+    def clear(self) -> None:
+        """Undo every change, so that the world is as it is in base."""
+        self._items.clear()
+        self._visited.clear()
+
+    def get(self, loc_id: int) -> OverlayLocation:
+        """Return the location with the given ID as it is in this game, raising KeyError if there is none."""
+        return OverlayLocation(self.base[loc_id], self)
+
+    def changes(self) -> tuple[dict[int, list[str]], dict[int, bool]]:
+        """Return the dictionaries of changed items and visited flags by location ID, which OverlayLocation reads
+        directly. They must only be changed through this overlay."""
+        return self._items, self._visited
+
+    def items(self, loc_id: int) -> tuple[str, ...]:
+        """Return the names of the items at the location with the given ID."""
+        items = self._items.get(loc_id)
+        return self.base[loc_id].items if items is None else tuple(items)
+
+    def visited(self, loc_id: int) -> bool:
+        """Return whether the location with the given ID has been visited."""
+        visited = self._visited.get(loc_id)
+        return self.base[loc_id].visited if visited is None else visited
+
+    def set_items(self, loc_id: int, items: Iterable[str]) -> None:
+        """Replace the items at the location with the given ID with the given items."""
+        self._items[loc_id] = list(items)
+
+    def add_item(self, loc_id: int, item: str) -> None:
+        """Put the given item at the location with the given ID."""
+        self._own_items(loc_id).append(item)
+
+    def remove_item(self, loc_id: int, item: str) -> None:
+        """Take the given item away from the location with the given ID.
+
+        Preconditions:
+            - item in self.items(loc_id)
+        """
+        self._own_items(loc_id).remove(item)
+
+    def set_visited(self, loc_id: int, visited: bool) -> None:
+        """Record whether the location with the given ID has been visited."""
+        self._visited[loc_id] = visited
+
+    def changed_items(self) -> Iterator[tuple[int, list[str]]]:
+        """Yield the ID and items of every location whose items have been changed (even if back to what they
+        were)."""
+        return iter(self._items.items())
+
+    def _own_items(self, loc_id: int) -> list[str]:
+        """Return this overlay's list of the items at the location with the given ID, copying it from the shared
+        location first if necessary."""
+        items = self._items.get(loc_id)
+        if items is None:
+            items = list(self.base[loc_id].items)
+            self._items[loc_id] = items
+        return items
+
+
+class OverlayLocation:
+    """
+    A location as it is in one game: the shared location's attributes, with its items and visited flag read
+    from and written to the game's overlay. It has the same attributes and methods as Location.
+
+    The items cannot be changed in place; assign a new sequence to items, or use add_item and remove_item.
+
+    Instance Attributes:
+        - location: The shared location.
+        - overlay: The overlay of the game the location is seen in.
+        - id_num: Unique identifier for the location.
+    """
+    # Private Instance Attributes:
+    #   - _items: The overlay's dictionary of changed items (see WorldOverlay.changes).
+    #   - _visited: The overlay's dictionary of changed visited flags.
+    __slots__ = ('location', 'overlay', 'id_num', '_items', '_visited')
+    location: Location
+    overlay: WorldOverlay
+    id_num: int
+    _items: dict[int, list[str]]
+    _visited: dict[int, bool]
+
+    def __init__(self, location: Location, overlay: WorldOverlay) -> None:
+        """Initialize a view of the shared location as it is in the game with the given overlay."""
+        self.location = location
+        self.overlay = overlay
+        self.id_num = location.id_num
+        self._items, self._visited = overlay.changes()
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether other is a view of the same location in the same game."""
+        return isinstance(other, OverlayLocation) and other.overlay is self.overlay and other.id_num == self.id_num
+
+    def __hash__(self) -> int:
+        """Return a hash of this view, equal for views of the same location in the same game."""
+        return hash((id(self.overlay), self.id_num))
+
+    def __repr__(self) -> str:
+        """Return a string representation of this view."""
+        return f'OverlayLocation(id_num={self.id_num}, name={self.name!r})'
+
+    @property
+    def name(self) -> str:
+        """The name of the location."""
+        return self.location.name
+
+    @property
+    def brief_description(self) -> str:
+        """A short description of the location."""
+        return self.location.brief_description
+
+    @property
+    def long_description(self) -> str:
+        """A detailed description of the location."""
+        return self.location.long_description
+
+    @property
+    def available_commands(self) -> dict[str, int]:
+        """A dictionary mapping command strings to the next location ID."""
+        return self.location.available_commands
+
+    @property
+    def items(self) -> tuple[str, ...]:
+        """The names of the items available at this location in this game, as a tuple, so that they can only be
+        changed through this view's setter, add_item and remove_item."""
+        items = self._items.get(self.id_num)
+        return self.location.items if items is None else tuple(items)
+
+    @items.setter
+    def items(self, items: Iterable[str]) -> None:
+        """Replace the items available at this location in this game."""
+        self.overlay.set_items(self.id_num, items)
+
+    @property
+    def visited(self) -> bool:
+        """Whether the location has been visited in this game."""
+        visited = self._visited.get(self.id_num)
+        return self.location.visited if visited is None else visited
+
+    @visited.setter
+    def visited(self, value: bool) -> None:
+        """Record whether the location has been visited in this game."""
+        self.overlay.set_visited(self.id_num, value)
+
+    def add_item(self, item: str) -> None:
+        """Put the given item at this location in this game."""
+        self.overlay.add_item(self.id_num, item)
+
+    def remove_item(self, item: str) -> None:
+        """Take the given item away from this location in this game."""
+        self.overlay.remove_item(self.id_num, item)
+
+    def display_items(self, out: Callable[[str], None] = print) -> None:
+        """
+        Print the list of items available at this location, or pass each line to out instead.
+        """
+        for item in self.items:
+            out("- " + item)
+        out("")
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
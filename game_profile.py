@@ -0,0 +1,339 @@
+"""CSC111 Project 1: Text Adventure Game - Profiler
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains an optional profiler for the hot paths of the game engine: loading the world,
+the checks made when an item is picked up, the event lists, rendering, and whole turns of a GameSession or
+runs of an AdventureGameSimulation.
+
+While a Profiler is enabled, each function in hot_paths() is replaced by a wrapper that counts its calls and
+records how long each one took in a histogram; disabling it puts the original functions back, so a game that
+is not being profiled runs exactly the same code as before. The results can be saved as JSON, or as a dump in
+the format of cProfile, which pstats (and any tool that reads cProfile output) can load.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import functools
+import json
+import marshal
+from time import perf_counter_ns
+from typing import Any, Callable, Optional
+
+# The number of histogram buckets: bucket i counts the calls that took less than 2 ** i nanoseconds (and at
+# least 2 ** (i - 1)), and the last bucket also counts every longer call
+NUM_BUCKETS = 48
+
+# The profiler that is currently enabled, if any
+_active: Optional[Profiler] = None
+
+
+def hot_paths() -> list[tuple[type, str, str]]:
+    """Return the (class, method name, name to report it as) of every function a Profiler instruments.
+
+    The classes are imported here rather than at the top of the module, so that the modules they are defined
+    in can import this one.
+    """
+    from adventure import AdventureGame
+    from game_render import Renderer
+    from game_session import GameSession
+    from proj1_event_logger import CompactEventList, EventList, JournalEventList
+    from proj1_simulation import AdventureGameSimulation
+
+    paths = [(AdventureGame, 'load_world', 'load'),
+             (AdventureGame, 'check_weight', 'check_weight'),
+             (AdventureGame, 'check_key', 'check_key'),
+             (AdventureGame, 'check_puzzle', 'check_puzzle'),
+             (AdventureGame, 'sum_inv_weight', 'sum_inv_weight'),
+             (Renderer, 'look', 'render.look'),
+             (Renderer, 'items', 'render.items'),
+             (Renderer, 'actions', 'render.actions'),
+             (GameSession, 'start', 'turn'),
+             (GameSession, 'step', 'turn'),
+             (AdventureGameSimulation, 'generate_events', 'simulation')]
+    for log_class in (EventList, CompactEventList, JournalEventList):
+        paths.append((log_class, 'add_event', log_class.__name__ + '.add_event'))
+        paths.append((log_class, 'remove_last_event', log_class.__name__ + '.remove_last_event'))
+    return paths
+
+
+class Timing:
+    """
+    The calls of one instrumented function (or of several reported under the same name).
+
+    Instance Attributes:
+        - name: The name the function is reported as.
+        - code: The (file name, line number, function name) cProfile would identify the function by.
+        - calls: The number of calls.
+        - total_ns: The total time of every call, in nanoseconds.
+        - own_ns: The part of total_ns not spent in calls to other instrumented functions.
+        - min_ns: The time of the fastest call.
+        - max_ns: The time of the slowest call.
+        - buckets: The histogram of the call times (see NUM_BUCKETS).
+        - callers: Maps the name of each instrumented function this one was called from to the
+          [calls, own time, total time] of those calls.
+
+    Representation Invariants:
+        - self.calls == sum(self.buckets)
+        - 0 <= self.own_ns <= self.total_ns
+    """
+    __slots__ = ('name', 'code', 'calls', 'total_ns', 'own_ns', 'min_ns', 'max_ns', 'buckets', 'callers')
+    name: str
+    code: tuple[str, int, str]
+    calls: int
+    total_ns: int
+    own_ns: int
+    min_ns: int
+    max_ns: int
+    buckets: list[int]
+    callers: dict[str, list[int]]
+
+    def __init__(self, name: str, code: tuple[str, int, str]) -> None:
+        """Initialize the timing of a function with no calls."""
+        self.name = name
+        self.code = code
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every call recorded so far."""
+        self.calls = 0
+        self.total_ns = 0
+        self.own_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * NUM_BUCKETS
+        self.callers = {}
+
+    def add(self, elapsed: int, own: int, caller: Optional[str]) -> None:
+        """Record a call that took elapsed nanoseconds, own of them outside other instrumented functions, made
+        from the instrumented function named caller (or None if it was not)."""
+        if self.calls == 0 or elapsed < self.min_ns:
+            self.min_ns = elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        self.calls += 1
+        self.total_ns += elapsed
+        self.own_ns += own
+        self.buckets[min(elapsed.bit_length(), NUM_BUCKETS - 1)] += 1
+        if caller is not None:
+            counts = self.callers.get(caller)
+            if counts is None:
+                self.callers[caller] = [1, own, elapsed]
+            else:
+                counts[0] += 1
+                counts[1] += own
+                counts[2] += elapsed
+
+    def percentile_ns(self, q: float) -> int:
+        """Return an upper bound on the q-th percentile of the call times: the top of the histogram bucket it
+        falls in (or the slowest call, if that is smaller).
+
+        Preconditions:
+            - self.calls > 0
+            - 0 < q <= 100
+        """
+        rank = max(1, -(-self.calls * q // 100))
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(1 << i, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return this timing as a dictionary that can be saved as JSON (with every time in microseconds)."""
+        return {'calls': self.calls,
+                'total_us': self.total_ns / 1000,
+                'own_us': self.own_ns / 1000,
+                'mean_us': self.total_ns / self.calls / 1000,
+                'min_us': self.min_ns / 1000,
+                'p50_us': self.percentile_ns(50) / 1000,
+                'p99_us': self.percentile_ns(99) / 1000,
+                'max_us': self.max_ns / 1000,
+                'histogram_us': {str((1 << i) / 1000): count for i, count in enumerate(self.buckets) if count},
+                'callers': {name: counts[0] for name, counts in self.callers.items()}}
+
+
+class Profiler:
+    """
+    Counts the calls to, and times, the functions in hot_paths() while it is enabled.
+
+    A profiler is enabled with enable() or by using it as a context manager, and may be enabled again while it
+    is (e.g. by a simulation run inside a profiled script); its functions are only put back when it has been
+    disabled as many times. It instruments the classes themselves, so every game in the process is profiled
+    while it is enabled, and only one profiler can be enabled at a time.
+
+    Instance Attributes:
+        - timings: Maps the name of each function that has been instrumented to its Timing.
+        - counters: Maps the name of each counter (see count) to its value.
+    """
+    # Private Instance Attributes:
+    #   - _depth: The number of times this profiler has been enabled but not yet disabled.
+    #   - _originals: The (class, method name, original function) of every function that is instrumented.
+    #   - _stack: For each instrumented call in progress, innermost last, [its name, the time in nanoseconds
+    #     spent in the instrumented calls it made].
+    timings: dict[str, Timing]
+    counters: dict[str, int]
+    _depth: int
+    _originals: list[tuple[type, str, Callable]]
+    _stack: list[list]
+
+    def __init__(self) -> None:
+        """Initialize a disabled profiler with no results."""
+        self.timings = {}
+        self.counters = {}
+        self._depth = 0
+        self._originals = []
+        self._stack = []
+
+    def __enter__(self) -> Profiler:
+        """Enable this profiler."""
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Disable this profiler."""
+        self.disable()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this profiler is enabled."""
+        return self._depth > 0
+
+    def enable(self) -> None:
+        """Start instrumenting the functions in hot_paths(), unless this profiler is already enabled.
+
+        Raise a RuntimeError if another profiler is enabled.
+        """
+        global _active
+        if self._depth == 0:
+            if _active is not None:
+                raise RuntimeError('Another profiler is already enabled')
+            for owner, attr, name in hot_paths():
+                func = owner.__dict__[attr]
+                self._originals.append((owner, attr, func))
+                setattr(owner, attr, self._instrument(func, name))
+            _active = self
+        self._depth += 1
+
+    def disable(self) -> None:
+        """Undo one call to enable, putting the original functions back once every call has been undone.
+
+        Preconditions:
+            - self.enabled
+        """
+        global _active
+        self._depth -= 1
+        if self._depth == 0:
+            for owner, attr, func in reversed(self._originals):
+                setattr(owner, attr, func)
+            self._originals.clear()
+            _active = None
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add amount to the counter with the given name."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self) -> None:
+        """Forget every result recorded so far."""
+        for timing in self.timings.values():
+            timing.clear()
+        self.counters.clear()
+
+    def _instrument(self, func: Callable, name: str) -> Callable:
+        """Return a function that calls func, recording each call under the given name."""
+        timing = self.timings.get(name)
+        if timing is None:
+            code = func.__code__
+            timing = Timing(name, (code.co_filename, code.co_firstlineno, name))
+            self.timings[name] = timing
+        stack = self._stack
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            """Call the instrumented function and record how long it took."""
+            frame = [name, 0]
+            stack.append(frame)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                stack.pop()
+                if stack:
+                    caller = stack[-1]
+                    caller[1] += elapsed
+                    timing.add(elapsed, elapsed - frame[1], caller[0])
+                else:
+                    timing.add(elapsed, elapsed - frame[1], None)
+
+        return timed
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the results as a dictionary that can be saved as JSON."""
+        return {'timings': {name: timing.to_dict() for name, timing in sorted(self.timings.items())
+                            if timing.calls > 0},
+                'counters': dict(sorted(self.counters.items()))}
+
+    def dump_json(self, path: str) -> None:
+        """Save the results to the file at path as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def dump_stats(self, path: str) -> None:
+        """Save the results to the file at path in the format of cProfile.Profile.dump_stats, so that they can
+        be loaded with pstats.Stats(path).
+
+        Only the instrumented functions appear, and time spent outside them is not counted.
+        """
+        stats = {}
+        for timing in self.timings.values():
+            if timing.calls == 0:
+                continue
+            callers = {self.timings[caller].code: (counts[0], counts[0], counts[1] / 1e9, counts[2] / 1e9)
+                       for caller, counts in timing.callers.items()}
+            stats[timing.code] = (timing.calls, timing.calls, timing.own_ns / 1e9, timing.total_ns / 1e9, callers)
+        with open(path, 'wb') as f:
+            marshal.dump(stats, f)
+
+    def report(self) -> str:
+        """Return a table of the results, slowest function (by total time) first."""
+        lines = [f"{'function':<34}{'calls':>9}{'total ms':>11}{'own ms':>10}{'mean us':>10}{'p50 us':>9}"
+                 f"{'p99 us':>9}{'max us':>10}"]
+        for timing in sorted(self.timings.values(), key=lambda t: t.total_ns, reverse=True):
+            if timing.calls == 0:
+                continue
+            lines.append(f"{timing.name:<34}{timing.calls:>9}{timing.total_ns / 1e6:>11.2f}"
+                         f"{timing.own_ns / 1e6:>10.2f}{timing.total_ns / timing.calls / 1000:>10.2f}"
+                         f"{timing.percentile_ns(50) / 1000:>9.2f}{timing.percentile_ns(99) / 1000:>9.2f}"
+                         f"{timing.max_ns / 1000:>10.2f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<34}{value:>9}")
+        return "\n".join(lines)
+
+
+def active_profiler() -> Optional[Profiler]:
+    """Return the profiler that is currently enabled, or None if there is none."""
+    return _active
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
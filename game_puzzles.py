@@ -0,0 +1,213 @@
+"""CSC111 Project 1: Text Adventure Game - Puzzles
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the registry of puzzle kinds. Each puzzle in the game data names its kind, and
+when the world is loaded every puzzle is compiled, through the registry, into a validator that decides
+whether an attempt solves it. New kinds of puzzle can be added with register_puzzle_kind.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from game_entities import Location, Puzzle
+
+
+class LocationWeights:
+    """
+    Keeps the total weight of the items at each location, so that reading it takes O(1) time.
+
+    A location's total is summed the first time it is read, and kept up to date from then on. The tracker must
+    be told about every item placed at or removed from a location.
+    """
+    # Private Instance Attributes:
+    #   - _item_weight: Returns the weight of the item (or key) with the given name.
+    #   - _totals: A dictionary mapping the ID of each location whose total has been read to that total.
+    _item_weight: Callable[[str], float]
+    _totals: dict[int, float]
+
+    def __init__(self, item_weight: Callable[[str], float]) -> None:
+        """Initialize a tracker that looks up the weight of each item with item_weight."""
+        self._item_weight = item_weight
+        self._totals = {}
+
+    def total(self, location: Location) -> float:
+        """Return the total weight of the items at location."""
+        total = self._totals.get(location.id_num)
+        if total is None:
+            total = math.fsum(self._item_weight(item) for item in location.items)
+            self._totals[location.id_num] = total
+        return total
+
+    def item_placed(self, location_id: int, item: str) -> None:
+        """Record that the given item was placed at the location with the given ID."""
+        if location_id in self._totals:
+            self._totals[location_id] += self._item_weight(item)
+
+    def item_removed(self, location_id: int, item: str) -> None:
+        """Record that the given item was removed from the location with the given ID."""
+        if location_id in self._totals:
+            self._totals[location_id] -= self._item_weight(item)
+
+
+class PuzzleAttempt:
+    """
+    Everything a validator may look at to decide whether a puzzle is solved.
+
+    Instance Attributes:
+        - answer: The answer the player typed in, or None if they were not asked for one.
+        - log: The events of the game so far.
+        - location: The location the puzzle is being attempted at.
+    """
+    # Private Instance Attributes:
+    #   - _weights: The tracker of the total weight at each location, or None to sum the weights directly.
+    #   - _item_weight: Returns the weight of the item (or key) with the given name.
+    __slots__ = ('answer', 'log', 'location', '_weights', '_item_weight')
+    answer: Optional[str]
+    log: Any
+    location: Optional[Location]
+    _weights: Optional[LocationWeights]
+    _item_weight: Callable[[str], float]
+
+    def __init__(self, answer: Optional[str], log: Any, location: Optional[Location],
+                 weights: Optional[LocationWeights], item_weight: Callable[[str], float]) -> None:
+        """Initialize an attempt with the given answer in a game with the given log, at location."""
+        self.answer = answer
+        self.log = log
+        self.location = location
+        self._weights = weights
+        self._item_weight = item_weight
+
+    def location_weight(self) -> float:
+        """Return the total weight of the items at the location of this attempt."""
+        if self._weights is not None:
+            return self._weights.total(self.location)
+        return math.fsum(self._item_weight(item) for item in self.location.items)
+
+
+Validator = Callable[[PuzzleAttempt], bool]
+
+
+@dataclass(frozen=True)
+class PuzzleKind:
+    """
+    A kind of puzzle.
+
+    Instance Attributes:
+        - name: The name puzzles of this kind give as their "kind" in the game data.
+        - answered: Whether puzzles of this kind are solved by the player typing in an answer, rather than by
+          the state of the game.
+        - compile: Returns the validator of the given puzzle of this kind.
+    """
+    name: str
+    answered: bool
+    compile: Callable[[Puzzle], Validator]
+
+
+# Every registered puzzle kind, by name
+PUZZLE_KINDS: dict[str, PuzzleKind] = {}
+
+
+def register_puzzle_kind(name: str, answered: bool, compile_puzzle: Callable[[Puzzle], Validator]) -> None:
+    """Register a kind of puzzle with the given name, replacing any kind already registered with that name.
+
+    compile_puzzle is called once for each puzzle of the kind when a world is loaded, and returns the function
+    that is called with each attempt at the puzzle.
+    """
+    PUZZLE_KINDS[name] = PuzzleKind(name, answered, compile_puzzle)
+
+
+def compile_puzzles(puzzles: Iterable[Puzzle]) -> dict[int, Validator]:
+    """Return a dictionary mapping the ID of each of the given puzzles to its validator.
+
+    Raise a ValueError if a puzzle's kind is not registered.
+    """
+    validators = {}
+    for puzzle in puzzles:
+        kind = PUZZLE_KINDS.get(puzzle.kind)
+        if kind is None:
+            raise ValueError(f'Puzzle {puzzle.id_puzzle} has unknown kind {puzzle.kind!r}')
+        validators[puzzle.id_puzzle] = kind.compile(puzzle)
+    return validators
+
+
+def legacy_kind(puzzle_id: int) -> str:
+    """Return the kind of a puzzle in game data that does not name one: puzzle 1 was always the logic puzzle,
+    puzzle 2 the order puzzle, and every other puzzle a weight puzzle."""
+    if puzzle_id == 1:
+        return 'logic'
+    elif puzzle_id == 2:
+        return 'order'
+    else:
+        return 'weight'
+
+
+def order_solved(answer: Any, first: Optional[int], second: Optional[int]) -> bool:
+    """Return whether an order puzzle with the given answer is solved when the two events before the attempt
+    were at the locations with IDs first and then second (None if there was no such event)."""
+    answer_first, answer_second = answer
+    return first == answer_first and second == answer_second
+
+
+def weight_solved(answer: Any, total: float) -> bool:
+    """Return whether a weight puzzle with the given answer is solved when the items at its location weigh total
+    (which may differ from the answer by rounding error)."""
+    return math.isclose(total, answer, rel_tol=0.0, abs_tol=1e-9)
+
+
+def _compile_logic(puzzle: Puzzle) -> Validator:
+    """Return the validator of a logic puzzle, solved by typing in its answer (in any case)."""
+    answer = puzzle.answer
+    return lambda attempt: attempt.answer is not None and attempt.answer.lower() == answer
+
+
+def _compile_order(puzzle: Puzzle) -> Validator:
+    """Return the validator of an order puzzle, solved by arriving through the two locations of its answer,
+    in order, just before the attempt."""
+    answer = puzzle.answer
+
+    def validate(attempt: PuzzleAttempt) -> bool:
+        """Return whether the two events before the latest one were at first and second (which is never the
+        case if there were fewer than two)."""
+        before = attempt.log.last.prev
+        if before is None or before.prev is None:
+            return False
+        return order_solved(answer, before.prev.id_num, before.id_num)
+
+    return validate
+
+
+def _compile_weight(puzzle: Puzzle) -> Validator:
+    """Return the validator of a weight puzzle, solved when the items at the location weigh its answer."""
+    answer = puzzle.answer
+    return lambda attempt: weight_solved(answer, attempt.location_weight())
+
+
+register_puzzle_kind('logic', True, _compile_logic)
+register_puzzle_kind('order', False, _compile_order)
+register_puzzle_kind('weight', False, _compile_weight)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
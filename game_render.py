@@ -0,0 +1,149 @@
+"""CSC111 Project 1: Text Adventure Game - Renderer
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a renderer that builds the text shown for each location once and reuses it,
+and buffered output sinks that send everything shown in a turn to a file, log or socket in a single write.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from game_entities import Location
+
+MENU_LINE = "What to do? Choose from: look, inventory, score, weights, undo, redo, log, quit"
+
+
+class Renderer:
+    """
+    Builds and caches the text blocks shown for each location: the heading and description shown by look
+    (one variant for a first visit and one for a revisit) and the list of actions available there.
+
+    Only the parts that change during a game (the items at a location and the steps remaining) are built
+    on every call, and each call returns a single string, so showing a location costs one output call.
+
+    Instance Attributes:
+        - cache_size: The most location blocks kept, or None to keep every block ever built.
+    """
+    # Private Instance Attributes:
+    #   - _headings: The look heading of each (location ID, visited) built so far, least recently used first.
+    #   - _actions: The action list of each location ID built so far, least recently used first.
+    cache_size: Optional[int]
+    _headings: OrderedDict[tuple[int, bool], str]
+    _actions: OrderedDict[int, str]
+
+    def __init__(self, cache_size: Optional[int] = None) -> None:
+        """Initialize a renderer with empty caches that hold at most cache_size blocks each (None for no limit).
+        """
+        self.cache_size = cache_size
+        self._headings = OrderedDict()
+        self._actions = OrderedDict()
+
+    def prebuild(self, locations: Iterable[Location]) -> None:
+        """Build every block of the given locations now, instead of the first time each one is shown."""
+        for location in locations:
+            self._heading(location, False)
+            self._heading(location, True)
+            self.actions(location)
+
+    def look(self, location: Location) -> str:
+        """Return the text that describes location: the long description if it has not been visited and the
+        brief description if it has, followed by the items there."""
+        heading = self._heading(location, location.visited)
+        if location.items:
+            return heading + "This location also has item(s):\n" + self.items(location.items)
+        return heading + "This location has NO items.\n"
+
+    def items(self, items: list[str]) -> str:
+        """Return the list of the given items, one per line (each ending with a newline)."""
+        return "".join(["- " + item + "\n" for item in items])
+
+    def actions(self, location: Location) -> str:
+        """Return the list of the actions the player can take at location."""
+        text = self._actions.get(location.id_num)
+        if text is None:
+            text = "\n".join([MENU_LINE, "At this location, you can also:"]
+                             + ["- " + action for action in location.available_commands]
+                             + ["- pickitem", "- dropitem"])
+            _store(self._actions, location.id_num, text, self.cache_size)
+        else:
+            self._actions.move_to_end(location.id_num)
+        return text
+
+    def _heading(self, location: Location, visited: bool) -> str:
+        """Return the heading and description look shows for location, depending on whether it was visited."""
+        key = (location.id_num, visited)
+        text = self._headings.get(key)
+        if text is None:
+            if visited:
+                text = ("Location " + str(location.id_num) + "\nYou are now at " + location.name
+                        + "! Since you have been here before, here's a BRIEF description of this place.\n"
+                        + location.brief_description + "\n\n")
+            else:
+                text = ("Location " + str(location.id_num) + "\nYou are now at " + location.name
+                        + "! Since you have NEVER been here before, here's a LONG description of this fabulous "
+                          "place!\n" + location.long_description + "\n\n")
+            _store(self._headings, key, text, self.cache_size)
+        else:
+            self._headings.move_to_end(key)
+        return text
+
+
+def _store(cache: OrderedDict, key: object, text: str, cache_size: Optional[int]) -> None:
+    """Add text to cache under key, evicting the least recently used entry if the cache is over cache_size."""
+    cache[key] = text
+    if cache_size is not None and len(cache) > cache_size:
+        cache.popitem(last=False)
+
+
+class BufferedSink:
+    """
+    An output sink that collects the text of a turn and passes it on in a single call when flushed.
+
+    Instance Attributes:
+        - write_out: The function that receives the collected text, e.g. the write method of a file or socket
+          stream.
+    """
+    # Private Instance Attributes:
+    #   - _parts: The text written since the last flush.
+    write_out: Callable[[str], object]
+    _parts: list[str]
+
+    def __init__(self, write_out: Callable[[str], object]) -> None:
+        """Initialize an empty sink that passes its text to write_out when flushed."""
+        self.write_out = write_out
+        self._parts = []
+
+    def write(self, text: str) -> None:
+        """Add text (one or more lines, without the final newline) to this turn's output."""
+        self._parts.append(text)
+
+    def flush(self) -> None:
+        """Pass everything written since the last flush on, each part on its own line, in one call."""
+        if self._parts:
+            self.write_out("\n".join(self._parts) + "\n")
+            self._parts.clear()
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
@@ -0,0 +1,208 @@
+"""CSC111 Project 1: Text Adventure Game - Replay
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a replay engine that rebuilds the game state at any point of a recorded game
+(an event log or a walkthrough) without re-running the game from the start or rendering any descriptions.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from adventure import AdventureGame
+from game_session import STEP_LIMIT, apply_event
+from game_state import GameState, PersistentArray
+from proj1_event_logger import CompactEventList, EventList
+
+# The default number of events between checkpoints
+CHECKPOINT_EVERY = 256
+
+
+class Replay:
+    """
+    A recorded game that can be scrubbed to the state after any of its events.
+
+    Events are numbered from 0 (the player's arrival at the starting location). The state after every
+    checkpoint_every-th event is kept as a GameState checkpoint; the checkpoints share all unchanged
+    locations with each other, so they cost little more than the changes between them. Seeking to event k
+    restores the checkpoint at or before k and applies at most checkpoint_every - 1 events to it.
+
+    Replaying follows the rules of GameSession for moves, pickups and drops, which are the only commands
+    that log events (see game_session.apply_event), and a location counts as visited once the player has
+    acted there.
+
+    Instance Attributes:
+        - game: The game the events were recorded in.
+        - checkpoint_every: The number of events between checkpoints.
+
+    Representation Invariants:
+        - self.checkpoint_every >= 1
+        - len(self._checkpoints) == (len(self) - 1) // self.checkpoint_every + 1
+    """
+    # Private Instance Attributes:
+    #   - _location_ids: The location ID of each event.
+    #   - _command_ids: For each event, the index into _commands of the command that led to it (-1 for event 0).
+    #   - _commands: The distinct commands of the events.
+    #   - _checkpoints: The state after every checkpoint_every-th event, starting with event 0.
+    #   - _initial_items: The names of the items each location had when the replay was made, for every location
+    #     where the player acted.
+    game: AdventureGame
+    checkpoint_every: int
+    _location_ids: array
+    _command_ids: array
+    _commands: list[str]
+    _checkpoints: list[GameState]
+    _initial_items: dict[int, tuple[str, ...]]
+
+    def __init__(self, game: AdventureGame, events: Iterable[tuple[int, Optional[str]]], steps: int = STEP_LIMIT,
+                 checkpoint_every: int = CHECKPOINT_EVERY) -> None:
+        """Record the given events of a game of game in which the player could make steps moves.
+
+        Each event is a pair of its location ID and the command that led to it (None for the first event).
+
+        Preconditions:
+            - the events are those of a game in which every location of game started with its current items
+            - checkpoint_every >= 1
+        """
+        self.game = game
+        self.checkpoint_every = checkpoint_every
+        self._location_ids = array('i')
+        self._command_ids = array('i')
+        self._commands = []
+        self._checkpoints = []
+        self._initial_items = {}
+        command_index = {}
+
+        state = None
+        for loc_id, command in events:
+            if state is None:
+                state = GameState(loc_id, steps, 0, (), (), PersistentArray(), (loc_id, None))
+                command_id = -1
+            else:
+                state = self._advance(state, loc_id, command)
+                command_id = command_index.setdefault(command, len(self._commands))
+                if command_id == len(self._commands):
+                    self._commands.append(command)
+            if len(self._location_ids) % checkpoint_every == 0:
+                self._checkpoints.append(state)
+            self._location_ids.append(loc_id)
+            self._command_ids.append(command_id)
+
+    @classmethod
+    def from_commands(cls, game: AdventureGame, initial_location_id: int, commands: Iterable[str],
+                      steps: int = STEP_LIMIT, checkpoint_every: int = CHECKPOINT_EVERY) -> Replay:
+        """Return a replay of the given walkthrough commands (in the format AdventureGameSimulation uses),
+        starting at initial_location_id.
+
+        Raise a game_commands.ScriptError if a command cannot be carried out (see CommandTable.compile).
+        """
+        return cls(game, _walk(game, initial_location_id, commands), steps, checkpoint_every)
+
+    @classmethod
+    def from_log(cls, game: AdventureGame, log: EventList | CompactEventList, steps: int = STEP_LIMIT,
+                 checkpoint_every: int = CHECKPOINT_EVERY) -> Replay:
+        """Return a replay of the events in the given log."""
+        return cls(game, _log_events(log), steps, checkpoint_every)
+
+    def __len__(self) -> int:
+        """Return the number of events in this replay."""
+        return len(self._location_ids)
+
+    def location_at(self, index: int) -> int:
+        """Return the location ID of the event at the given index."""
+        return self._location_ids[index]
+
+    def command_at(self, index: int) -> Optional[str]:
+        """Return the command that led to the event at the given index, or None for the first event."""
+        command_id = self._command_ids[index]
+        return None if command_id == -1 else self._commands[command_id]
+
+    def seek(self, index: int) -> GameState:
+        """Return the state of the game just after the event at the given index.
+
+        Preconditions:
+            - 0 <= index < len(self)
+        """
+        start = index - index % self.checkpoint_every
+        state = self._checkpoints[start // self.checkpoint_every]
+        for i in range(start + 1, index + 1):
+            state = self._advance(state, self._location_ids[i], self.command_at(i))
+        return state
+
+    def states(self, start: int = 0) -> Iterator[GameState]:
+        """Yield the state after each event in turn, from the event at index start to the last one."""
+        state = self.seek(start)
+        yield state
+        for i in range(start + 1, len(self._location_ids)):
+            state = self._advance(state, self._location_ids[i], self.command_at(i))
+            yield state
+
+    def items_at(self, state: GameState, loc_id: int) -> tuple[str, ...]:
+        """Return the names of the items at the location with the given ID in the given state."""
+        place = state.places.get(loc_id)
+        if place is not None:
+            return place[0]
+        elif loc_id in self._initial_items:
+            return self._initial_items[loc_id]
+        return tuple(self.game.get_location(loc_id).items)
+
+    def _advance(self, state: GameState, loc_id: int, command: str) -> GameState:
+        """Return the state after the event at the location with the given ID, led to by command, in the
+        given state."""
+        here = state.location_id
+        places = state.places
+        place = places.get(here)
+        if place is None:
+            if here not in self._initial_items:
+                self._initial_items[here] = tuple(self.game.get_location(here).items)
+            place = (self._initial_items[here], False)
+        items, visited = place
+        steps, score, inventory, picked, items = apply_event(state.steps_remaining, state.score, state.inventory,
+                                                             state.picked_items, items, command)
+        if not visited or items is not place[0]:
+            places = places.set(here, (items, True))
+        return GameState(loc_id, steps, score, inventory, picked, places, (loc_id, command))
+
+
+def _walk(game: AdventureGame, initial_location_id: int,
+          commands: Iterable[str]) -> Iterator[tuple[int, Optional[str]]]:
+    """Yield the events of the given walkthrough commands, starting at initial_location_id."""
+    table = game.get_command_table()
+    script = table.compile(initial_location_id, commands)
+    yield initial_location_id, None
+    for i, token in enumerate(script.tokens):
+        yield script.location_ids[i + 1], table.texts[token]
+
+
+def _log_events(log: EventList | CompactEventList) -> Iterator[tuple[int, Optional[str]]]:
+    """Yield the events of the given log."""
+    command = None
+    event = log.first
+    while event is not None:
+        yield event.id_num, command
+        command = event.next_command
+        event = event.next
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
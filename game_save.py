@@ -0,0 +1,270 @@
+"""CSC111 Project 1: Text Adventure Game - Saved Sessions
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the compact binary format that game sessions are saved in (see GameSession.save
+and GameSession.restore). Only what a session changed is saved, never the world itself: every number is a
+variable-length integer, every item and key is its index in the game's catalog, and every command is coded
+relative to the location it was made at, so a typical session saves to a few hundred bytes.
+
+A save starts with SAVE_MAGIC, the format version and the fingerprint of the world it was saved in (see
+AdventureGame.fingerprint), so that it is never restored into a different world or by an incompatible version.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from typing import Iterable, Mapping, Optional
+
+from game_commands import DROP_PREFIX, PICK_PREFIX
+
+# The first bytes of every save
+SAVE_MAGIC = b'ADVS'
+# The version of the save format, increased whenever it changes
+SAVE_VERSION = 1
+
+# The kinds of coded command: a movement command (by its position among the location's commands), a pickup or
+# a drop (by the index of the item), or any other command, stored with its location ID and text
+_MOVE, _PICK, _DROP, _OTHER = range(4)
+_KINDS = 4
+
+
+class SaveError(ValueError):
+    """Raised when saved data cannot be restored, because it is damaged, was saved by another version of the
+    format, or was saved in a different world."""
+
+
+class SaveWriter:
+    """
+    Writes the values of a save, one after another, in the save format.
+
+    Instance Attributes:
+        - entities: The names of every item and key of the world, in the order they are coded in.
+    """
+    # Private Instance Attributes:
+    #   - _buffer: The bytes written so far.
+    #   - _entity_index: A dictionary mapping each name in entities to its index.
+    entities: tuple[str, ...]
+    _buffer: bytearray
+    _entity_index: dict[str, int]
+
+    def __init__(self, entities: tuple[str, ...], entity_index: Mapping[str, int], fingerprint: int) -> None:
+        """Start a save in the world with the given fingerprint, whose items and keys are entities (each at the
+        index entity_index gives it), by writing the header."""
+        self.entities = entities
+        self._entity_index = entity_index
+        self._buffer = bytearray(SAVE_MAGIC)
+        self.uint(SAVE_VERSION)
+        self._buffer += fingerprint.to_bytes(4, 'little')
+
+    def getvalue(self) -> bytes:
+        """Return everything written so far."""
+        return bytes(self._buffer)
+
+    def uint(self, value: int) -> None:
+        """Write a non-negative integer in as few bytes as possible (7 bits per byte, low bits first).
+
+        Preconditions:
+            - value >= 0
+        """
+        buffer = self._buffer
+        while value > 0x7F:
+            buffer.append((value & 0x7F) | 0x80)
+            value >>= 7
+        buffer.append(value)
+
+    def sint(self, value: int) -> None:
+        """Write an integer that may be negative (zigzag coded, so that small magnitudes stay small)."""
+        self.uint(value << 1 if value >= 0 else (-value << 1) - 1)
+
+    def optional_uint(self, value: Optional[int]) -> None:
+        """Write a non-negative integer, or None."""
+        self.uint(0 if value is None else value + 1)
+
+    def flags(self, *values: bool) -> None:
+        """Write up to 7 booleans in one byte."""
+        self.uint(sum(1 << i for i, value in enumerate(values) if value))
+
+    def text(self, value: Optional[str]) -> None:
+        """Write a string, or None."""
+        if value is None:
+            self.uint(0)
+        else:
+            data = value.encode('utf-8')
+            self.uint(len(data) + 1)
+            self._buffer += data
+
+    def entity(self, name: Optional[str]) -> None:
+        """Write the name of an item or key, or None."""
+        self.uint(0 if name is None else self._entity_index[name] + 1)
+
+    def entity_list(self, names: Iterable[str]) -> None:
+        """Write a sequence of item and key names."""
+        names = list(names)
+        self.uint(len(names))
+        entity_index = self._entity_index
+        for name in names:
+            self.uint(entity_index[name])
+
+    def command(self, commands: Mapping[str, int], location_id: int, command: Optional[str],
+                arrived_at: int) -> None:
+        """Write the command that led from the location with the given ID (whose movement commands are
+        commands) to an event at the location with ID arrived_at.
+
+        A command that can be coded relative to the location it was made at takes one or two bytes; any other
+        (such as the missing command of a first event) is written in full.
+        """
+        if command is not None:
+            if command.startswith(PICK_PREFIX) and arrived_at == location_id:
+                index = self._entity_index.get(command[len(PICK_PREFIX):])
+                if index is not None:
+                    self.uint(index * _KINDS + _PICK)
+                    return
+            elif command.startswith(DROP_PREFIX) and arrived_at == location_id:
+                index = self._entity_index.get(command[len(DROP_PREFIX):])
+                if index is not None:
+                    self.uint(index * _KINDS + _DROP)
+                    return
+            elif commands.get(command) == arrived_at:
+                self.uint(list(commands).index(command) * _KINDS + _MOVE)
+                return
+        self.uint(_OTHER)
+        self.uint(arrived_at)
+        self.text(command)
+
+
+class SaveReader:
+    """
+    Reads the values of a save written by a SaveWriter, in the same order.
+
+    Every method raises a SaveError if the save ends early or holds a value that does not fit the world.
+
+    Instance Attributes:
+        - entities: The names of every item and key of the world, in the order they are coded in.
+    """
+    # Private Instance Attributes:
+    #   - _data: The save.
+    #   - _pos: The position of the next byte to read.
+    entities: tuple[str, ...]
+    _data: bytes
+    _pos: int
+
+    def __init__(self, data: bytes, entities: tuple[str, ...], fingerprint: int) -> None:
+        """Start reading data, saved in the world with the given fingerprint whose items and keys are entities,
+        by checking its header."""
+        self.entities = entities
+        self._data = bytes(data)
+        self._pos = len(SAVE_MAGIC)
+        if self._data[:self._pos] != SAVE_MAGIC:
+            raise SaveError('Not a saved game session')
+        version = self.uint()
+        if version != SAVE_VERSION:
+            raise SaveError(f'Unsupported save format version {version} (expected {SAVE_VERSION})')
+        saved_in = int.from_bytes(self._bytes(4), 'little')
+        if saved_in != fingerprint:
+            raise SaveError('The session was saved in a different world')
+
+    def at_end(self) -> bool:
+        """Return whether every byte of the save has been read."""
+        return self._pos == len(self._data)
+
+    def uint(self) -> int:
+        """Read a non-negative integer."""
+        data, pos = self._data, self._pos
+        value = shift = 0
+        try:
+            byte = data[pos]
+            while byte & 0x80:
+                value |= (byte & 0x7F) << shift
+                shift += 7
+                pos += 1
+                byte = data[pos]
+        except IndexError:
+            raise SaveError('The save ends early') from None
+        self._pos = pos + 1
+        return value | (byte << shift)
+
+    def sint(self) -> int:
+        """Read an integer that may be negative."""
+        value = self.uint()
+        return value >> 1 if value & 1 == 0 else -((value + 1) >> 1)
+
+    def optional_uint(self) -> Optional[int]:
+        """Read a non-negative integer, or None."""
+        value = self.uint()
+        return None if value == 0 else value - 1
+
+    def flags(self, count: int) -> list[bool]:
+        """Read count booleans written together by SaveWriter.flags."""
+        value = self.uint()
+        return [bool(value >> i & 1) for i in range(count)]
+
+    def text(self) -> Optional[str]:
+        """Read a string, or None."""
+        size = self.uint()
+        if size == 0:
+            return None
+        try:
+            return self._bytes(size - 1).decode('utf-8')
+        except UnicodeDecodeError:
+            raise SaveError('The save holds a damaged string') from None
+
+    def entity(self) -> Optional[str]:
+        """Read the name of an item or key, or None."""
+        index = self.uint()
+        return None if index == 0 else self._entity(index - 1)
+
+    def entity_list(self) -> list[str]:
+        """Read a sequence of item and key names."""
+        return [self._entity(self.uint()) for _ in range(self.uint())]
+
+    def command(self, commands: Mapping[str, int], location_id: int) -> tuple[Optional[str], int]:
+        """Read a command made at the location with the given ID, whose movement commands are commands, and
+        return it with the ID of the location of the event it led to."""
+        code = self.uint()
+        kind, index = code % _KINDS, code // _KINDS
+        if kind == _PICK:
+            return PICK_PREFIX + self._entity(index), location_id
+        elif kind == _DROP:
+            return DROP_PREFIX + self._entity(index), location_id
+        elif kind == _MOVE:
+            if index >= len(commands):
+                raise SaveError(f'Location {location_id} has no command {index}')
+            command = list(commands)[index]
+            return command, commands[command]
+        arrived_at = self.uint()
+        return self.text(), arrived_at
+
+    def _entity(self, index: int) -> str:
+        """Return the name of the item or key with the given index."""
+        if index >= len(self.entities):
+            raise SaveError(f'The world has no item or key {index}')
+        return self.entities[index]
+
+    def _bytes(self, size: int) -> bytes:
+        """Read size bytes."""
+        if self._pos + size > len(self._data):
+            raise SaveError('The save ends early')
+        self._pos += size
+        return self._data[self._pos - size:self._pos]
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
@@ -0,0 +1,258 @@
+"""CSC111 Project 1: Text Adventure Game - Game Server
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains an asyncio server that hosts many concurrent game sessions in one process,
+over TCP or a Unix socket. The game data is loaded once, and every connection plays its own GameSession in a
+fork of that world (see AdventureGame.fork).
+
+The protocol is line-based, so the game can be played with e.g. `nc`: the client sends one input per line
+(an action, an item name or a puzzle answer), and the server replies with the output of the step followed by
+the prompt for the next input. Every reply ends with REPLY_END, which terminals do not show, so that programs
+know when a reply is complete. The server closes the connection when the game is over.
+
+A server given park_after parks every session whose client has not sent anything for that many seconds: the
+session is saved (see GameSession.save) to a file in park_dir and dropped from memory, and restored when the
+client sends its next input.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Optional
+
+from adventure import AdventureGame
+from game_session import STEP_LIMIT, GameSession, StepResult
+
+# The byte that ends every reply from the server
+REPLY_END = b'\0'
+# The most connections waiting to be accepted at once
+BACKLOG = 4096
+# The replies sent before closing a connection whose input is longer than the stream's limit, or whose session
+# failed
+TOO_LONG_REPLY = "That input is too long. Goodbye!".encode('utf-8') + REPLY_END
+FAILED_REPLY = "Sorry, something went wrong with this game. Goodbye!".encode('utf-8') + REPLY_END
+
+
+class GameServer:
+    """
+    A server that plays a separate GameSession for every connection, all in one loaded world.
+
+    Each session is played in a fork of game, so sessions never see each other's moves, and only the state
+    that changes during play is held per session. Puzzles that are answered by typing are answered on the
+    connection like any other input, so a session waiting for an answer never blocks the others.
+
+    Instance Attributes:
+        - game: The loaded world every session is played in a fork of.
+        - initial_location_id: The ID of the location every session starts at.
+        - steps: The number of moves the player of each session may make.
+        - max_undo: The most moves, pickups and drops each session can undo in a row, or None for no limit.
+        - active_sessions: The number of sessions currently being played.
+        - total_sessions: The number of sessions started since the server was created.
+        - park_after: The seconds a client may send nothing before its session is parked, or None to never
+          park sessions.
+        - park_dir: The directory parked sessions are saved in.
+        - parked_sessions: The number of sessions currently parked, which are counted in active_sessions.
+        - failed_sessions: The number of sessions ended because they (or parking them) raised an error.
+
+    Representation Invariants:
+        - 0 <= self.active_sessions <= self.total_sessions
+        - 0 <= self.parked_sessions <= self.active_sessions
+        - 0 <= self.failed_sessions <= self.total_sessions
+        - self.park_after is None or self.park_after > 0
+    """
+    game: AdventureGame
+    initial_location_id: int
+    steps: int
+    max_undo: Optional[int]
+    active_sessions: int
+    total_sessions: int
+    park_after: Optional[float]
+    park_dir: str
+    parked_sessions: int
+    failed_sessions: int
+
+    def __init__(self, game: AdventureGame, initial_location_id: int, steps: int = STEP_LIMIT,
+                 max_undo: Optional[int] = None, park_after: Optional[float] = None,
+                 park_dir: Optional[str] = None) -> None:
+        """Initialize a server whose sessions are played in game, starting at initial_location_id.
+
+        Idle sessions are parked in park_dir, by default the system's temporary directory.
+        """
+        self.game = game
+        self.initial_location_id = initial_location_id
+        self.steps = steps
+        self.max_undo = max_undo
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.park_after = park_after
+        self.park_dir = tempfile.gettempdir() if park_dir is None else park_dir
+        self.parked_sessions = 0
+        self.failed_sessions = 0
+
+    def new_session(self) -> GameSession:
+        """Return a new session in a fork of this server's world."""
+        return GameSession(self.game.fork(self.initial_location_id), self.steps, max_undo=self.max_undo)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Play one session with the client connected through reader and writer, until the game is over or the
+        client disconnects.
+
+        If the client sends a line longer than the stream's limit, or the session raises an error, the client is
+        told so and the connection is closed; nothing escapes to the event loop.
+        """
+        self.active_sessions += 1
+        self.total_sessions += 1
+        farewell = b''
+        try:
+            session = self.new_session()
+            result = session.start()
+            while True:
+                writer.write(encode_reply(result))
+                await writer.drain()
+                if not result.ongoing:
+                    break
+                if self.park_after is None:
+                    line = await _read_line(reader)
+                else:
+                    try:
+                        line = await asyncio.wait_for(_read_line(reader), self.park_after)
+                    except asyncio.TimeoutError:
+                        # Only the file holds the session while it is parked
+                        path = self._park(session)
+                        session = None
+                        try:
+                            line = await _read_line(reader)
+                        finally:
+                            session = self._unpark(path)
+                if line is None:
+                    farewell = TOO_LONG_REPLY
+                    break
+                if not line:
+                    break
+                result = session.step(line.decode('utf-8', 'replace').rstrip('\r\n'))
+        except ConnectionError:
+            pass
+        except Exception:
+            self.failed_sessions += 1
+            farewell = FAILED_REPLY
+        finally:
+            self.active_sessions -= 1
+            await _close(writer, farewell)
+
+    def _park(self, session: GameSession) -> str:
+        """Save session to a new file in park_dir, count it as parked, and return the path of the file."""
+        fd, path = tempfile.mkstemp(prefix='session-', dir=self.park_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(session.save())
+        except BaseException:
+            os.remove(path)
+            raise
+        self.parked_sessions += 1
+        return path
+
+    def _unpark(self, path: str) -> GameSession:
+        """Return the session parked in the file at path, which is removed."""
+        self.parked_sessions -= 1
+        try:
+            with open(path, 'rb') as f:
+                return GameSession.restore(self.game, f.read())
+        finally:
+            os.remove(path)
+
+    async def start(self, host: Optional[str] = None, port: Optional[int] = None,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Start accepting connections on the Unix socket at path if it is given, and otherwise on the given
+        TCP host and port, and return the asyncio server."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path, backlog=BACKLOG)
+        return await asyncio.start_server(self.handle, host, port, backlog=BACKLOG)
+
+
+async def _read_line(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Return the next line from reader (or b'' at the end of the stream), or None if the line is longer than the
+    reader's limit."""
+    try:
+        return await reader.readline()
+    except ValueError:
+        # StreamReader.readline turns the LimitOverrunError of an over-long line into a ValueError
+        return None
+
+
+async def _close(writer: asyncio.StreamWriter, farewell: bytes) -> None:
+    """Send farewell (if it is not empty) through writer, then close it and wait until it is closed, ignoring a
+    client that has already disconnected."""
+    try:
+        if farewell:
+            writer.write(farewell)
+            await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+def encode_reply(result: StepResult) -> bytes:
+    """Return the reply the server sends for result: its output and prompt, then REPLY_END."""
+    text = result.output + '\n' + result.prompt if result.output else result.prompt
+    return text.encode('utf-8') + REPLY_END
+
+
+async def serve_forever(server: GameServer, host: Optional[str] = None, port: Optional[int] = None,
+                        path: Optional[str] = None) -> None:
+    """Run server on the given address (see GameServer.start) until the task is cancelled."""
+    listener = await server.start(host, port, path)
+    async with listener:
+        await listener.serve_forever()
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    """Return the command-line options of the server."""
+    parser = argparse.ArgumentParser(description="Host many sessions of the text adventure game in one process.")
+    parser.add_argument('--data', default='game_data.json', help="the game data file")
+    parser.add_argument('--start', type=int, default=1, help="the ID of the location every session starts at")
+    parser.add_argument('--host', default='127.0.0.1', help="the TCP host to listen on")
+    parser.add_argument('--port', type=int, default=8111, help="the TCP port to listen on")
+    parser.add_argument('--unix', metavar='PATH', help="listen on the Unix socket at PATH instead of TCP")
+    parser.add_argument('--steps', type=int, default=STEP_LIMIT, help="the moves each player may make")
+    parser.add_argument('--max-undo', type=int, help="the most steps each session can undo in a row")
+    parser.add_argument('--compiled', action='store_true', help="store the world as columns")
+    parser.add_argument('--park-after', type=float, metavar='SECONDS',
+                        help="save sessions to disk and drop them from memory while idle for this long")
+    parser.add_argument('--park-dir', help="the directory to park sessions in (default: the temporary directory)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    options = _parse_args(sys.argv[1:])
+    game_server = GameServer(AdventureGame(options.data, options.start, compiled=options.compiled),
+                             options.start, options.steps, options.max_undo, options.park_after,
+                             options.park_dir)
+    try:
+        asyncio.run(serve_forever(game_server, options.host, options.port, options.unix))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,911 @@
+"""CSC111 Project 1: Text Adventure Game - Game Session
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the headless game engine for Project 1. A GameSession holds all the state
+of one playthrough and advances it one command at a time, without reading from or printing to the console,
+so that the same rules can be driven by the command-line game in the `adventure` module, by bots and
+simulations, or by a server.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional
+
+from adventure import AdventureGame
+from game_commands import DROP_PREFIX, ITEM_ACTION, INVALID, MENU_COMMAND, MOVE, PICK_BONUS, PICK_PREFIX
+from game_entities import Location, Player
+from game_overlay import OverlayLocation
+from game_puzzles import LocationWeights
+from game_render import BufferedSink
+from game_save import SaveError, SaveReader, SaveWriter
+from game_state import GameState, PersistentArray
+from proj1_event_logger import CompactEventList, Event, EventList, JournalEventList
+
+STEP_LIMIT = 30
+
+OBJECTIVE = ("GAME OBJECTIVE: Collect the items: Monitor, USB Drive, Laptop Charger, and Lucky Mug, by solving "
+             "various puzzles and obtaining keys, and bring all these items back and DROP them "
+             "ALL at UNIVERSITY COLLEGE (UC)!\n")
+
+ACTION_PROMPT = "\nEnter action: "
+PICK_PROMPT = "Pick your item: "
+DROP_PROMPT = "Pick item to drop: "
+RETRY_ANSWER_PROMPT = "Wrong Answer! Try again. Enter 'q' if you would want to quit puzzle: "
+
+# The kinds of input a session can be waiting for
+_ACTION, _PICK, _DROP, _ANSWER = range(4)
+
+
+@dataclass
+class StepResult:
+    """
+    What the player sees after one call to GameSession.start or GameSession.step.
+
+    Instance Attributes:
+        - output: The text to show the player, with lines separated by newlines.
+        - prompt: The prompt for the next input, or the empty string if the game is over.
+        - ongoing: Whether the session is still accepting input.
+    """
+    output: str
+    prompt: str
+    ongoing: bool
+
+
+class ObjectiveTracker:
+    """
+    Keeps count of how many goal items are at a goal location, so that checking for a win takes O(1) time,
+    and remembers where each goal item is.
+
+    The tracker must be told about every item placed at or removed from a location. It only stores where the
+    goal items it has been told about have moved to, on top of the placement it was created with, so trackers
+    created from the same (shared) placement cost O(1) each.
+
+    Instance Attributes:
+        - goal_location_ids: The IDs of the locations the goal items must be brought to.
+        - goal_items: The names of the items that must be brought to a goal location.
+
+    Representation Invariants:
+        - 0 <= self._count <= len(self.goal_items)
+        - 0 <= self._present <= len(self.goal_items)
+    """
+    # Private Instance Attributes:
+    #   - _count: The number of goal items currently at a goal location.
+    #   - _start: A dictionary mapping each goal item to the ID of the location it was at when this tracker was
+    #     created. Goal items that were nowhere in the world are left out. It is never changed.
+    #   - _moved: A dictionary mapping each goal item moved since then to the ID of the location it is at,
+    #     or None if the player is carrying it.
+    #   - _present: The number of goal items that are at a location or being carried.
+    goal_location_ids: frozenset[int]
+    goal_items: frozenset[str]
+    _count: int
+    _start: Mapping[str, int]
+    _moved: dict[str, Optional[int]]
+    _present: int
+
+    def __init__(self, goal_location_ids: Iterable[int], goal_items: Iterable[str],
+                 placement: Mapping[str, int], delivered: Optional[int] = None) -> None:
+        """Initialize a tracker for the given goal, given the ID of the location each goal item is at and the
+        number of them at a goal location, if known (see AdventureGame.goal_item_locations).
+
+        placement is shared with the tracker, and must not be changed afterwards.
+
+        Preconditions:
+            - all(item in goal_items for item in placement)
+        """
+        self.goal_location_ids = frozenset(goal_location_ids)
+        self.goal_items = frozenset(goal_items)
+        self._start = placement
+        self._moved = {}
+        self._present = len(placement)
+        if delivered is None:
+            delivered = sum(1 for loc_id in placement.values() if loc_id in self.goal_location_ids)
+        self._count = delivered
+
+    def item_placed(self, location_id: int, item: str) -> None:
+        """Record that the given item was placed at the location with the given ID."""
+        if item in self.goal_items:
+            if item not in self._moved and item not in self._start:
+                self._present += 1
+            self._moved[item] = location_id
+            if location_id in self.goal_location_ids:
+                self._count += 1
+
+    def item_removed(self, location_id: int, item: str) -> None:
+        """Record that the given item was removed from the location with the given ID."""
+        if item in self.goal_items:
+            if item not in self._moved and item not in self._start:
+                self._present += 1
+            self._moved[item] = None
+            if location_id in self.goal_location_ids:
+                self._count -= 1
+
+    def item_carried(self, item: str) -> None:
+        """Record that the player is carrying the given item, which was not at any location."""
+        if item in self.goal_items:
+            if item not in self._moved and item not in self._start:
+                self._present += 1
+            self._moved[item] = None
+
+    def remaining(self) -> int:
+        """Return the number of goal items not yet at a goal location."""
+        return len(self.goal_items) - self._count
+
+    def is_met(self) -> bool:
+        """Return whether every goal item is at a goal location."""
+        return self._count == len(self.goal_items)
+
+    def undelivered(self) -> list[tuple[str, Optional[int]]]:
+        """Return each goal item that is not at a goal location, paired with the ID of the location it is at
+        (None if it is being carried). Goal items that are nowhere in the world are not included."""
+        moved = self._moved
+        where = [(item, loc_id) for item, loc_id in self._start.items() if item not in moved]
+        where.extend(moved.items())
+        return [(item, loc_id) for item, loc_id in where if loc_id not in self.goal_location_ids]
+
+    def is_lost(self) -> bool:
+        """Return whether some goal item is nowhere in the world, so the goal can never be met."""
+        return self._present < len(self.goal_items)
+
+
+class GameSession:
+    """
+    One playthrough of the text adventure game, driven one input at a time.
+
+    Inputs are whatever the player would type at the current prompt: an action at the "Enter action" prompt,
+    an item name after "pickitem" or "dropitem", or an answer to a logic puzzle. No method of this class
+    blocks or prints.
+
+    Instance Attributes:
+        - game: The game world this session is played in. Sessions played at the same time in one loaded world
+          each need their own fork of it (see AdventureGame.fork).
+        - player: The player of this session.
+        - log: The events of this session so far.
+        - steps_remaining: The number of moves the player may still make.
+        - picked_items: The names of the items (and keys) the player has been awarded points for picking up.
+        - finished: Whether the game ended by the player winning or running out of steps (rather than quitting).
+        - won: Whether the player has won.
+        - objective: Tracks the player's progress towards winning.
+        - weights: Tracks the total weight of the items at each location, for weight puzzles.
+        - end_when_unwinnable: Whether the game ends (forfeiting any remaining steps) as soon as the player can
+          no longer win in the steps remaining.
+        - max_undo: The most moves, pickups and drops that can be undone in a row, or None for no limit.
+        - sink: Where the output of every step is also written, in one write per step, or None.
+
+    Representation Invariants:
+        - self.steps_remaining >= 0
+    """
+    # Private Instance Attributes:
+    #   - _mode: The kind of input this session is waiting for (_ACTION, _PICK, _DROP or _ANSWER).
+    #   - _last_command: The last action that was carried out.
+    #   - _item_choice: The item most recently chosen to pick up.
+    #   - _pending_checks: While waiting for a puzzle answer, whether the weight and key checks passed.
+    #   - _wrong_answers: While waiting for a puzzle answer, the number of wrong answers given so far.
+    #   - _lines: The output lines of the current step.
+    #   - _history: A snapshot of the state after every logged event, oldest first, for undo and redo.
+    #   - _cursor: The index in _history of the snapshot the session is currently at.
+    #   - _dirty: The IDs of the locations changed since the current snapshot was taken.
+    #   - _originals: The (items, visited) of each location changed during this session, as it was when the
+    #     session first changed it. Snapshots leave out the locations that still have these values.
+    game: AdventureGame
+    player: Player
+    log: EventList | JournalEventList
+    steps_remaining: int
+    picked_items: list[str]
+    finished: bool
+    won: bool
+    objective: ObjectiveTracker
+    weights: LocationWeights
+    end_when_unwinnable: bool
+    max_undo: Optional[int]
+    sink: Optional[BufferedSink]
+    _mode: int
+    _last_command: Optional[str]
+    _item_choice: Optional[str]
+    _pending_checks: tuple[bool, bool]
+    _wrong_answers: int
+    _lines: list[str]
+    _history: list[GameState]
+    _cursor: int
+    _dirty: set[int]
+    _originals: dict[int, tuple[tuple[str, ...], bool]]
+
+    def __init__(self, game: AdventureGame, steps: int = STEP_LIMIT, end_when_unwinnable: bool = False,
+                 log: Optional[EventList | JournalEventList] = None, max_undo: Optional[int] = None,
+                 sink: Optional[BufferedSink] = None) -> None:
+        """Initialize a new session of game, in which the player may make at most steps moves.
+
+        If end_when_unwinnable is True, the game ends as soon as the goal can no longer be reached in the
+        steps remaining, instead of when the player runs out of steps.
+
+        Events are logged to log (by default, a new EventList that describes events with game.describe). For
+        long-running sessions, pass a JournalEventList and a max_undo so that memory use does not grow with the
+        length of the session.
+
+        If a sink is given, the output of every step is written to it and it is flushed at the end of the step.
+
+        Preconditions:
+            - log is None or log.is_empty()
+            - max_undo is None or max_undo >= 0
+        """
+        self.game = game
+        self.player = Player([], 0, game.item_weight)
+        self.log = EventList(game.describe, game.get_command_table()) if log is None else log
+        self.steps_remaining = steps
+        self.picked_items = []
+        self.finished = False
+        self.won = False
+        self.objective = ObjectiveTracker(game.goal_location_ids, game.goal_items, *game.goal_item_locations())
+        self.weights = LocationWeights(game.item_weight)
+        self.end_when_unwinnable = end_when_unwinnable
+        self.max_undo = max_undo
+        self.sink = sink
+        self._mode = _ACTION
+        self._last_command = None
+        self._item_choice = None
+        self._pending_checks = (False, False)
+        self._wrong_answers = 0
+        self._lines = []
+        self._history = []
+        self._cursor = -1
+        self._dirty = set()
+        self._originals = {}
+
+    @property
+    def ongoing(self) -> bool:
+        """Whether this session is still accepting input."""
+        return self.game.ongoing
+
+    @property
+    def final_score(self) -> int:
+        """The player's score plus the number of steps remaining."""
+        return self.player.score + self.steps_remaining
+
+    def start(self) -> StepResult:
+        """Begin the game and return what the player sees first."""
+        self._lines.append(OBJECTIVE)
+        self._begin_turn(True, True)
+        return self._result()
+
+    def step(self, command: str) -> StepResult:
+        """Carry out the given input and return what the player sees next.
+
+        Preconditions:
+            - self.start() has been called
+        """
+        if not self.game.ongoing:
+            return self._result()
+        if self._mode == _PICK:
+            self._choose_pick(command)
+        elif self._mode == _DROP:
+            self._choose_drop(command)
+        elif self._mode == _ANSWER:
+            self._answer_puzzle(command)
+        else:
+            self._act(command.lower().strip())
+        return self._result()
+
+    def save(self) -> bytes:
+        """Return this session saved in the binary format of game_save, to be restored with GameSession.restore.
+
+        Only what the session changed is saved: its position, score and flags, the player's inventory, the items
+        and visited flags of the locations it changed, its event log, and its undo and redo history (each
+        snapshot as its event and the locations that changed since the one before). The output being shown, and
+        the sink, are not saved.
+
+        Raise a ValueError if the log is a JournalEventList, whose events are kept on disk instead.
+        """
+        if isinstance(self.log, JournalEventList):
+            raise ValueError('A session logging to a journal cannot be saved')
+        game = self.game
+        table = game.get_command_table()
+        out = SaveWriter(table.entities, table.entity_index(), game.fingerprint())
+        out.uint(game.current_location_id)
+        out.uint(self.steps_remaining)
+        out.sint(self.player.score)
+        out.flags(game.ongoing, self.finished, self.won, self.end_when_unwinnable, *self._pending_checks,
+                  isinstance(self.log, CompactEventList))
+        out.optional_uint(self.max_undo)
+        out.uint(self._mode)
+        out.uint(self._wrong_answers)
+        out.entity(self._item_choice)
+        out.entity_list(self.player.get_inventory())
+        out.entity_list(self.picked_items)
+
+        changed_items, changed_visited = game.get_overlay().changes()
+        out.uint(len(changed_items))
+        for loc_id, items in changed_items.items():
+            out.uint(loc_id)
+            out.entity_list(items)
+        out.uint(len(changed_visited))
+        for loc_id, visited in changed_visited.items():
+            out.uint(loc_id * 2 + visited)
+        out.uint(len(self._dirty))
+        for loc_id in self._dirty:
+            out.uint(loc_id)
+        out.uint(len(self._originals))
+        for loc_id, (items, visited) in self._originals.items():
+            out.uint(loc_id * 2 + visited)
+            out.entity_list(items)
+
+        events = []
+        event = self.log.first
+        while event is not None:
+            events.append(event)
+            event = event.next
+        out.uint(len(events))
+        if events:
+            out.uint(events[0].id_num)
+        for prev, event in zip(events, events[1:]):
+            out.command(game.get_location(prev.id_num).available_commands, prev.id_num, prev.next_command,
+                        event.id_num)
+
+        out.uint(len(self._history))
+        out.uint(self._cursor + 1)
+        prev = None
+        for state in self._history:
+            self._save_state(out, prev, state)
+            prev = state
+        return out.getvalue()
+
+    def _save_state(self, out: SaveWriter, prev: Optional[GameState], state: GameState) -> None:
+        """Write the snapshot state of the history, which comes right after prev (None for the first snapshot).
+
+        The location, steps, score and inventory of a snapshot follow from the one before and its event, so they
+        are only written out if they do not (which is always the case for the first snapshot).
+        """
+        loc_id, command = state.event
+        if prev is None:
+            out.command({}, -1, command, loc_id)
+        else:
+            out.command(self.game.get_location(prev.location_id).available_commands, prev.location_id,
+                        command, loc_id)
+        written = (state.location_id, state.steps_remaining, state.score, state.inventory, state.picked_items)
+        if prev is not None and _next_state(prev, loc_id, command) == written:
+            out.uint(0)
+        else:
+            out.uint(1)
+            out.uint(state.location_id)
+            out.uint(state.steps_remaining)
+            out.sint(state.score)
+            out.entity_list(state.inventory)
+            out.entity_list(state.picked_items)
+        changed = list((prev.places if prev is not None else PersistentArray()).changed_indexes(state.places))
+        out.uint(len(changed))
+        for place_id in changed:
+            items, visited = state.places.get(place_id)
+            out.uint(place_id * 2 + visited)
+            out.entity_list(items)
+
+    @classmethod
+    def restore(cls, game: AdventureGame, data: bytes, sink: Optional[BufferedSink] = None) -> GameSession:
+        """Return the session saved in data by GameSession.save, played in a new fork of game, that writes its
+        output to sink.
+
+        Raise a game_save.SaveError if data is not a saved session, was saved by another version of the format,
+        or was saved in a world other than game's.
+        """
+        table = game.get_command_table()
+        src = SaveReader(data, table.entities, game.fingerprint())
+        try:
+            return cls._restore_from(game, src, sink)
+        except (KeyError, ValueError) as error:
+            if isinstance(error, SaveError):
+                raise
+            raise SaveError(f'The save does not fit the world: {error!r}') from None
+
+    @classmethod
+    def _restore_from(cls, game: AdventureGame, src: SaveReader, sink: Optional[BufferedSink]) -> GameSession:
+        """Return the session read from src (after its header), played in a new fork of game."""
+        location_id, steps, score = src.uint(), src.uint(), src.sint()
+        ongoing, finished, won, end_when_unwinnable, weight_ok, key_ok, compact = src.flags(7)
+        max_undo = src.optional_uint()
+        mode, wrong_answers, item_choice = src.uint(), src.uint(), src.entity()
+        inventory, picked_items = src.entity_list(), src.entity_list()
+
+        forked = game.fork(location_id)
+        forked.get_location(location_id)
+        overlay = forked.get_overlay()
+        overlay.clear()
+        for _ in range(src.uint()):
+            loc_id = src.uint()
+            forked.get_location(loc_id)
+            overlay.set_items(loc_id, src.entity_list())
+        for _ in range(src.uint()):
+            code = src.uint()
+            forked.get_location(code >> 1)
+            overlay.set_visited(code >> 1, bool(code & 1))
+        dirty = {src.uint() for _ in range(src.uint())}
+        originals = {}
+        for _ in range(src.uint()):
+            code = src.uint()
+            originals[code >> 1] = (tuple(src.entity_list()), bool(code & 1))
+
+        log_class = CompactEventList if compact else EventList
+        log = log_class(forked.describe, forked.get_command_table())
+        session = cls(forked, steps, end_when_unwinnable, log, max_undo, sink)
+        num_events = src.uint()
+        if num_events:
+            loc_id = src.uint()
+            forked.get_location(loc_id)
+            log.add_event(Event(loc_id))
+            for _ in range(num_events - 1):
+                command, loc_id = src.command(forked.get_location(loc_id).available_commands, loc_id)
+                log.add_event(Event(loc_id), command)
+
+        num_states, session._cursor = src.uint(), src.uint() - 1
+        prev = None
+        for _ in range(num_states):
+            prev = session._restore_state(src, prev)
+            session._history.append(prev)
+        if not src.at_end() or session._cursor >= num_states:
+            raise SaveError('The save is damaged')
+
+        forked.ongoing = ongoing
+        session.finished, session.won = finished, won
+        session.picked_items = picked_items
+        session.player = Player([], score, forked.item_weight)
+        for item in inventory:
+            session.player.add_item(item)
+            session.objective.item_carried(item)
+        session._mode, session._wrong_answers, session._item_choice = mode, wrong_answers, item_choice
+        session._pending_checks = (weight_ok, key_ok)
+        session._dirty, session._originals = dirty, originals
+        return session
+
+    def _restore_state(self, src: SaveReader, prev: Optional[GameState]) -> GameState:
+        """Return the snapshot of the history read from src, which comes right after prev (None for the first
+        snapshot)."""
+        if prev is None:
+            command, loc_id = src.command({}, -1)
+        else:
+            command, loc_id = src.command(self.game.get_location(prev.location_id).available_commands,
+                                          prev.location_id)
+        if src.uint() == 0 and prev is not None:
+            location_id, steps, score, inventory, picked_items = _next_state(prev, loc_id, command)
+        else:
+            location_id, steps, score = src.uint(), src.uint(), src.sint()
+            inventory, picked_items = tuple(src.entity_list()), tuple(src.entity_list())
+        places = PersistentArray() if prev is None else prev.places
+        for _ in range(src.uint()):
+            code = src.uint()
+            places = places.set(code >> 1, (tuple(src.entity_list()), bool(code & 1)))
+        return GameState(location_id, steps, score, inventory, picked_items, places, (loc_id, command))
+
+    def moves_needed(self) -> Optional[int]:
+        """Return a lower bound on the number of moves needed to win from here, or None if winning is impossible.
+
+        Every undelivered goal item must at least be fetched from where it is and carried to the nearest goal
+        location, so the bound is the longest such trip.
+        """
+        if self.objective.is_lost():
+            return None
+        graph = self.game.get_graph()
+        here = self.game.current_location_id
+        needed = 0
+        for _, loc_id in self.objective.undelivered():
+            start = here if loc_id is None else loc_id
+            fetch = 0 if loc_id is None else graph.distance_to(here, loc_id)
+            deliver = self._distance_to_goal(start)
+            if fetch is None or deliver is None:
+                return None
+            needed = max(needed, fetch + deliver)
+        return needed
+
+    def hint(self) -> Optional[str]:
+        """Return a movement command that brings the player closer to where progress can be made: a goal
+        location if they are carrying an undelivered goal item, otherwise the nearest undelivered goal item.
+        Return None if the player is already there or no such place can be reached."""
+        graph = self.game.get_graph()
+        here = self.game.current_location_id
+        undelivered = self.objective.undelivered()
+        if any(loc_id is None for _, loc_id in undelivered):
+            targets = self.objective.goal_location_ids
+        else:
+            targets = {loc_id for _, loc_id in undelivered}
+        best, best_dist = None, None
+        for target in targets:
+            dist = graph.distance_to(here, target)
+            if dist is not None and (best_dist is None or dist < best_dist):
+                best, best_dist = target, dist
+        return None if best is None else graph.hint(here, best)
+
+    def _distance_to_goal(self, loc_id: int) -> Optional[int]:
+        """Return the fewest moves from the given location to any goal location, or None if none is reachable."""
+        graph = self.game.get_graph()
+        dists = [dist for dist in (graph.distance_to(loc_id, goal) for goal in self.objective.goal_location_ids)
+                 if dist is not None]
+        return min(dists) if dists else None
+
+    def is_valid_action(self, choice: str) -> bool:
+        """Return whether choice is an action the player may take at the current location."""
+        return self._action_kind(choice) is not None
+
+    def _action_kind(self, choice: str) -> Optional[int]:
+        """Return the kind of token (see game_commands) of choice, or None if it is not an action the player may
+        take at the current location. A menu command or item action takes priority over a movement command with
+        the same name."""
+        table = self.game.get_command_table()
+        token = table.token(choice, self.game.current_location_id)
+        if token == INVALID:
+            return None
+        kind = table.kinds[token]
+        if kind == MENU_COMMAND or kind == ITEM_ACTION:
+            return kind
+        elif kind == MOVE and table.move_target(self.game.current_location_id, token) is not None:
+            return MOVE
+        return None
+
+    def _act(self, choice: str) -> None:
+        """Carry out the given action."""
+        out = self._lines.append
+        kind = self._action_kind(choice)
+        if kind is None:
+            out("That was an invalid option. Try again.")
+            return
+        out("========")
+        out("You decided to: " + choice)
+        self._last_command = choice
+        location = self.game.get_location()
+
+        if kind == MENU_COMMAND:
+            self._menu(choice, location)
+            if self.game.ongoing:
+                self._begin_turn(False, True)
+            return
+        elif choice == 'pickitem':
+            if len(location.items) != 0:
+                out("\nThe available items here are:")
+                out(self.game.get_renderer().items(location.items))
+                self._mode = _PICK
+                return
+            out("There are no items in this location!\n")
+        elif choice == 'dropitem':
+            if self.player.get_inventory():
+                self.player.display_inventory(out)
+                self._mode = _DROP
+                return
+            out("You have no items to drop!\n")
+        else:
+            self._move(choice, location)
+            return
+        self._end_turn(location, False)
+
+    def _menu(self, choice: str, location: Location) -> None:
+        """Carry out the given menu command."""
+        out = self._lines.append
+        if choice == "log":
+            self.log.display_events(out)
+            out("")
+        elif choice == "look":
+            self.game.look(location, out)
+        elif choice == "score":
+            out("\nPlayer's Score: " + str(self.player.score))
+        elif choice == "undo":
+            self._undo()
+        elif choice == "redo":
+            self._redo()
+        elif choice == "inventory":
+            self.player.display_inventory(out)
+            out("Your current inventory weight is " + str(self.game.sum_inv_weight(self.player)) + " lbs\n")
+        elif choice == "weights":
+            out("Item Weights:")
+            for item in self.game.get_the_items():
+                out(item + " Weight: " + str(self.game.get_item(item).weight))
+            out("All the Keys have a Weight of 0 lbs\n")
+        elif choice == "quit":
+            out("\nSad to see you quit the game. Have a good one!\n")
+            self.game.ongoing = False
+
+    def _undo(self) -> None:
+        """Undo the most recent move, pickup or drop that has not already been undone."""
+        if self._cursor <= 0:
+            self._lines.append("There is nothing to undo.\n")
+            return
+        self.log.remove_last_event()
+        self._restore(self._cursor - 1)
+
+    def _redo(self) -> None:
+        """Redo the most recently undone move, pickup or drop."""
+        if self._cursor >= len(self._history) - 1:
+            self._lines.append("There is nothing to redo.\n")
+            return
+        self._restore(self._cursor + 1)
+        loc_id, command = self._history[self._cursor].event
+        self.log.add_event(Event(loc_id), command)
+
+    def _restore(self, index: int) -> None:
+        """Return the game to the snapshot at the given index of the history.
+
+        Only the locations that differ between the current and target snapshots (or that changed since the
+        current snapshot was taken) are written back, so this takes time proportional to what changed.
+        """
+        game, target = self.game, self._history[index]
+        changed = self._dirty.union(self._history[self._cursor].places.changed_indexes(target.places))
+        restored = []
+        for loc_id in changed:
+            location = game.get_location(loc_id)
+            for item in location.items:
+                self.objective.item_removed(loc_id, item)
+                self.weights.item_removed(loc_id, item)
+            restored.append((location, target.places.get(loc_id) or self._originals[loc_id]))
+        for location, (items, visited) in restored:
+            location.items = items
+            location.visited = visited
+            for item in items:
+                self.objective.item_placed(location.id_num, item)
+                self.weights.item_placed(location.id_num, item)
+
+        self.player = Player([], target.score, game.item_weight)
+        for item in target.inventory:
+            self.player.add_item(item)
+        game.current_location_id = target.location_id
+        self.steps_remaining = target.steps_remaining
+        self.picked_items = list(target.picked_items)
+        self._dirty.clear()
+        self._cursor = index
+
+    def _log_event(self, location: Location, command: Optional[str]) -> None:
+        """Log the player's arrival at (or action in) location, and take a snapshot of the resulting state.
+
+        Any undone snapshots are discarded, since they can no longer be redone, and so are the oldest snapshots
+        beyond max_undo.
+        """
+        self.log.add_event(Event(location.id_num), command)
+        places = self._history[self._cursor].places if self._history else PersistentArray()
+        for loc_id in self._dirty:
+            changed = self.game.get_location(loc_id)
+            places = places.set(loc_id, (tuple(changed.items), changed.visited))
+        self._dirty.clear()
+        del self._history[self._cursor + 1:]
+        self._history.append(GameState(self.game.current_location_id, self.steps_remaining, self.player.score,
+                                       tuple(self.player.get_inventory()), tuple(self.picked_items), places,
+                                       (location.id_num, command)))
+        self._cursor += 1
+        if self.max_undo is not None and self._cursor > self.max_undo:
+            del self._history[0]
+            self._cursor -= 1
+
+    def _touch(self, location: Location) -> None:
+        """Record that location is about to change."""
+        if location.id_num not in self._originals:
+            self._originals[location.id_num] = (tuple(location.items), location.visited)
+        self._dirty.add(location.id_num)
+
+    def _move(self, choice: str, location: Location) -> None:
+        """Move the player along the given movement command, if they have any steps remaining."""
+        if self.steps_remaining <= 0:
+            self._lines.append("No moving steps remaining. You cannot move to a new location. Game over!")
+            self.game.ongoing = False
+            self.finished = True
+        else:
+            self._apply_rules(choice)
+            table = self.game.get_command_table()
+            self.game.current_location_id = table.move_target(location.id_num, table.token(choice))
+        self._end_turn(location, True)
+
+    def _choose_pick(self, item: str) -> None:
+        """Try to pick up the given item at the current location."""
+        out = self._lines.append
+        location = self.game.get_location()
+        if item not in location.items:
+            out("You need to select a valid item from that list. Try again.")
+            return
+        self._item_choice = item
+        self._mode = _ACTION
+
+        weight_ok = self.game.check_weight(self.player, item)
+        if weight_ok and item in self.picked_items:
+            self._pick_up(item, location)
+            self._end_turn(location, False)
+            return
+
+        key_ok = self.game.check_key(self.player, item)
+        puzzle_id = self.game.get_puzzle_for(item)
+        if puzzle_id is not None and self.game.is_answer_puzzle(puzzle_id):
+            self._pending_checks = (weight_ok, key_ok)
+            self._wrong_answers = 0
+            self._mode = _ANSWER
+            return
+        puzzle_ok = self.game.check_puzzle(item, self.log, location, out, self.weights)
+        self._finish_pick(item, location, weight_ok, key_ok, puzzle_ok)
+
+    def _answer_puzzle(self, answer: str) -> None:
+        """Answer the puzzle guarding the item being picked up. After a wrong answer, 'q' gives up on it."""
+        location = self.game.get_location()
+        if self._wrong_answers > 0 and answer.lower() == 'q':
+            self._mode = _ACTION
+            self._finish_pick(self._item_choice, location, *self._pending_checks, False)
+        elif self.game.check_answer(self.game.get_puzzle_for(self._item_choice), answer):
+            self._mode = _ACTION
+            self._finish_pick(self._item_choice, location, *self._pending_checks, True)
+        else:
+            self._wrong_answers += 1
+
+    def _finish_pick(self, item: str, location: Location, weight_ok: bool, key_ok: bool, puzzle_ok: bool) -> None:
+        """Pick up the given item if every check passed, otherwise explain why not."""
+        out = self._lines.append
+        if weight_ok and key_ok and puzzle_ok:
+            self._pick_up(item, location)
+        else:
+            if not weight_ok:
+                out("You cannot pick this item because you are overweight.")
+            if not key_ok:
+                out("You don't have a required key for this item.")
+            if not puzzle_ok:
+                out("Failed puzzle")
+        self.player.display_inventory(out)
+        self._end_turn(location, False)
+
+    def _pick_up(self, item: str, location: Location) -> None:
+        """Move the given item from location into the player's inventory, scoring it if it is the first time."""
+        self._apply_rules(PICK_PREFIX + item)
+        self.player.add_item(item)
+        self._take_item(location, item)
+        self._log_event(location, PICK_PREFIX + item)
+
+    def _choose_drop(self, item: str) -> None:
+        """Drop the given item from the player's inventory at the current location."""
+        out = self._lines.append
+        if item not in self.player.get_inventory():
+            out("You need to select a valid item from your inventory. Try again.")
+            return
+        self._mode = _ACTION
+        location = self.game.get_location()
+        self._apply_rules(DROP_PREFIX + item)
+        self._place_item(location, item)
+        self.player.remove_item(item)
+        self.player.display_inventory(out)
+        self._log_event(location, DROP_PREFIX + item)
+        self._end_turn(location, False)
+
+    def _apply_rules(self, command: str) -> None:
+        """Update the steps remaining, score and picked items for the event command is about to log, by the rules
+        of apply_event. (The inventory and the items at each location are kept by the player and the overlay.)"""
+        self.steps_remaining, self.player.score, _, picked_items, _ = apply_event(
+            self.steps_remaining, self.player.score, (), tuple(self.picked_items), (), command)
+        self.picked_items = list(picked_items)
+
+    def _place_item(self, location: OverlayLocation, item: str) -> None:
+        """Put the given item at location."""
+        self._touch(location)
+        location.add_item(item)
+        self.objective.item_placed(location.id_num, item)
+        self.weights.item_placed(location.id_num, item)
+
+    def _take_item(self, location: OverlayLocation, item: str) -> None:
+        """Take the given item away from location."""
+        self._touch(location)
+        location.remove_item(item)
+        self.objective.item_removed(location.id_num, item)
+        self.weights.item_removed(location.id_num, item)
+
+    def _end_turn(self, location: Location, location_change: bool) -> None:
+        """Finish a turn that was not a menu command and was taken at the given location."""
+        if not location.visited:
+            self._touch(location)
+            location.visited = True
+        self._begin_turn(True, location_change)
+
+    def _begin_turn(self, show_location: bool, location_change: bool) -> None:
+        """Check whether the game is over, and if not, describe the current location (if show_location)
+        and list the available actions. A new event is logged if the player arrived at a location."""
+        out = self._lines.append
+        game = self.game
+        if game.ongoing and self.objective.is_met():
+            self.won = True
+            self.finished = True
+            game.ongoing = False
+            out("Congratulations! You have won the game!")
+        elif game.ongoing and self.end_when_unwinnable and not self._still_winnable():
+            self.steps_remaining = 0
+            self.finished = True
+            game.ongoing = False
+            out("You can no longer bring every item back in the steps remaining. Game over!")
+        if not game.ongoing:
+            if self.finished:
+                out("You had " + str(self.steps_remaining) + " step(s) remaining.")
+                out("Your final score is " + str(self.final_score))
+            return
+
+        location = game.get_location()
+        if show_location:
+            game.look(location, out)
+            if location_change:
+                self._log_event(location, self._last_command)
+
+        out("Allowed Moving Steps Remaining: " + str(self.steps_remaining) + "\n")
+        out(game.get_renderer().actions(location))
+
+    def _still_winnable(self) -> bool:
+        """Return whether the goal might still be reached in the steps remaining."""
+        needed = self.moves_needed()
+        return needed is not None and needed <= self.steps_remaining
+
+    def _result(self) -> StepResult:
+        """Return the result of the current step and start collecting output for the next one."""
+        output = '\n'.join(self._lines)
+        self._lines = []
+        if self.sink is not None:
+            if output:
+                self.sink.write(output)
+            self.sink.flush()
+        if not self.game.ongoing:
+            prompt = ''
+        elif self._mode == _PICK:
+            prompt = PICK_PROMPT
+        elif self._mode == _DROP:
+            prompt = DROP_PROMPT
+        elif self._mode == _ANSWER:
+            prompt = self._answer_prompt()
+        else:
+            prompt = ACTION_PROMPT
+        return StepResult(output, prompt, self.game.ongoing)
+
+    def _answer_prompt(self) -> str:
+        """Return the prompt for the puzzle being answered: its description the first time, then a retry prompt."""
+        puzzle = self.game.get_puzzle(self.game.get_puzzle_for(self._item_choice))
+        return puzzle.description if self._wrong_answers == 0 else RETRY_ANSWER_PROMPT
+
+
+def apply_event(steps: int, score: int, inventory: tuple[str, ...], picked_items: tuple[str, ...],
+                items: tuple[str, ...],
+                command: Optional[str]) -> tuple[int, int, tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    """Return the (steps remaining, score, inventory, picked items, items at the location) after the event
+    reached by command (None for the first event), given those before it, where items are the items at the
+    location the command was carried out at.
+
+    These are the rules of every command that logs an event, which GameSession and game_replay.Replay both
+    follow: a move costs a step; a pickup moves the item from the location into the inventory and, the first
+    time the item is picked up, scores PICK_BONUS points; and a drop moves the item back. Callers that keep the
+    inventory or the items elsewhere may pass empty tuples for them. The items are returned unchanged (as the
+    same object) after a move.
+    """
+    if command is None:
+        pass
+    elif command.startswith(PICK_PREFIX):
+        item = command[len(PICK_PREFIX):]
+        inventory += (item,)
+        items = tuple(here for here in items if here != item)
+        if item not in picked_items:
+            score += PICK_BONUS
+            picked_items += (item,)
+    elif command.startswith(DROP_PREFIX):
+        item = command[len(DROP_PREFIX):]
+        inventory = tuple(held for held in inventory if held != item)
+        items += (item,)
+    else:
+        steps -= 1
+    return steps, score, inventory, picked_items, items
+
+
+def _next_state(prev: GameState, loc_id: int,
+                command: Optional[str]) -> tuple[int, int, int, tuple[str, ...], tuple[str, ...]]:
+    """Return the (location ID, steps remaining, score, inventory, picked items) of the snapshot logged right
+    after prev by the event at the location with ID loc_id reached by command (see apply_event)."""
+    steps, score, inventory, picked_items, _ = apply_event(prev.steps_remaining, prev.score, prev.inventory,
+                                                           prev.picked_items, (), command)
+    return loc_id, steps, score, inventory, picked_items
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
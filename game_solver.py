@@ -0,0 +1,360 @@
+"""CSC111 Project 1: Text Adventure Game - Walkthrough Solver
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a solver that searches the game's state space for a walkthrough with the best
+possible final score (the player's score plus the steps remaining when they win). The walkthrough it finds
+is a list of commands in the same format as the ones AdventureGameSimulation replays.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from adventure import AdventureGame, MAX_WEIGHT
+from game_commands import DROP_PREFIX, PICK_BONUS, PICK_PREFIX
+from game_puzzles import PUZZLE_KINDS, order_solved, weight_solved
+from game_session import STEP_LIMIT
+
+# Mark an entity that the player is carrying, or that is nowhere in the world, in place of a location ID
+CARRIED = -2
+NOWHERE = -1
+
+# A search state: (location ID, the location IDs of the two events before the latest one,
+# the location ID of each entity (or CARRIED), and the bitmask of entities that have earned their bonus)
+State = tuple[int, tuple[Optional[int], ...], tuple[int, ...], int]
+
+
+@dataclass
+class Solution:
+    """
+    A walkthrough found by the solver.
+
+    Instance Attributes:
+        - commands: The walkthrough, replayable by AdventureGameSimulation.
+        - score: The final score the walkthrough earns (score plus steps remaining).
+        - moves: The number of movement commands in the walkthrough.
+        - expanded: The number of search states expanded.
+        - generated: The number of search states generated.
+        - duplicates: The number of generated states pruned because an equal state was already reached with
+          as few moves.
+    """
+    commands: list[str]
+    score: int
+    moves: int
+    expanded: int
+    generated: int
+    duplicates: int
+
+
+class WalkthroughSolver:
+    """
+    A best-first (A*) branch-and-bound search for a highest-scoring walkthrough of a game.
+
+    Movement costs one step; picking up and dropping cost none, but every first pickup of an item or key
+    earns PICK_BONUS points. States are expanded in order of moves made plus an admissible lower bound on the
+    moves still needed to win (the longest trip needed to fetch and deliver one undelivered goal item), so the
+    search can stop as soon as no unexpanded state could beat the best win found. States are canonical
+    tuples and a transposition table keeps the fewest moves each one has been reached with.
+
+    Pickups obey the same rules as the game: the weight limit, required keys, and puzzles. Puzzles solved by
+    typing in an answer (such as logic puzzles) are assumed to be answered correctly; order and weight puzzles
+    are checked with the same rules as game_puzzles, against the locations of the two events before the pickup
+    and the total weight of the items at the location. No other kind of puzzle can be solved for.
+
+    Instance Attributes:
+        - game: The game being solved.
+        - budget: The number of moves the player may make.
+    """
+    # Private Instance Attributes:
+    #   - _names: The name of every entity (item or key), by entity number.
+    #   - _number: A dictionary mapping each entity name to its entity number.
+    #   - _weights: The weight of every entity.
+    #   - _keys: The entity number of the key needed for every entity, or -1 if none is needed.
+    #   - _puzzles: The ID of the puzzle guarding every entity, or None.
+    #   - _kinds: The kind of the puzzle guarding every entity, or None if it is solved by typing in an answer
+    #     (or there is no puzzle).
+    #   - _goal_entities: The entity numbers of the goal items.
+    #   - _order_mask: The bitmask of entities guarded by an order puzzle.
+    #   - _distances: A cache of the distances between pairs of locations looked up so far.
+    #   - _goal_distances: A cache of the distance from each location looked up so far to the nearest goal.
+    game: AdventureGame
+    budget: int
+    _names: list[str]
+    _number: dict[str, int]
+    _weights: list[float]
+    _keys: list[int]
+    _puzzles: list[Optional[int]]
+    _kinds: list[Optional[str]]
+    _goal_entities: list[int]
+    _order_mask: int
+    _distances: dict[tuple[int, int], Optional[int]]
+    _goal_distances: dict[int, Optional[int]]
+
+    def __init__(self, game: AdventureGame, budget: int = STEP_LIMIT) -> None:
+        """Initialize a solver for game, in which the player may make at most budget moves.
+
+        Raise a ValueError if an item or key is guarded by a puzzle of a kind the solver cannot check.
+        """
+        self.game = game
+        self.budget = budget
+        self._names = list(game.get_the_items()) + list(game.get_the_keys())
+        self._number = number = {name: i for i, name in enumerate(self._names)}
+        self._weights = [game.item_weight(name) for name in self._names]
+        self._keys = [-1] * len(self._names)
+        for name in game.get_the_items():
+            the_key = game.get_item(name).the_key
+            if the_key is not None:
+                self._keys[number[name]] = number[the_key]
+        self._puzzles = [game.get_puzzle_for(name) for name in self._names]
+        self._kinds = [None if puzzle_id is None else self._checked_kind(puzzle_id) for puzzle_id in self._puzzles]
+        self._goal_entities = [number[name] for name in game.goal_items]
+        self._order_mask = sum(1 << e for e, kind in enumerate(self._kinds) if kind == 'order')
+        self._distances = {}
+        self._goal_distances = {}
+
+    def solve(self, start_id: int, max_expansions: Optional[int] = None) -> Optional[Solution]:
+        """Return a highest-scoring walkthrough starting at start_id, or None if the game cannot be won.
+
+        If max_expansions is given, stop after expanding that many states and return the best walkthrough found
+        so far (which may not be optimal), or None if none was found.
+        """
+        placement = [NOWHERE] * len(self._names)
+        for location in self.game.get_locations():
+            for item in location.items:
+                placement[self._number[item]] = location.id_num
+        start = self._canonical((start_id, (None, None), tuple(placement), 0))
+
+        best_moves = {start: 0}
+        parents = {start: None}
+        frontier = [(self._lower_bound(start), 0, 0, 0, start)]
+        counter = 1
+        best: Optional[tuple[int, State]] = None
+        expanded = generated = duplicates = 0
+        max_bonus = PICK_BONUS * len(self._names)
+
+        while frontier:
+            f, _, _, moves, state = heapq.heappop(frontier)
+            if moves > best_moves[state]:
+                continue
+            if best is not None and max_bonus + self.budget - f <= best[0]:
+                break
+            if max_expansions is not None and expanded >= max_expansions:
+                break
+            expanded += 1
+
+            if self._is_won(state):
+                score = PICK_BONUS * bin(state[3]).count('1') + self.budget - moves
+                if best is None or score > best[0]:
+                    best = (score, state)
+                continue
+
+            for command, cost, successor in self._successors(state, moves):
+                generated += 1
+                new_moves = moves + cost
+                successor = self._canonical(successor)
+                if new_moves >= best_moves.get(successor, self.budget + 1):
+                    duplicates += 1
+                    continue
+                bound = self._lower_bound(successor)
+                if bound is None or new_moves + bound > self.budget:
+                    continue
+                best_moves[successor] = new_moves
+                parents[successor] = (state, command)
+                heapq.heappush(frontier, (new_moves + bound, -bin(successor[3]).count('1'), counter, new_moves,
+                                          successor))
+                counter += 1
+
+        if best is None:
+            return None
+        commands = []
+        state = best[1]
+        while parents[state] is not None:
+            state, command = parents[state]
+            commands.append(command)
+        commands.reverse()
+        return Solution(commands, best[0], best_moves[best[1]], expanded, generated, duplicates)
+
+    def _successors(self, state: State, moves: int) -> list[tuple[str, int, State]]:
+        """Return (command, moves it costs, resulting state) for every useful action in the given state."""
+        loc_id, history, placement, picked = state
+        location = self.game.get_location(loc_id)
+        successors = []
+
+        if moves < self.budget:
+            for command, target in location.available_commands.items():
+                successors.append((command, 1, (target, self._shift(history, loc_id), placement, picked)))
+
+        carried_weight = sum(self._weights[e] for e, where in enumerate(placement) if where == CARRIED)
+        for e, where in enumerate(placement):
+            if where == loc_id:
+                new_picked = self._try_pick(state, e, carried_weight)
+                if new_picked is not None:
+                    new_placement = placement[:e] + (CARRIED,) + placement[e + 1:]
+                    successors.append((PICK_PREFIX + self._names[e], 0,
+                                       (loc_id, self._shift(history, loc_id), new_placement, new_picked)))
+            elif where == CARRIED:
+                new_placement = placement[:e] + (loc_id,) + placement[e + 1:]
+                successors.append((DROP_PREFIX + self._names[e], 0,
+                                   (loc_id, self._shift(history, loc_id), new_placement, picked)))
+        return successors
+
+    def _try_pick(self, state: State, e: int, carried_weight: float) -> Optional[int]:
+        """Return the bonus bitmask after picking up entity e in the given state, or None if it cannot be picked
+        up there."""
+        loc_id, history, placement, picked = state
+        weight_ok = carried_weight + self._weights[e] <= MAX_WEIGHT
+        bit = 1 << e
+        if weight_ok and picked & bit:
+            return picked
+        key = self._keys[e]
+        if not weight_ok or (key != -1 and placement[key] != CARRIED):
+            return None
+
+        kind = self._kinds[e]
+        if kind is not None:
+            answer = self.game.get_puzzle(self._puzzles[e]).answer
+            if kind == 'order' and not order_solved(answer, history[0], history[1]):
+                return None
+            if kind == 'weight':
+                total = math.fsum(self._weights[i] for i, where in enumerate(placement) if where == loc_id)
+                if not weight_solved(answer, total):
+                    return None
+        return picked | bit
+
+    def _checked_kind(self, puzzle_id: int) -> Optional[str]:
+        """Return the kind of the puzzle with the given ID, or None if it is solved by typing in an answer.
+
+        Raise a ValueError if it is of a kind the solver cannot check.
+        """
+        kind = self.game.puzzle_kind(puzzle_id)
+        if PUZZLE_KINDS[kind].answered:
+            return None
+        if kind not in ('order', 'weight'):
+            raise ValueError(f'The solver cannot check puzzle {puzzle_id} of kind {kind!r}')
+        return kind
+
+    def _shift(self, history: tuple[Optional[int], ...], loc_id: int) -> tuple[Optional[int], ...]:
+        """Return the recent event locations after a new event, given that the latest event was at loc_id."""
+        return (history[1], loc_id) if history else history
+
+    def _canonical(self, state: State) -> State:
+        """Return the given state with its recent event locations dropped once they can no longer matter,
+        i.e. once every entity guarded by an order puzzle has earned its bonus (and so is never checked again)."""
+        if state[1] and state[3] & self._order_mask == self._order_mask:
+            return state[0], (), state[2], state[3]
+        return state
+
+    def _is_won(self, state: State) -> bool:
+        """Return whether every goal item is at a goal location in the given state."""
+        placement = state[2]
+        goals = self.game.goal_location_ids
+        return all(placement[e] in goals for e in self._goal_entities)
+
+    def _lower_bound(self, state: State) -> Optional[int]:
+        """Return a lower bound on the moves needed to win from the given state, or None if it cannot be won.
+
+        Each undelivered goal item must at least be fetched and carried to the nearest goal location; if picking
+        it up needs a key the player is not carrying, the key must be fetched on the way.
+        """
+        loc_id, _, placement, picked = state
+        needed = 0
+        for e in self._goal_entities:
+            where = placement[e]
+            if where in self.game.goal_location_ids:
+                continue
+            if where == CARRIED:
+                trip = self._to_goal(loc_id)
+            else:
+                key = self._keys[e]
+                if key != -1 and placement[key] != CARRIED and not picked & (1 << e):
+                    trip = self._via(loc_id, placement[key], where)
+                else:
+                    trip = self._via(loc_id, where)
+            if trip is None:
+                return None
+            needed = max(needed, trip)
+        return needed
+
+    def _via(self, *stops: int) -> Optional[int]:
+        """Return the fewest moves to visit the given locations in order and then reach a goal location,
+        or None if that is impossible (including when a stop is NOWHERE)."""
+        total = 0
+        for i in range(len(stops) - 1):
+            if stops[i + 1] == NOWHERE:
+                return None
+            leg = self._distance(stops[i], stops[i + 1])
+            if leg is None:
+                return None
+            total += leg
+        rest = self._to_goal(stops[-1])
+        return None if rest is None else total + rest
+
+    def _distance(self, from_id: int, to_id: int) -> Optional[int]:
+        """Return the fewest moves from one location to another, or None if it cannot be reached."""
+        key = (from_id, to_id)
+        if key not in self._distances:
+            self._distances[key] = self.game.get_graph().distance(from_id, to_id)
+        return self._distances[key]
+
+    def _to_goal(self, loc_id: int) -> Optional[int]:
+        """Return the fewest moves from the given location to any goal location, or None if none can be reached."""
+        if loc_id not in self._goal_distances:
+            dists = [d for d in (self._distance(loc_id, goal) for goal in self.game.goal_location_ids)
+                     if d is not None]
+            self._goal_distances[loc_id] = min(dists) if dists else None
+        return self._goal_distances[loc_id]
+
+
+def session_inputs(game: AdventureGame, commands: list[str]) -> list[str]:
+    """Return the inputs a player would type into a GameSession to carry out the given walkthrough
+    commands, including the answers to any logic puzzles guarding first pickups."""
+    inputs = []
+    answered = set()
+    for command in commands:
+        if command.startswith(PICK_PREFIX):
+            item = command[len(PICK_PREFIX):]
+            inputs.extend(['pickitem', item])
+            puzzle_id = game.get_puzzle_for(item)
+            if puzzle_id is not None and game.is_answer_puzzle(puzzle_id) and item not in answered:
+                inputs.append(str(game.get_puzzle(puzzle_id).answer))
+                answered.add(item)
+        elif command.startswith(DROP_PREFIX):
+            inputs.extend(['dropitem', command[len(DROP_PREFIX):]])
+        else:
+            inputs.append(command)
+    return inputs
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    solution = WalkthroughSolver(AdventureGame('game_data.json', 1)).solve(1)
+    if solution is None:
+        print("The game cannot be won.")
+    else:
+        for walkthrough_command in solution.commands:
+            print(walkthrough_command)
+        print(f"Final score: {solution.score} ({solution.moves} moves)")
+        print(f"Expanded {solution.expanded} states, generated {solution.generated}, "
+              f"pruned {solution.duplicates} duplicates")
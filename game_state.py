@@ -0,0 +1,157 @@
+"""CSC111 Project 1: Text Adventure Game - Persistent Game State
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains immutable snapshots of a game session's state. Snapshots share every part that
+did not change between them, so a session can keep one per turn (for undo and redo) without copying the world.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+# Each node of a PersistentArray has 2 ** _BITS children
+_BITS = 4
+_BRANCH = 1 << _BITS
+_MASK = _BRANCH - 1
+
+
+class PersistentArray:
+    """
+    An immutable, sparse array indexed by non-negative integers.
+
+    Setting an element returns a new array that shares all but one root-to-leaf path of nodes with the old
+    one, so it costs O(log n) time and space (with 16-way branching, 5 nodes for indexes below a million).
+    Missing elements are None.
+
+    Representation Invariants:
+        - self._shift % _BITS == 0
+        - every index stored is below 2 ** (self._shift + _BITS)
+    """
+    # Private Instance Attributes:
+    #   - _root: The root node: a tuple of _BRANCH children (nodes, or elements when _shift is 0), or None.
+    #   - _shift: The number of index bits below the root's level.
+    __slots__ = ('_root', '_shift')
+    _root: Optional[tuple]
+    _shift: int
+
+    def __init__(self, root: Optional[tuple] = None, shift: int = 0) -> None:
+        """Initialize an array with the given root node and shift (by default, an empty array)."""
+        self._root = root
+        self._shift = shift
+
+    def get(self, index: int) -> Any:
+        """Return the element at the given index, or None if there is none.
+
+        Raise an IndexError if index is negative.
+        """
+        if index < 0:
+            raise IndexError(f'PersistentArray index must not be negative, not {index}')
+        if index >> (self._shift + _BITS):
+            return None
+        node, shift = self._root, self._shift
+        while node is not None and shift > 0:
+            node = node[(index >> shift) & _MASK]
+            shift -= _BITS
+        return None if node is None else node[index & _MASK]
+
+    def set(self, index: int, value: Any) -> PersistentArray:
+        """Return a new array equal to this one except that the element at the given index is value.
+
+        Raise an IndexError if index is negative.
+        """
+        if index < 0:
+            raise IndexError(f'PersistentArray index must not be negative, not {index}')
+        root, shift = self._root, self._shift
+        while index >> (shift + _BITS):
+            root = None if root is None else (root,) + (None,) * (_BRANCH - 1)
+            shift += _BITS
+        return PersistentArray(_set_in(root, shift, index, value), shift)
+
+    def changed_indexes(self, other: PersistentArray) -> Iterator[int]:
+        """Yield every index whose element differs between this array and other.
+
+        Subtrees the two arrays share are skipped without being visited, so comparing an array with one
+        derived from it by k sets takes O(k log n) time.
+        """
+        a_root, a_shift = self._root, self._shift
+        b_root, b_shift = other._root, other._shift
+        while a_shift < b_shift:
+            a_root = None if a_root is None else (a_root,) + (None,) * (_BRANCH - 1)
+            a_shift += _BITS
+        while b_shift < a_shift:
+            b_root = None if b_root is None else (b_root,) + (None,) * (_BRANCH - 1)
+            b_shift += _BITS
+        yield from _diff(a_root, b_root, a_shift, 0)
+
+
+def _set_in(node: Optional[tuple], shift: int, index: int, value: Any) -> tuple:
+    """Return a copy of node with the element at index set to value, copying only the nodes along its path."""
+    slots = [None] * _BRANCH if node is None else list(node)
+    slot = (index >> shift) & _MASK
+    slots[slot] = value if shift == 0 else _set_in(slots[slot], shift - _BITS, index, value)
+    return tuple(slots)
+
+
+def _diff(a: Optional[tuple], b: Optional[tuple], shift: int, base: int) -> Iterator[int]:
+    """Yield the indexes (offset by base) of the elements that differ between nodes a and b at the given shift."""
+    if a is b:
+        return
+    for slot in range(_BRANCH):
+        x = None if a is None else a[slot]
+        y = None if b is None else b[slot]
+        if x is y:
+            continue
+        if shift == 0:
+            if x != y:
+                yield base + slot
+        else:
+            yield from _diff(x, y, shift - _BITS, base + (slot << shift))
+
+
+@dataclass(frozen=True, slots=True)
+class GameState:
+    """
+    An immutable snapshot of everything that can change in a game session.
+
+    Instance Attributes:
+        - location_id: The ID of the player's location.
+        - steps_remaining: The number of moves the player may still make.
+        - score: The player's score.
+        - inventory: The names of the items (and keys) the player holds, in the order they were picked up.
+        - picked_items: The names of the items (and keys) the player has earned points for.
+        - places: Maps the ID of every location that has changed since the session started to a tuple of
+          (the names of the items at it, whether it has been visited). Unchanged locations are missing.
+        - event: The (location ID, command) of the event logged when the session reached this state, where the
+          command is the one that led to that event (None for the first event).
+    """
+    location_id: int
+    steps_remaining: int
+    score: int
+    inventory: tuple[str, ...]
+    picked_items: tuple[str, ...]
+    places: PersistentArray
+    event: tuple[int, Optional[str]]
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
@@ -0,0 +1,405 @@
+"""CSC111 Project 1: Text Adventure Game - Compiled World
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a compact, column-oriented representation of a game world for very large maps.
+Instead of one Location and one Item object per entity, every attribute is kept in a flat array indexed by
+an integer id, and every string is stored once in a shared string table. Thin views give the same attributes
+as Location and Item, so code that calls AdventureGame.get_location and AdventureGame.get_item works unchanged.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Iterator, Optional
+
+from game_descriptions import DescriptionStore
+from game_entities import Key, Puzzle
+from game_graph import MapGraph
+
+# Stands for a missing key name or puzzle ID in the reference columns
+NONE = -1
+
+
+class CompiledWorld:
+    """
+    Every location and item of a game world, stored as parallel columns.
+
+    Locations are numbered 0 to n - 1 and items 0 to m - 1 in the order of the game data. Strings (names,
+    descriptions, commands and item names) are stored as ids into self.strings, each distinct string once.
+    The commands leaving the location with index i are command_names[command_offsets[i]:command_offsets[i + 1]],
+    leading to the location indexes at the same positions of command_targets (the same layout as MapGraph).
+
+    If the world has a description store, the brief and long descriptions are not in the string table: briefs
+    and longs hold indexes into the store instead, and each description is read from disk when it is needed.
+
+    A compiled world is never written to once it is built: the items and visited flags that change as a game is
+    played are kept in each game's overlay (see game_overlay), so every location starts unvisited.
+
+    Instance Attributes:
+        - strings: The string table; every string id indexes into it.
+        - location_ids: The location ID of each location index.
+        - names: The string id of each location's name.
+        - briefs: The string id (or description store index) of each location's brief description.
+        - longs: The string id (or description store index) of each location's long description.
+        - descriptions: The store the descriptions are kept in, or None if they are in the string table.
+        - command_offsets: The start of each location's commands in command_names and command_targets.
+        - command_names: The string id of each command.
+        - command_targets: The index of the location each command leads to.
+        - item_offsets: The start of each location's initial items in item_refs.
+        - item_refs: The string id of the name of each item initially at a location.
+        - item_names: The string id of each item's name.
+        - item_weights: The weight of each item.
+        - item_keys: The string id of the name of the key each item needs, or NONE.
+        - item_puzzles: The ID of the puzzle guarding each item, or NONE.
+
+    Representation Invariants:
+        - len(self.command_offsets) == len(self.item_offsets) == len(self.location_ids) + 1
+        - len(self.command_names) == len(self.command_targets) == self.command_offsets[-1]
+        - len(self.item_refs) == self.item_offsets[-1]
+        - len(self.item_weights) == len(self.item_keys) == len(self.item_puzzles) == len(self.item_names)
+        - every puzzle ID is non-negative
+    """
+    # Private Instance Attributes:
+    #   - _id_base: If the location IDs are consecutive, the ID of location index 0; otherwise None.
+    #   - _location_index: If the location IDs are not consecutive, a dictionary mapping each to its index.
+    #   - _item_index: A dictionary mapping each item name to its index.
+    strings: list[str]
+    location_ids: array
+    names: array
+    briefs: array
+    longs: array
+    descriptions: Optional[DescriptionStore]
+    command_offsets: array
+    command_names: array
+    command_targets: array
+    item_offsets: array
+    item_refs: array
+    item_names: array
+    item_weights: array
+    item_keys: array
+    item_puzzles: array
+    _id_base: Optional[int]
+    _location_index: Optional[dict[int, int]]
+    _item_index: dict[str, int]
+
+    def __init__(self, location_rows: list[tuple], item_rows: list[tuple],
+                 descriptions_path: Optional[str] = None) -> None:
+        """Compile the locations and items given as rows of Location and Item constructor arguments.
+
+        If descriptions_path is given, the descriptions are written to a DescriptionStore backed by the sidecar
+        file at that path, instead of being kept in memory.
+
+        Preconditions:
+            - every command of every location leads to one of the given locations
+        """
+        self.strings = []
+        strings, string_ids = self.strings, {}
+        # The descriptions go in the string table too, unless they are kept on disk
+        texts, text_ids = (strings, string_ids) if descriptions_path is None else ([], {})
+
+        loc_ids = [row[0] for row in location_rows]
+        self.location_ids = array('i', loc_ids)
+        if not loc_ids or loc_ids == list(range(loc_ids[0], loc_ids[0] + len(loc_ids))):
+            self._id_base = loc_ids[0] if loc_ids else 0
+            self._location_index = None
+        else:
+            self._id_base = None
+            self._location_index = {loc_id: i for i, loc_id in enumerate(loc_ids)}
+
+        self.names, self.briefs, self.longs = array('i'), array('i'), array('i')
+        self.command_offsets, self.command_names, self.command_targets = array('i', [0]), array('i'), array('i')
+        self.item_offsets, self.item_refs = array('i', [0]), array('i')
+        for _, name, brief, long, commands, items in location_rows:
+            self.names.append(_intern(strings, string_ids, name))
+            self.briefs.append(_intern(texts, text_ids, brief))
+            self.longs.append(_intern(texts, text_ids, long))
+            for command, target_id in commands.items():
+                self.command_names.append(_intern(strings, string_ids, command))
+                self.command_targets.append(self.index_of(target_id))
+            self.command_offsets.append(len(self.command_names))
+            self.item_refs.extend(_intern(strings, string_ids, item) for item in items)
+            self.item_offsets.append(len(self.item_refs))
+        self.descriptions = None if descriptions_path is None else DescriptionStore.write(descriptions_path, texts)
+
+        self.item_names, self.item_weights = array('i'), array('d')
+        self.item_keys, self.item_puzzles = array('i'), array('i')
+        for name, weight, the_key, puzzle_to_obtain in item_rows:
+            self.item_names.append(_intern(strings, string_ids, name))
+            self.item_weights.append(weight)
+            self.item_keys.append(NONE if the_key is None else _intern(strings, string_ids, the_key))
+            self.item_puzzles.append(NONE if puzzle_to_obtain is None else puzzle_to_obtain)
+        self._item_index = {row[0]: i for i, row in enumerate(item_rows)}
+
+    def description(self, text_id: int) -> str:
+        """Return the brief or long description with the given id (from briefs or longs)."""
+        if self.descriptions is None:
+            return self.strings[text_id]
+        return self.descriptions[text_id]
+
+    def index_of(self, location_id: int) -> int:
+        """Return the index of the location with the given ID, raising KeyError if there is none."""
+        if self._location_index is not None:
+            return self._location_index[location_id]
+        index = location_id - self._id_base
+        if not 0 <= index < len(self.location_ids):
+            raise KeyError(location_id)
+        return index
+
+    def item_index(self, item_name: str) -> int:
+        """Return the index of the item with the given name, raising KeyError if there is none."""
+        return self._item_index[item_name]
+
+    def has_item(self, item_name: object) -> bool:
+        """Return whether there is an item with the given name."""
+        return item_name in self._item_index
+
+    def commands_of(self, index: int) -> dict[str, int]:
+        """Return a new dictionary mapping each command of the location with the given index to the ID of the
+        location it leads to."""
+        strings, location_ids, targets = self.strings, self.location_ids, self.command_targets
+        return {strings[self.command_names[edge]]: location_ids[targets[edge]]
+                for edge in range(self.command_offsets[index], self.command_offsets[index + 1])}
+
+    def items_of(self, index: int) -> tuple[str, ...]:
+        """Return the names of the items at the location with the given index."""
+        strings = self.strings
+        return tuple([strings[ref] for ref in self.item_refs[self.item_offsets[index]:self.item_offsets[index + 1]]])
+
+    def graph(self) -> MapGraph:
+        """Return a MapGraph of this world that shares its command columns."""
+        return MapGraph.from_csr(list(self.location_ids), self.command_offsets, self.command_targets,
+                                 [self.strings[command] for command in self.command_names])
+
+
+class LocationView:
+    """
+    A location of a CompiledWorld, with the same attributes and methods as Location.
+
+    Instance Attributes:
+        - world: The world the location belongs to.
+        - index: The index of the location in world.
+    """
+    __slots__ = ('world', 'index')
+    world: CompiledWorld
+    index: int
+
+    def __init__(self, world: CompiledWorld, index: int) -> None:
+        """Initialize a view of the location with the given index in world."""
+        self.world = world
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether other is a view of the same location of the same world."""
+        return isinstance(other, LocationView) and other.world is self.world and other.index == self.index
+
+    def __hash__(self) -> int:
+        """Return a hash of this view, equal for views of the same location."""
+        return hash((id(self.world), self.index))
+
+    def __repr__(self) -> str:
+        """Return a string representation of this view."""
+        return f'LocationView(id_num={self.id_num}, name={self.name!r})'
+
+    @property
+    def id_num(self) -> int:
+        """Unique identifier for the location."""
+        return self.world.location_ids[self.index]
+
+    @property
+    def name(self) -> str:
+        """The name of the location."""
+        return self.world.strings[self.world.names[self.index]]
+
+    @property
+    def brief_description(self) -> str:
+        """A short description of the location."""
+        return self.world.description(self.world.briefs[self.index])
+
+    @property
+    def long_description(self) -> str:
+        """A detailed description of the location."""
+        return self.world.description(self.world.longs[self.index])
+
+    @property
+    def available_commands(self) -> dict[str, int]:
+        """A dictionary mapping command strings to the next location ID, built each time it is read."""
+        return self.world.commands_of(self.index)
+
+    @property
+    def items(self) -> tuple[str, ...]:
+        """The names of the items initially available at this location."""
+        return self.world.items_of(self.index)
+
+    @property
+    def visited(self) -> bool:
+        """Whether the location has been visited, which is never the case in the shared world."""
+        return False
+
+    def display_items(self, out: Callable[[str], None] = print) -> None:
+        """
+        Print the list of items available at this location, or pass each line to out instead.
+        """
+        for item in self.items:
+            out("- " + item)
+        out("")
+
+
+class ItemView:
+    """
+    An item of a CompiledWorld, with the same attributes as Item.
+
+    Instance Attributes:
+        - world: The world the item belongs to.
+        - index: The index of the item in world.
+    """
+    __slots__ = ('world', 'index')
+    world: CompiledWorld
+    index: int
+
+    def __init__(self, world: CompiledWorld, index: int) -> None:
+        """Initialize a view of the item with the given index in world."""
+        self.world = world
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether other is a view of the same item of the same world."""
+        return isinstance(other, ItemView) and other.world is self.world and other.index == self.index
+
+    def __hash__(self) -> int:
+        """Return a hash of this view, equal for views of the same item."""
+        return hash((id(self.world), self.index))
+
+    def __repr__(self) -> str:
+        """Return a string representation of this view."""
+        return f'ItemView(name={self.name!r}, weight={self.weight})'
+
+    @property
+    def name(self) -> str:
+        """The name of the item."""
+        return self.world.strings[self.world.item_names[self.index]]
+
+    @property
+    def weight(self) -> float:
+        """The weight of the item (non-negative)."""
+        return self.world.item_weights[self.index]
+
+    @property
+    def the_key(self) -> Optional[str]:
+        """The name of the key required to obtain this item, or None."""
+        key = self.world.item_keys[self.index]
+        return None if key == NONE else self.world.strings[key]
+
+    @property
+    def puzzle_to_obtain(self) -> Optional[int]:
+        """The ID of the puzzle that must be solved to obtain this item, or None."""
+        puzzle = self.world.item_puzzles[self.index]
+        return None if puzzle == NONE else puzzle
+
+
+class LocationTable(Mapping):
+    """
+    A read-only mapping from each location ID of a CompiledWorld to a view of that location, in the order of
+    the game data. It can stand in for the dictionary of Location objects of an AdventureGame.
+
+    Instance Attributes:
+        - world: The world whose locations are mapped.
+    """
+    world: CompiledWorld
+
+    def __init__(self, world: CompiledWorld) -> None:
+        """Initialize a mapping of the locations of world."""
+        self.world = world
+
+    def __getitem__(self, location_id: int) -> LocationView:
+        """Return a view of the location with the given ID."""
+        return LocationView(self.world, self.world.index_of(location_id))
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield every location ID."""
+        return iter(self.world.location_ids)
+
+    def __len__(self) -> int:
+        """Return the number of locations."""
+        return len(self.world.location_ids)
+
+
+class ItemTable(Mapping):
+    """
+    A read-only mapping from each item name of a CompiledWorld to a view of that item, in the order of the game
+    data. It can stand in for the dictionary of Item objects of an AdventureGame.
+
+    Instance Attributes:
+        - world: The world whose items are mapped.
+    """
+    world: CompiledWorld
+
+    def __init__(self, world: CompiledWorld) -> None:
+        """Initialize a mapping of the items of world."""
+        self.world = world
+
+    def __getitem__(self, item_name: str) -> ItemView:
+        """Return a view of the item with the given name."""
+        return ItemView(self.world, self.world.item_index(item_name))
+
+    def __contains__(self, item_name: object) -> bool:
+        """Return whether there is an item with the given name."""
+        return self.world.has_item(item_name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield every item name."""
+        strings = self.world.strings
+        return (strings[name] for name in self.world.item_names)
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self.world.item_names)
+
+
+def _intern(table: list[str], ids: dict[str, int], text: str) -> int:
+    """Return the id of text in table, whose ids are given by the dictionary ids, adding it if necessary."""
+    text_id = ids.get(text)
+    if text_id is None:
+        text_id = len(table)
+        table.append(text)
+        ids[text] = text_id
+    return text_id
+
+
+def compile_world(rows: tuple, descriptions_path: Optional[str] = None) -> tuple:
+    """Return the (locations, items, keys, puzzles, objective) of the world described by the given rows (in the
+    format of adventure.WorldRows), with the locations and items compiled into one CompiledWorld. If
+    descriptions_path is given, the descriptions are kept in a sidecar file at that path.
+
+    Keys and puzzles are few even in the largest worlds, so they are still built as Key and Puzzle objects.
+    """
+    location_rows, item_rows, key_rows, puzzle_rows, objective = rows
+    world = CompiledWorld(location_rows, item_rows, descriptions_path)
+    return (LocationTable(world),
+            ItemTable(world),
+            {row[0]: Key(*row) for row in key_rows},
+            {row[0]: Puzzle(*row) for row in puzzle_rows},
+            objective)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pass
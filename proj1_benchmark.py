@@ -0,0 +1,507 @@
+"""CSC111 Project 1: Text Adventure Game - Benchmarks
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains performance benchmarks for the game engine, along with a generator for
+synthetic worlds in the same format as game_data.json. Run it directly to print the results; pass --output
+to save them as JSON, and --baseline to compare them with saved results (the exit status is 1 if any
+benchmark got slower). Run it with --help for the size of the synthetic world and the other options.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+from adventure import AdventureGame, SNAPSHOT_SUFFIX
+from game_analytics import EventCorpus
+from game_entities import Player
+from game_profile import Profiler
+from game_puzzles import legacy_kind
+from game_render import BufferedSink
+from game_session import GameSession, ObjectiveTracker
+from proj1_event_logger import CompactEventList, Event, EventList
+from proj1_simulation import AdventureGameSimulation, run_parallel, simulate_batch
+
+# The format version of the results written by run_suite
+RESULTS_VERSION = 1
+# The default fraction by which a timing may grow before compare_results reports it as a regression
+REGRESSION_TOLERANCE = 0.2
+
+
+def generate_world(num_locations: int, num_items: int, seed: int = 0, num_keys: int = 0, num_puzzles: int = 0,
+                   density: int = 1) -> dict:
+    """Return synthetic game data with the given number of locations, items, keys and puzzles, in the same
+    format as game_data.json.
+
+    Locations are laid out in a ring (so every location is reachable) with density extra random shortcuts each.
+    Items and keys are scattered at random. Key i unlocks the i-th item from the end, and the first num_puzzles
+    items are each guarded by their own puzzle. Puzzles are numbered from 1 and are of the kinds that game data
+    without puzzle kinds would give them (see game_puzzles.legacy_kind).
+
+    Preconditions:
+        - num_locations >= 2
+        - num_items >= 0
+        - 0 <= num_keys <= num_items
+        - 0 <= num_puzzles <= num_items
+        - density >= 0
+    """
+    rng = random.Random(seed)
+    locations = []
+    for loc_id in range(1, num_locations + 1):
+        commands = {'go forward': loc_id % num_locations + 1,
+                    'go back': (loc_id - 2) % num_locations + 1}
+        for i in range(density):
+            commands['go shortcut' if i == 0 else 'go shortcut ' + str(i + 1)] = rng.randint(1, num_locations)
+        locations.append({'id': loc_id,
+                          'name': 'Location ' + str(loc_id),
+                          'brief_description': 'You are at location ' + str(loc_id) + '.',
+                          'long_description': 'You are standing at location ' + str(loc_id)
+                                              + '. It looks much like every other location around here.',
+                          'available_commands': commands,
+                          'items': []})
+
+    items = []
+    for i in range(num_items):
+        name = 'Item ' + str(i)
+        items.append({'name': name, 'weight': float(rng.randint(1, 5)), 'the_key': None, 'puzzle_to_obtain': None})
+        locations[rng.randrange(num_locations)]['items'].append(name)
+
+    keys = []
+    for i in range(num_keys):
+        name = 'Key ' + str(i)
+        item_data = items[num_items - 1 - i]
+        item_data['the_key'] = name
+        keys.append({'key_name': name, 'weight': 0, 'puzzle_to_obtain': None, 'the_item': item_data['name']})
+        locations[rng.randrange(num_locations)]['items'].append(name)
+
+    puzzles = []
+    for puzzle_id in range(1, num_puzzles + 1):
+        kind = legacy_kind(puzzle_id)
+        if kind == 'logic':
+            answer = 'n'
+        elif kind == 'order':
+            answer = [rng.randint(1, num_locations), rng.randint(1, num_locations)]
+        else:
+            answer = float(rng.randint(1, 20))
+        puzzles.append({'id_puzzle': puzzle_id, 'description': 'Puzzle ' + str(puzzle_id) + ': ', 'answer': answer,
+                        'kind': kind})
+        items[puzzle_id - 1]['puzzle_to_obtain'] = puzzle_id
+
+    return {'locations': locations, 'items': items, 'keys': keys, 'puzzles': puzzles}
+
+
+def write_world(data: dict, directory: str) -> str:
+    """Write the given game data to a new JSON file in directory and return the file's path."""
+    fd, path = tempfile.mkstemp(suffix='.json', dir=directory)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    return path
+
+
+def best_time(func: Callable[[], object], repeats: int) -> float:
+    """Return the fastest of repeats timings of func(), in seconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_world_load(game_data_file: str, repeats: int = 5) -> dict[str, float]:
+    """Return the time in seconds to construct an AdventureGame from game_data_file
+    (1) by parsing the JSON file, (2) from a freshly written snapshot, and (3) from a snapshot whose
+    modification time no longer matches but whose content hash does."""
+    snapshot_file = game_data_file + SNAPSHOT_SUFFIX
+    if os.path.exists(snapshot_file):
+        os.remove(snapshot_file)
+
+    results = {'json': best_time(lambda: AdventureGame(game_data_file, 1, use_snapshot=False), repeats)}
+    AdventureGame(game_data_file, 1)
+    results['snapshot'] = best_time(lambda: AdventureGame(game_data_file, 1), repeats)
+
+    def touch_and_load() -> None:
+        os.utime(game_data_file)
+        AdventureGame(game_data_file, 1)
+
+    results['snapshot_rehash'] = best_time(touch_and_load, repeats)
+    return results
+
+
+def run_load_benchmarks(num_locations: int = 100_000) -> dict[str, dict[str, float]]:
+    """Return world load timings for the shipped game_data.json and for a synthetic world
+    with num_locations locations."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        shipped = os.path.join(directory, 'game_data.json')
+        with open('game_data.json', 'rb') as src, open(shipped, 'wb') as dst:
+            dst.write(src.read())
+        results['game_data.json'] = bench_world_load(shipped, repeats=50)
+
+        synthetic = write_world(generate_world(num_locations, num_locations // 10), directory)
+        results['synthetic_' + str(num_locations)] = bench_world_load(synthetic, repeats=3)
+    return results
+
+
+def bench_world_memory(num_locations: int = 100_000) -> dict[str, float]:
+    """Return the memory in MB taken by a synthetic world with num_locations locations, and the mean time in
+    microseconds of get_location, when it is stored as objects, when it is compiled into columns, and when it is
+    compiled with its descriptions left on disk."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_world(generate_world(num_locations, num_locations // 10), directory)
+        for mode, options in [('objects', {}), ('compiled', {'compiled': True}),
+                              ('lazy', {'lazy_descriptions': True})]:
+            tracemalloc.start()
+            game = AdventureGame(path, 1, use_snapshot=False, **options)
+            results[mode + '_mb'] = tracemalloc.get_traced_memory()[0] / 1e6
+            tracemalloc.stop()
+            start = time.perf_counter()
+            for loc_id in range(1, num_locations + 1):
+                game.get_location(loc_id).available_commands
+            results[mode + '_get_location_us'] = (time.perf_counter() - start) / num_locations * 1e6
+            start = time.perf_counter()
+            for loc_id in range(1, num_locations + 1):
+                game.describe(loc_id)
+            results[mode + '_describe_us'] = (time.perf_counter() - start) / num_locations * 1e6
+    return results
+
+
+def random_walk(game: AdventureGame, start_id: int, length: int, seed: int = 0) -> list[str]:
+    """Return a script of length valid movement commands wandering randomly through game from start_id."""
+    rng = random.Random(seed)
+    commands = []
+    location = game.get_location(start_id)
+    for _ in range(length):
+        command = rng.choice(list(location.available_commands))
+        commands.append(command)
+        location = game.get_location(location.available_commands[command])
+    return commands
+
+
+def bench_batch_simulation(game_data_file: str = 'game_data.json', num_scripts: int = 2000,
+                           script_length: int = 35) -> dict[str, float]:
+    """Return the throughput, in scripts per second, of running num_scripts random walks of script_length
+    commands (1) by constructing one AdventureGameSimulation per script and (2) with simulate_batch."""
+    game = AdventureGame(game_data_file, 1)
+    scripts = [random_walk(game, 1, script_length, seed) for seed in range(num_scripts)]
+
+    def loop() -> None:
+        for commands in scripts:
+            AdventureGameSimulation(game_data_file, 1, commands).get_id_log()
+
+    looped = best_time(loop, 3)
+    batched = best_time(lambda: simulate_batch(game, 1, scripts), 3)
+    return {'loop_scripts_per_s': num_scripts / looped, 'batch_scripts_per_s': num_scripts / batched}
+
+
+def bench_parallel_simulation(game_data_file: str = 'game_data.json', num_scripts: int = 20000,
+                              script_length: int = 35,
+                              worker_counts: tuple[int, ...] = (1, 2, 4, 8)) -> dict[int, float]:
+    """Return the throughput, in scripts per second, of run_parallel on num_scripts random walks of script_length
+    commands for each number of worker processes in worker_counts. Pool start-up is included in the timing."""
+    game = AdventureGame(game_data_file, 1)
+    scripts = [random_walk(game, 1, script_length, seed) for seed in range(num_scripts)]
+    return {workers: num_scripts / best_time(lambda: run_parallel(game, 1, scripts, max_workers=workers), 3)
+            for workers in worker_counts}
+
+
+def bench_analytics(game_data_file: str = 'game_data.json', num_logs: int = 1_000_000,
+                    script_length: int = 35) -> dict[str, float]:
+    """Return the time in seconds of loading num_logs id logs of random walks of script_length commands into an
+    EventCorpus, and of computing each of its statistics over them."""
+    game = AdventureGame(game_data_file, 1)
+    walks = [random_walk(game, 1, script_length, seed) for seed in range(100)]
+    id_logs = [result.id_log for result in simulate_batch(game, 1, walks)]
+    corpus = EventCorpus()
+    start = time.perf_counter()
+    corpus.add_id_logs(id_logs[i % len(id_logs)] for i in range(num_logs))
+    results = {'load_s': time.perf_counter() - start}
+    for name in ['visit_counts', 'transition_counts', 'move_counts', 'item_counts', 'undo_rate']:
+        results[name + '_s'] = best_time(getattr(corpus, name), 1)
+    results['steps_to_win_s'] = best_time(lambda: corpus.steps_to_win(game), 1)
+    return results
+
+
+def bench_inventory_checks(catalog_size: int = 100_000, inventory_size: int = 10_000,
+                           repeats: int = 1000) -> dict[str, float]:
+    """Return the mean time in microseconds of check_weight, check_key and sum_inv_weight for a player holding
+    inventory_size items out of a synthetic catalog of catalog_size items."""
+    with tempfile.TemporaryDirectory() as directory:
+        data = generate_world(2, catalog_size)
+        for i, item_data in enumerate(data['items']):
+            item_data['weight'] = 0.0
+            item_data['the_key'] = 'Item ' + str((i + 1) % catalog_size)
+        game = AdventureGame(write_world(data, directory), 1, use_snapshot=False)
+
+    player = Player([], 0, game.item_weight)
+    for i in range(inventory_size):
+        player.add_item('Item ' + str(i))
+    target = 'Item ' + str(inventory_size - 1)
+
+    results = {}
+    for name, check in [('check_weight', lambda: game.check_weight(player, target)),
+                        ('check_key', lambda: game.check_key(player, target)),
+                        ('sum_inv_weight', lambda: game.sum_inv_weight(player))]:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            check()
+        results[name + '_us'] = (time.perf_counter() - start) / repeats * 1e6
+    return results
+
+
+def mean_time(func: Callable[[], object], count: int) -> float:
+    """Return the mean time of count calls of func(), in microseconds."""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def bench_event_lists(num_events: int) -> dict[str, float]:
+    """Return the mean time in microseconds of add_event and remove_last_event, and the time in milliseconds of
+    get_id_log, on EventList and CompactEventList logs of num_events events."""
+    results = {}
+    for name, make_list in [('event_list', EventList), ('compact_event_list', CompactEventList)]:
+        events = make_list()
+        start = time.perf_counter()
+        for i in range(num_events):
+            events.add_event(Event(i), 'go forward')
+        results[name + '.add_event_us'] = (time.perf_counter() - start) / num_events * 1e6
+        results[name + '.get_id_log_ms'] = best_time(events.get_id_log, 3) * 1000
+        start = time.perf_counter()
+        for _ in range(num_events):
+            events.remove_last_event()
+        results[name + '.remove_last_event_us'] = (time.perf_counter() - start) / num_events * 1e6
+    return results
+
+
+def bench_game_checks(game: AdventureGame, repeats: int = 10_000) -> dict[str, float]:
+    """Return the mean time in microseconds of the inventory checks and the win check in game, for a player
+    holding every key and as many items as fit within the weight limit."""
+    player = Player([], 0, game.item_weight)
+    for key in game.get_the_keys():
+        player.add_item(key)
+    for item in game.get_the_items():
+        if game.check_weight(player, item):
+            player.add_item(item)
+    items = game.get_the_items()
+    target = items[-1] if items else ''
+
+    tracker = ObjectiveTracker(game.goal_location_ids, game.goal_items, *game.goal_item_locations())
+    goal_id = game.goal_location_ids[0]
+
+    def move_goal_item() -> None:
+        tracker.item_placed(goal_id, target)
+        tracker.item_removed(goal_id, target)
+
+    return {'check_weight_us': mean_time(lambda: game.check_weight(player, target), repeats),
+            'check_key_us': mean_time(lambda: game.check_key(player, target), repeats),
+            'sum_inv_weight_us': mean_time(lambda: game.sum_inv_weight(player), repeats),
+            'has_item_us': mean_time(lambda: player.has_item(target), repeats),
+            'win_check_us': mean_time(tracker.is_met, repeats),
+            'win_update_us': mean_time(move_goal_item, repeats)}
+
+
+def bench_sessions(game: AdventureGame, count: int = 10_000) -> dict[str, float]:
+    """Return the mean time in microseconds and the memory in bytes taken by forking game (see
+    AdventureGame.fork) and by starting a GameSession in a fork, measured over count of each."""
+    game.fork(1)
+    results = {'fork_us': mean_time(lambda: game.fork(1), count),
+               'create_us': mean_time(lambda: GameSession(game.fork(1)), count)}
+    for name, make in [('fork_bytes', lambda: game.fork(1)), ('create_bytes', lambda: GameSession(game.fork(1)))]:
+        tracemalloc.start()
+        kept = [make() for _ in range(count)]
+        results[name] = tracemalloc.get_traced_memory()[0] / len(kept)
+        tracemalloc.stop()
+    return results
+
+
+def bench_turns(game_data_file: str = 'game_data.json', num_turns: int = 20_000) -> dict[str, float]:
+    """Return the number of turns per second of a GameSession playing num_turns turns (alternating random moves
+    and looks) in game_data_file, (1) headless, with the output of each turn only returned, (2) writing each
+    turn to /dev/null through a BufferedSink, (3) printing each line of output to /dev/null separately, and
+    (4) headless with a Profiler enabled (with it disabled, the engine runs the same code as in (1))."""
+    game = AdventureGame(game_data_file, 1)
+    inputs = []
+    for command in random_walk(game, 1, num_turns // 2):
+        inputs.extend([command, 'look'])
+
+    def play(sink: Optional[BufferedSink] = None, print_lines: Optional[Callable[[str], None]] = None) -> None:
+        session = GameSession(AdventureGame(game_data_file, 1), steps=len(inputs), sink=sink)
+        session.start()
+        for command in inputs:
+            output = session.step(command).output
+            if print_lines is not None:
+                for line in output.split('\n'):
+                    print_lines(line)
+
+    def play_profiled() -> None:
+        with Profiler():
+            play()
+
+    with open(os.devnull, 'w') as devnull:
+        return {'headless_turns_per_s': len(inputs) / best_time(play, 3),
+                'buffered_turns_per_s': len(inputs) / best_time(lambda: play(sink=BufferedSink(devnull.write)), 3),
+                'print_turns_per_s': len(inputs) / best_time(
+                    lambda: play(print_lines=lambda line: print(line, file=devnull)), 3),
+                'profiled_turns_per_s': len(inputs) / best_time(play_profiled, 3)}
+
+
+def run_suite(num_locations: int = 10_000, num_items: int = 1000, num_keys: int = 100, num_puzzles: int = 10,
+              density: int = 1, num_scripts: int = 200, script_length: int = 35, num_events: int = 100_000,
+              seed: int = 0) -> dict:
+    """Run every benchmark against a synthetic world generated with the given parameters, and return the
+    results in a JSON-serializable dictionary.
+
+    The dictionary has a "version", the "config" the suite was run with, the "environment" it was run in, and
+    the "results": a flat dictionary mapping each metric name to a timing, where smaller is always better.
+    The unit of each metric is the suffix of its name.
+    """
+    config = {'num_locations': num_locations, 'num_items': num_items, 'num_keys': num_keys,
+              'num_puzzles': num_puzzles, 'density': density, 'num_scripts': num_scripts,
+              'script_length': script_length, 'num_events': num_events, 'seed': seed}
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_world(generate_world(num_locations, num_items, seed, num_keys, num_puzzles, density),
+                           directory)
+        for mode, seconds in bench_world_load(path, repeats=3).items():
+            results['load.' + mode + '_ms'] = seconds * 1000
+        results['load.compiled_ms'] = best_time(lambda: AdventureGame(path, 1, compiled=True), 3) * 1000
+
+        game = AdventureGame(path, 1)
+        scripts = [random_walk(game, 1, script_length, seed + i) for i in range(num_scripts)]
+        results['simulation.construct_ms'] = best_time(
+            lambda: AdventureGameSimulation(path, 1, scripts[0]), 3) * 1000
+        results['simulation.generate_events_us'] = best_time(
+            lambda: simulate_batch(game, 1, scripts), 3) / num_scripts * 1e6
+        for name, value in bench_sessions(game).items():
+            results['sessions.' + name] = value
+
+    for name, value in bench_event_lists(num_events).items():
+        results['events.' + name] = value
+    for name, value in bench_game_checks(game).items():
+        results['checks.' + name] = value
+
+    return {'version': RESULTS_VERSION,
+            'config': config,
+            'environment': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                            'machine': platform.machine(), 'system': platform.system(),
+                            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z')},
+            'results': results}
+
+
+def compare_results(current: dict, baseline: dict,
+                    tolerance: float = REGRESSION_TOLERANCE) -> list[tuple[str, float, float]]:
+    """Return (metric name, baseline timing, current timing) for every metric of the suite results current that
+    is more than tolerance (as a fraction) slower than in the suite results baseline.
+
+    Metrics found in only one of the two are ignored. Comparing results run with different configs is
+    allowed, but is unlikely to be meaningful.
+    """
+    regressions = []
+    for name, old in baseline['results'].items():
+        new = current['results'].get(name)
+        if new is not None and new > old * (1 + tolerance):
+            regressions.append((name, old, new))
+    return regressions
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    """Return the command-line arguments of the benchmark suite."""
+    parser = argparse.ArgumentParser(description='Benchmark the game engine on a synthetic world.')
+    parser.add_argument('--locations', type=int, default=10_000)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--keys', type=int, default=100)
+    parser.add_argument('--puzzles', type=int, default=10)
+    parser.add_argument('--density', type=int, default=1, help='extra random shortcuts per location')
+    parser.add_argument('--scripts', type=int, default=200)
+    parser.add_argument('--script-length', type=int, default=35)
+    parser.add_argument('--events', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the results as JSON to this file (- for standard output)')
+    parser.add_argument('--baseline', help='compare against the JSON results in this file')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument('--extended', action='store_true',
+                        help='also run the memory, batch, inventory, turn, analytics and parallel benchmarks')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    args = _parse_args(sys.argv[1:])
+    suite_results = run_suite(args.locations, args.items, args.keys, args.puzzles, args.density, args.scripts,
+                              args.script_length, args.events, args.seed)
+    if args.output == '-':
+        print(json.dumps(suite_results, indent=2))
+    else:
+        for metric, value in suite_results['results'].items():
+            print('{:<48} {:14.3f}'.format(metric, value))
+        if args.output:
+            with open(args.output, 'w') as results_file:
+                json.dump(suite_results, results_file, indent=2)
+
+    if args.extended:
+        for world_name, timings in run_load_benchmarks().items():
+            print(world_name)
+            for mode, seconds in timings.items():
+                print('    {:<16} {:10.3f} ms'.format(mode, seconds * 1000))
+
+        print('world memory (100k locations)')
+        for mode, amount in bench_world_memory().items():
+            print('    {:<24} {:10.3f}'.format(mode, amount))
+
+        print('batch simulation')
+        for mode, rate in bench_batch_simulation().items():
+            print('    {:<20} {:12.0f}'.format(mode, rate))
+
+        print('inventory checks (100k catalog, 10k inventory)')
+        for check_name, micros in bench_inventory_checks().items():
+            print('    {:<20} {:12.3f}'.format(check_name, micros))
+
+        print('turns (game_data.json)')
+        for mode, rate in bench_turns().items():
+            print('    {:<24} {:12.0f}'.format(mode, rate))
+
+        print('analytics (1M id logs, seconds)')
+        for stage, seconds in bench_analytics().items():
+            print('    {:<24} {:12.3f}'.format(stage, seconds))
+
+        print('parallel simulation (scripts/s)')
+        for workers, rate in bench_parallel_simulation().items():
+            print('    {:>2} workers {:12.0f}'.format(workers, rate))
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            slower = compare_results(suite_results, json.load(baseline_file), args.tolerance)
+        for metric, before, after in slower:
+            print('REGRESSION {:<48} {:12.3f} -> {:12.3f}'.format(metric, before, after), file=sys.stderr)
+        if slower:
+            sys.exit(1)
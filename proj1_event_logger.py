@@ -22,27 +22,57 @@ This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Optional
+import json
+import os
+from array import array
+from typing import Callable, Iterator, Optional, TextIO
+
+from game_commands import INVALID, CommandTable
+
+# The default number of events a JournalEventList keeps in memory
+JOURNAL_WINDOW = 64
+# The fewest events a JournalEventList keeps in memory: the order puzzle looks at the last three events
+JOURNAL_MIN_TAIL = 3
+# The default number of events between syncs of a journal to disk
+JOURNAL_SYNC_EVERY = 1000
+# The size in bytes of a journal's write buffer
+JOURNAL_BUFFER_SIZE = 1 << 16
 
 
-@dataclass
 class Event:
     """
     A node representing one event in an adventure game.
 
+    To keep long logs small, an event stores only its location id and its next command, which an event list
+    with a command table shares with the table. Its location's description is looked up through the describe
+    function of its list.
+
     Instance Attributes:
     - id_num: Integer id of this event's location
-    - description: Long description of this event's location
     - next_command: String command which leads this event to the next event, None if this is the last game event
     - next: Event object representing the next event in the game, or None if this is the last game event
     - prev: Event object representing the previous event in the game, None if this is the first game event
     """
+    __slots__ = ('id_num', 'next_command', 'next', 'prev')
     id_num: int
-    description: str
-    next_command: Optional[str] = None
-    next: Optional[Event] = None
-    prev: Optional[Event] = None
+    next_command: Optional[str]
+    next: Optional[Event]
+    prev: Optional[Event]
+
+    def __init__(self, id_num: int, *, next_command: Optional[str] = None, next_event: Optional[Event] = None,
+                 prev_event: Optional[Event] = None) -> None:
+        """Initialize a new event at the location with the given id.
+
+        The other arguments are keyword-only, since events no longer take a description as their second one.
+        """
+        self.id_num = id_num
+        self.next_command = next_command
+        self.next = next_event
+        self.prev = prev_event
+
+    def __repr__(self) -> str:
+        """Return a string representation of this event (without its neighbours)."""
+        return f'Event(id_num={self.id_num}, next_command={self.next_command!r})'
 
 
 class EventList:
@@ -52,24 +82,43 @@ class EventList:
     Instance Attributes:
         -first: The first event in the event list (or None if the list is empty).
         -last: The last event in the event list (or None if the list is empty).
+        -describe: Returns the description of the location with the given id, or None if descriptions
+         are not available.
+        -commands: The command table of the game, whose copy of each of its commands the events hold instead
+         of their own, or None.
 
     Representation Invariants:
         - If the list is not empty, then first.prev is None and last.next is None.
+        - len(self) is the number of events reachable from first.
     """
+    # Private Instance Attributes:
+    #   - _size: The number of events in this list.
     first: Optional[Event]
     last: Optional[Event]
+    describe: Optional[Callable[[int], str]]
+    commands: Optional[CommandTable]
+    _size: int
 
-    def __init__(self) -> None:
-        """Initialize a new empty event list."""
+    def __init__(self, describe: Optional[Callable[[int], str]] = None,
+                 commands: Optional[CommandTable] = None) -> None:
+        """Initialize a new empty event list, whose events' descriptions are looked up with describe, and whose
+        events share their commands with the command table commands, if it is given."""
 
         self.first = None
         self.last = None
+        self.describe = describe
+        self.commands = commands
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of events in this list."""
+        return self._size
 
-    def display_events(self) -> None:
-        """Display all events in chronological order."""
+    def display_events(self, out: Callable[[str], None] = print) -> None:
+        """Display all events in chronological order, or pass each line to out instead."""
         curr = self.first
         while curr:
-            print(f"Location: {curr.id_num}, Command: {curr.next_command}")
+            out(f"Location: {curr.id_num}, Command: {curr.next_command}")
             curr = curr.next
 
     def is_empty(self) -> bool:
@@ -81,35 +130,35 @@ class EventList:
         The given command is the command which was used to reach this new event, or None if this is the first
         event in the game.
         """
-        curr = self.first
-        if curr is None:
+        if self.last is None:
             self.first = event
-            self.last = event
         else:
-            while curr.next is not None:
-                curr = curr.next
-            curr.next = event
-            curr.next_command = command
-
-            event.prev = curr
-            self.last = event
+            self.last.next = event
+            self.last.next_command = command if command is None or self.commands is None \
+                else self.commands.shared(command)
+            event.prev = self.last
+        self.last = event
+        self._size += 1
 
     def remove_last_event(self) -> None:
         """Remove the last event from this event list.
         If the list is empty, do nothing."""
-        curr = self.first
-        if curr is None:
+        if self.last is None:
             return None
-        elif self.first == self.last:
+        elif self.first is self.last:
             self.first = None
             self.last = None
         else:
-            while curr.next.next is not None:
-                curr = curr.next
+            new_last = self.last.prev
+            self.last.prev = None
+            new_last.next = None
+            new_last.next_command = None
+            self.last = new_last
+        self._size -= 1
 
-            curr.next = None
-            curr.next_command = None
-            self.last = curr
+    def description_of(self, event: Event) -> Optional[str]:
+        """Return the description of the given event's location, or None if descriptions are not available."""
+        return None if self.describe is None else self.describe(event.id_num)
 
     def get_id_log(self) -> list[int]:
         """Return a list of all location IDs visited for each event in this list, in sequence."""
@@ -122,6 +171,409 @@ class EventList:
         return list_so_far
 
 
+class CompactEventList:
+    """
+    A game event list stored as parallel arrays instead of linked Event objects.
+
+    Each event takes three machine integers: its location id, the id of the command that leads to the next
+    event (-1 if there is none yet), and the index of the previous event (-1 for the first event). A command
+    of the game's command table is stored as its token id, and any other command is interned in a table owned
+    by the list. Descriptions are looked up with describe. The first and last attributes are lightweight
+    views that support the same prev/next navigation as Event.
+
+    Instance Attributes:
+        - describe: Returns the description of the location with the given id, or None if descriptions
+          are not available.
+        - commands: The command table of the game, or None if every command is interned by the list.
+
+    Representation Invariants:
+        - len(self._location_ids) == len(self._command_ids) == len(self._prev_indexes)
+        - all(self._prev_indexes[i] == i - 1 for i in range(len(self)))
+    """
+    # Private Instance Attributes:
+    #   - _location_ids: The location id of each event.
+    #   - _command_ids: For each event, the id of the command that leads to the next event, or -1 if it is the
+    #     last event: the token id of a command of commands, or -2 - i for the command at index i of
+    #     _other_commands.
+    #   - _prev_indexes: For each event, the index of the previous event, or -1 if it is the first event.
+    #   - _other_commands: The commands interned by this list, which are not commands of commands.
+    #   - _other_ids: A dictionary mapping each command in _other_commands to its id.
+    _location_ids: array
+    _command_ids: array
+    _prev_indexes: array
+    describe: Optional[Callable[[int], str]]
+    commands: Optional[CommandTable]
+    _other_commands: list[str]
+    _other_ids: dict[str, int]
+
+    def __init__(self, describe: Optional[Callable[[int], str]] = None,
+                 commands: Optional[CommandTable] = None) -> None:
+        """Initialize a new empty compact event list, whose events' descriptions are looked up with describe, and
+        whose commands are stored as their token ids in the command table commands, if it is given."""
+        self._location_ids = array('i')
+        self._command_ids = array('i')
+        self._prev_indexes = array('i')
+        self.describe = describe
+        self.commands = commands
+        self._other_commands = []
+        self._other_ids = {}
+
+    def __len__(self) -> int:
+        """Return the number of events in this list."""
+        return len(self._location_ids)
+
+    @property
+    def first(self) -> Optional[EventView]:
+        """The first event in this list, or None if the list is empty."""
+        return EventView(self, 0) if self._location_ids else None
+
+    @property
+    def last(self) -> Optional[EventView]:
+        """The last event in this list, or None if the list is empty."""
+        return EventView(self, len(self._location_ids) - 1) if self._location_ids else None
+
+    def display_events(self, out: Callable[[str], None] = print) -> None:
+        """Display all events in chronological order, or pass each line to out instead."""
+        for i in range(len(self._location_ids)):
+            out(f"Location: {self._location_ids[i]}, Command: {self.command_at(i)}")
+
+    def is_empty(self) -> bool:
+        """Return whether this event list is empty."""
+        return not self._location_ids
+
+    def add_event(self, event: Event, command: str = None) -> None:
+        """Add the given new event to the end of this event list.
+        The given command is the command which was used to reach this new event, or None if this is the first
+        event in the game.
+
+        Only the event's location id and command are kept; the Event object itself is not stored.
+        """
+        size = len(self._location_ids)
+        if size > 0:
+            self._command_ids[size - 1] = self._command_id(command)
+        self._location_ids.append(event.id_num)
+        self._command_ids.append(-1)
+        self._prev_indexes.append(size - 1)
+
+    def remove_last_event(self) -> None:
+        """Remove the last event from this event list.
+        If the list is empty, do nothing."""
+        if not self._location_ids:
+            return None
+        self._location_ids.pop()
+        self._command_ids.pop()
+        self._prev_indexes.pop()
+        if self._command_ids:
+            self._command_ids[-1] = -1
+        return None
+
+    def get_id_log(self) -> list[int]:
+        """Return a list of all location IDs visited for each event in this list, in sequence."""
+        return self._location_ids.tolist()
+
+    def location_at(self, index: int) -> int:
+        """Return the location id of the event at the given index."""
+        return self._location_ids[index]
+
+    def description_at(self, index: int) -> Optional[str]:
+        """Return the location description of the event at the given index, or None if descriptions are not
+        available."""
+        return None if self.describe is None else self.describe(self._location_ids[index])
+
+    def command_at(self, index: int) -> Optional[str]:
+        """Return the command leading from the event at the given index to the next one, or None if there is none.
+        """
+        command_id = self._command_ids[index]
+        if command_id >= 0:
+            return self.commands.texts[command_id]
+        return None if command_id == -1 else self._other_commands[-2 - command_id]
+
+    def prev_index(self, index: int) -> int:
+        """Return the index of the event before the event at the given index, or -1 if there is none."""
+        return self._prev_indexes[index]
+
+    def _command_id(self, command: Optional[str]) -> int:
+        """Return the id of the given command (see _command_ids), interning it in this list if it is not a command
+        of commands."""
+        if command is None:
+            return -1
+        if self.commands is not None:
+            token = self.commands.token(command)
+            if token != INVALID:
+                return token
+        command_id = self._other_ids.get(command)
+        if command_id is None:
+            command_id = -2 - len(self._other_commands)
+            self._other_commands.append(command)
+            self._other_ids[command] = command_id
+        return command_id
+
+
+class EventView:
+    """
+    A read-only view of one event stored in a CompactEventList, with the same attributes as Event.
+
+    Instance Attributes:
+        - events: The list that stores this event.
+        - index: The position of this event in the list.
+    """
+    __slots__ = ('events', 'index')
+    events: CompactEventList
+    index: int
+
+    def __init__(self, events: CompactEventList, index: int) -> None:
+        """Initialize a view of the event at the given index of events."""
+        self.events = events
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether other is a view of the same event in the same list."""
+        return isinstance(other, EventView) and other.events is self.events and other.index == self.index
+
+    @property
+    def id_num(self) -> int:
+        """Integer id of this event's location."""
+        return self.events.location_at(self.index)
+
+    @property
+    def description(self) -> Optional[str]:
+        """Description of this event's location, or None if descriptions are not available."""
+        return self.events.description_at(self.index)
+
+    @property
+    def next_command(self) -> Optional[str]:
+        """The command which leads this event to the next event, or None if this is the last event."""
+        return self.events.command_at(self.index)
+
+    @property
+    def prev(self) -> Optional[EventView]:
+        """The previous event, or None if this is the first event."""
+        prev_index = self.events.prev_index(self.index)
+        return None if prev_index == -1 else EventView(self.events, prev_index)
+
+    @property
+    def next(self) -> Optional[EventView]:
+        """The next event, or None if this is the last event."""
+        return EventView(self.events, self.index + 1) if self.index + 1 < len(self.events) else None
+
+
+class JournalEventList:
+    """
+    A game event list that streams every event to an append-only JSON Lines journal file, keeping only the
+    most recent events in memory, so that its memory use stays the same however long the game runs.
+
+    Each line of the journal is either {"id": <location id>, "command": <command that led to it>} for an added
+    event or {"undo": true} for a removed one. Writes are buffered, and the journal is flushed and synced to
+    disk every sync_every events and when the list is closed.
+
+    The first and last attributes are the oldest and newest events kept in memory, linked by prev and next
+    like the events of an EventList. At least JOURNAL_MIN_TAIL events (or every event, if there are fewer) are
+    always kept, which is enough for the order puzzle; after enough undos, the window is refilled from the
+    journal.
+
+    Instance Attributes:
+        - path: The path of the journal file.
+        - window: The most events kept in memory.
+        - sync_every: The number of events between syncs of the journal to disk.
+        - first: The oldest event kept in memory (or None if the list is empty).
+        - last: The last event in the list (or None if the list is empty).
+        - describe: Returns the description of the location with the given id, or None if descriptions
+          are not available.
+
+    Representation Invariants:
+        - self.window >= JOURNAL_MIN_TAIL
+        - min(len(self), JOURNAL_MIN_TAIL) <= self._kept <= self.window
+    """
+    # Private Instance Attributes:
+    #   - _file: The journal file, open for appending.
+    #   - _size: The number of events in this list.
+    #   - _kept: The number of events kept in memory.
+    #   - _unsynced: The number of events written since the journal was last synced to disk.
+    path: str
+    window: int
+    sync_every: int
+    first: Optional[Event]
+    last: Optional[Event]
+    describe: Optional[Callable[[int], str]]
+    _file: TextIO
+    _size: int
+    _kept: int
+    _unsynced: int
+
+    def __init__(self, path: str, window: int = JOURNAL_WINDOW, sync_every: int = JOURNAL_SYNC_EVERY,
+                 describe: Optional[Callable[[int], str]] = None) -> None:
+        """Initialize a new empty event list journalled to the file at path, replacing any existing file, whose
+        events' descriptions are looked up with describe."""
+        if window < JOURNAL_MIN_TAIL:
+            raise ValueError(f'window must be at least {JOURNAL_MIN_TAIL}, not {window}')
+        self.path = path
+        self.window = window
+        self.sync_every = sync_every
+        self.first = None
+        self.last = None
+        self._file = open(path, 'w', buffering=JOURNAL_BUFFER_SIZE, encoding='utf-8')
+        self.describe = describe
+        self._size = 0
+        self._kept = 0
+        self._unsynced = 0
+
+    def __len__(self) -> int:
+        """Return the number of events in this list, including those no longer kept in memory."""
+        return self._size
+
+    def __enter__(self) -> JournalEventList:
+        """Return this list, so that it is closed at the end of a with statement."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close this list."""
+        self.close()
+
+    def display_events(self, out: Callable[[str], None] = print) -> None:
+        """Display all events in chronological order, or pass each line to out instead."""
+        ids, commands = self._replay()
+        for i in range(len(ids)):
+            out(f"Location: {ids[i]}, Command: {commands[i + 1] if i + 1 < len(ids) else None}")
+
+    def is_empty(self) -> bool:
+        """Return whether this event list is empty."""
+        return self._size == 0
+
+    def add_event(self, event: Event, command: str = None) -> None:
+        """Add the given new event to the end of this event list.
+        The given command is the command which was used to reach this new event, or None if this is the first
+        event in the game.
+        """
+        self._file.write(json.dumps({'id': event.id_num, 'command': command}) + '\n')
+        self._link(event, command)
+        self._size += 1
+        if self._kept > self.window:
+            self._drop_first()
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def remove_last_event(self) -> None:
+        """Remove the last event from this event list.
+        If the list is empty, do nothing."""
+        if self._size == 0:
+            return None
+        self._file.write('{"undo": true}\n')
+        if self.first is self.last:
+            self.first = None
+            self.last = None
+        else:
+            new_last = self.last.prev
+            self.last.prev = None
+            new_last.next = None
+            new_last.next_command = None
+            self.last = new_last
+        self._size -= 1
+        self._kept -= 1
+        if self._kept < min(self._size, JOURNAL_MIN_TAIL):
+            self._refill()
+        return None
+
+    def description_of(self, event: Event) -> Optional[str]:
+        """Return the description of the given event's location, or None if descriptions are not available."""
+        return None if self.describe is None else self.describe(event.id_num)
+
+    def get_id_log(self) -> list[int]:
+        """Return a list of all location IDs visited for each event in this list, in sequence."""
+        return self._replay()[0]
+
+    def sync(self) -> None:
+        """Write any buffered events to the journal and sync it to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        """Sync and close the journal. Afterwards, the list can still be read but not changed."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def _link(self, event: Event, command: Optional[str]) -> None:
+        """Link the given event, reached by command, after the last event kept in memory."""
+        if self.last is None:
+            self.first = event
+        else:
+            self.last.next = event
+            self.last.next_command = command
+            event.prev = self.last
+        self.last = event
+        self._kept += 1
+
+    def _drop_first(self) -> None:
+        """Stop keeping the oldest event kept in memory."""
+        new_first = self.first.next
+        self.first.next = None
+        new_first.prev = None
+        self.first = new_first
+        self._kept -= 1
+
+    def _replay(self) -> tuple[list[int], list[Optional[str]]]:
+        """Return the location id of every event in this list, and the command that led to each one, by reading
+        back the journal."""
+        if not self._file.closed:
+            self._file.flush()
+        ids, commands = [], []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if 'undo' in record:
+                    ids.pop()
+                    commands.pop()
+                else:
+                    ids.append(record['id'])
+                    commands.append(record['command'])
+        return ids, commands
+
+    def _refill(self) -> None:
+        """Reload the most recent events (up to the window size) from the journal.
+
+        The journal is read backwards from its end, skipping each added event cancelled by a later undo, so
+        only the records written since the oldest reloaded event are read.
+        """
+        self._file.flush()
+        records = []
+        undone = 0
+        for line in _lines_backwards(self.path):
+            record = json.loads(line)
+            if 'undo' in record:
+                undone += 1
+            elif undone > 0:
+                undone -= 1
+            else:
+                records.append(record)
+                if len(records) == min(self.window, self._size):
+                    break
+        self.first = None
+        self.last = None
+        self._kept = 0
+        for record in reversed(records):
+            self._link(Event(record['id']), record['command'])
+
+
+def _lines_backwards(path: str) -> Iterator[bytes]:
+    """Yield the lines of the file at path from last to first, reading it in blocks from the end."""
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        partial = b''
+        while position > 0:
+            size = min(JOURNAL_BUFFER_SIZE, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + partial).split(b'\n')
+            partial = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line
+        if partial:
+            yield partial
+
+
 if __name__ == "__main__":
     # When you are ready to check your work with python_ta, uncomment the following lines.
     # (Delete the "#" and space before each line.)
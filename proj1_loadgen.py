@@ -0,0 +1,202 @@
+"""CSC111 Project 1: Text Adventure Game - Load Generator
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a load generator for the game server in `game_server`. It starts a server in a
+separate process, connects many clients to it at once, has each of them play the same walkthrough, and reports
+the latency of every turn (the time from sending an input to receiving the whole reply).
+
+Run it from the command line, e.g. `python proj1_loadgen.py --sessions 1000 10000`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from adventure import AdventureGame
+from game_server import REPLY_END
+from game_solver import WalkthroughSolver, session_inputs
+
+# The most clients that connect at the same time while the sessions are being set up
+CONNECT_BATCH = 500
+# The most seconds to wait for a server process to start accepting connections
+SERVER_START_TIMEOUT = 30.0
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return the q-th percentile (by the nearest-rank method) of the given values.
+
+    Preconditions:
+        - values != []
+        - 0 < q <= 100
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def walkthrough_inputs(game_data_file: str, initial_location_id: int) -> list[str]:
+    """Return the inputs a client types to win the game in game_data_file, as found by WalkthroughSolver.
+
+    Raise a ValueError if the game cannot be won.
+    """
+    game = AdventureGame(game_data_file, initial_location_id)
+    solution = WalkthroughSolver(game).solve(initial_location_id)
+    if solution is None:
+        raise ValueError(f'{game_data_file} cannot be won from location {initial_location_id}')
+    return session_inputs(game, solution.commands)
+
+
+async def _connect(path: Optional[str], host: str,
+                   port: int) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to the server on the Unix socket at path if it is given, and otherwise at host and port."""
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _play(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, inputs: list[str],
+                go: asyncio.Event, latencies: list[float]) -> int:
+    """Wait for go, then send each of the given inputs on a connected client, appending the latency of each
+    turn (in seconds) to latencies. Return the number of turns played, which is smaller than len(inputs) if the
+    server ended the game early."""
+    await go.wait()
+    turns = 0
+    try:
+        for command in inputs:
+            start = time.perf_counter()
+            writer.write(command.encode('utf-8') + b'\n')
+            await reader.readuntil(REPLY_END)
+            latencies.append(time.perf_counter() - start)
+            turns += 1
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+    return turns
+
+
+async def run_load(num_sessions: int, inputs: list[str], path: Optional[str] = None, host: str = '127.0.0.1',
+                   port: int = 8111) -> dict[str, float]:
+    """Return the turn latencies of num_sessions clients playing the given inputs at once against the server
+    on the given address (see _connect).
+
+    Every client connects and receives the first reply before any of them plays a turn, so that all of the
+    sessions are open for the whole measurement.
+    """
+    clients = []
+    for first in range(0, num_sessions, CONNECT_BATCH):
+        batch = await asyncio.gather(*(_connect(path, host, port)
+                                       for _ in range(first, min(first + CONNECT_BATCH, num_sessions))))
+        await asyncio.gather(*(reader.readuntil(REPLY_END) for reader, _ in batch))
+        clients.extend(batch)
+
+    go = asyncio.Event()
+    latencies = []
+    games = [asyncio.create_task(_play(reader, writer, inputs, go, latencies)) for reader, writer in clients]
+    start = time.perf_counter()
+    go.set()
+    turns = sum(await asyncio.gather(*games))
+    elapsed = time.perf_counter() - start
+    return {'sessions': num_sessions,
+            'turns': turns,
+            'seconds': elapsed,
+            'turns_per_s': turns / elapsed,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'max_ms': max(latencies) * 1000}
+
+
+def raise_file_limit(needed: int) -> None:
+    """Raise this process's limit on open files to at least needed (if the hard limit allows it), since each
+    client holds a socket open."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def start_server(path: str, game_data_file: str, initial_location_id: int) -> subprocess.Popen:
+    """Start a game server process listening on the Unix socket at path, and return it once it accepts
+    connections."""
+    server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            'game_server.py'),
+                               '--unix', path, '--data', game_data_file, '--start', str(initial_location_id)])
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while not os.path.exists(path):
+        if server.poll() is not None or time.monotonic() > deadline:
+            server.kill()
+            raise RuntimeError('The game server did not start')
+        time.sleep(0.05)
+    return server
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    """Return the command-line options of the load generator."""
+    parser = argparse.ArgumentParser(description="Measure the turn latency of the game server under load.")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1000, 10_000],
+                        help="the numbers of concurrent sessions to measure")
+    parser.add_argument('--data', default='game_data.json', help="the game data file")
+    parser.add_argument('--start', type=int, default=1, help="the ID of the location every session starts at")
+    parser.add_argument('--unix', metavar='PATH',
+                        help="use the server already listening on the Unix socket at PATH")
+    parser.add_argument('--host', help="use the server already listening on TCP at this host")
+    parser.add_argument('--port', type=int, default=8111, help="the TCP port of the server given by --host")
+    parser.add_argument('--output', help="also write the results to this file as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+
+    options = _parse_args(sys.argv[1:])
+    raise_file_limit(max(options.sessions) + 64)
+    walkthrough = walkthrough_inputs(options.data, options.start)
+    results = []
+    for count in options.sessions:
+        with tempfile.TemporaryDirectory() as directory:
+            server_process = None
+            socket_path = options.unix
+            if options.unix is None and options.host is None:
+                socket_path = os.path.join(directory, 'game.sock')
+                # A fresh server for every run, so each measurement starts from an idle process
+                server_process = start_server(socket_path, options.data, options.start)
+            try:
+                result = asyncio.run(run_load(count, walkthrough, socket_path, options.host, options.port))
+            finally:
+                if server_process is not None:
+                    server_process.terminate()
+                    server_process.wait()
+        results.append(result)
+        print(f"{count:>6} sessions: {result['turns']} turns in {result['seconds']:.2f} s "
+              f"({result['turns_per_s']:.0f} turns/s), p50 {result['p50_ms']:.2f} ms, "
+              f"p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+    if options.output is not None:
+        with open(options.output, 'w') as f:
+            json.dump(results, f, indent=2)
@@ -21,9 +21,36 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 from __future__ import annotations
+import contextlib
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import ContextManager, Optional
+
 from proj1_event_logger import Event, EventList
 from adventure import AdventureGame
+from game_commands import CompiledScript
 from game_entities import Location
+from game_profile import Profiler
+
+# The world shared by every script run in a worker process of run_parallel, set once when the worker starts.
+_worker_game: Optional[AdventureGame] = None
+
+
+@dataclass
+class SimulationResult:
+    """
+    The outcome of running one command script through a simulation.
+
+    Instance Attributes:
+        - id_log: The location IDs of every event in the simulation, in order.
+        - final_location_id: The ID of the location the player ends at.
+        - inventory: The names of the items held at the end, in the order they were picked up.
+    """
+    id_log: list[int]
+    final_location_id: int
+    inventory: list[str]
 
 
 class AdventureGameSimulation:
@@ -32,43 +59,80 @@ class AdventureGameSimulation:
     # Private Instance Attributes:
     #   - _game: The AdventureGame instance that this simulation uses.
     #   - _events: A collection of the events to process during the simulation.
+    #   - _inventory: The names of the items held after the simulated commands.
+    #   - _profiler: The profiler enabled while this simulation loads, generates its events and runs, or None.
     _game: AdventureGame
     _events: EventList
+    _inventory: list[str]
+    _profiler: Optional[Profiler]
 
-    def __init__(self, game_data_file: str, initial_location_id: int, commands: list[str]) -> None:
+    def __init__(self, game_data_file: str, initial_location_id: int, commands: list[str],
+                 profiler: Optional[Profiler] = None) -> None:
         """Initialize a new game simulation based on the given game data, that runs through the given commands.
 
+        Raise a game_commands.ScriptError if a command cannot be carried out (see CommandTable.compile).
+
+        If a profiler is given, loading the world, generating the events and run() are profiled with it.
+
+        Preconditions:
+        - len(commands) > 0
+        - all commands in the given list are valid commands at each associated location in the game
+        """
+        self._profiler = profiler
+        with self._profiling():
+            self._setup(AdventureGame(game_data_file, initial_location_id), initial_location_id, commands)
+
+    @classmethod
+    def from_game(cls, game: AdventureGame, initial_location_id: int, commands: list[str],
+                  profiler: Optional[Profiler] = None) -> AdventureGameSimulation:
+        """Return a new simulation that runs through the given commands in an already loaded game, profiled with
+        profiler if it is given.
+
+        The game is only read from, so one game can be shared by any number of simulations.
+
         Preconditions:
         - len(commands) > 0
         - all commands in the given list are valid commands at each associated location in the game
         """
+        sim = cls.__new__(cls)
+        sim._profiler = profiler
+        with sim._profiling():
+            sim._setup(game, initial_location_id, commands)
+        return sim
+
+    def _profiling(self) -> ContextManager:
+        """Return a context manager that enables this simulation's profiler, if it has one."""
+        return contextlib.nullcontext() if self._profiler is None else self._profiler
+
+    def _setup(self, game: AdventureGame, initial_location_id: int, commands: list[str]) -> None:
+        """Initialize this simulation to run through the given commands in game, starting at initial_location_id.
+        """
         self._events = EventList()
-        self._game = AdventureGame(game_data_file, initial_location_id)
+        self._game = game
+        self._inventory = []
+        start = self._game.get_location(initial_location_id)
 
-        self._events.first = Event(id_num=self._game.get_location().id_num,
-                                   description=self._game.get_location().brief_description)
+        self._events.add_event(Event(start.id_num))
 
-        self.generate_events(commands, self._game.get_location())
+        self.generate_events(commands, start)
 
     def generate_events(self, commands: list[str], current_location: Location) -> None:
         """Generate all events in this simulation.
 
+        The commands are compiled with the game's command table first, so a ScriptError is raised before any
+        event is generated if one of them cannot be carried out.
+
         Preconditions:
         - len(commands) > 0
-        - all commands in the given list are valid commands at each associated location in the game
         """
-
-        for command in commands:
-            if "Item" in command:
-                new_event = Event(current_location.id_num, current_location.brief_description)
-                self._events.add_event(new_event, command)
-            else:
-                next_loc_id = current_location.available_commands[command]
-                next_location = self._game.get_location(next_loc_id)  # Location object
-                new_event = Event(next_location.id_num, next_location.brief_description)
-
-                self._events.add_event(new_event, command)
-                current_location = next_location
+        if self._profiler is not None:
+            self._profiler.count('simulation.commands', len(commands))
+        table = self._game.get_command_table()
+        script = table.compile(current_location.id_num, commands, self._inventory)
+        texts, location_ids = table.texts, script.location_ids
+        for i, token in enumerate(script.tokens):
+            self._events.add_event(Event(location_ids[i + 1]), texts[token])
+        self._inventory = script.inventory
 
     def get_id_log(self) -> list[int]:
         """
@@ -86,16 +150,91 @@ class AdventureGameSimulation:
 
         return self._events.get_id_log()
 
+    def get_result(self) -> SimulationResult:
+        """Return the id log and final state of this simulation."""
+        return SimulationResult(self._events.get_id_log(), self._events.last.id_num, list(self._inventory))
+
     def run(self) -> None:
         """Run the game simulation and log location descriptions."""
-        current_event = self._events.first
+        with self._profiling():
+            current_event = self._events.first
+
+            while current_event:
+                print(self._game.get_location(current_event.id_num).brief_description)
+                if current_event is not self._events.last:
+                    print("You choose:", current_event.next_command)
+
+                current_event = current_event.next
+
+
+def simulate_batch(game: AdventureGame, initial_location_id: int,
+                   scripts: list[list[str]]) -> list[SimulationResult]:
+    """Return the result of running each of the given command scripts from initial_location_id in game,
+    in the same order as scripts.
+
+    The world is loaded once (by the caller) and shared by every script, so no script re-reads the game data
+    or rebuilds any location, item, key or puzzle. Every script is compiled to integer tokens with the game's
+    command table before any result is built, so a malformed script raises a ScriptError up front.
+
+    Preconditions:
+        - every script satisfies the preconditions of AdventureGameSimulation
+    """
+    table = game.get_command_table()
+    compiled = [table.compile(initial_location_id, commands) for commands in scripts]
+    return [_result_of(script) for script in compiled]
+
+
+def _result_of(script: CompiledScript) -> SimulationResult:
+    """Return the result of simulating the given compiled script."""
+    return SimulationResult(script.location_ids.tolist(), script.location_ids[-1], script.inventory)
+
+
+def run_batch(game_data_file: str, initial_location_id: int, scripts: list[list[str]]) -> list[SimulationResult]:
+    """Load the game in game_data_file once and return the result of running each of the given command scripts
+    from initial_location_id, in the same order as scripts.
+    """
+    return simulate_batch(AdventureGame(game_data_file, initial_location_id), initial_location_id, scripts)
+
+
+def run_parallel(game: AdventureGame, initial_location_id: int, scripts: list[list[str]],
+                 max_workers: Optional[int] = None, chunk_size: Optional[int] = None) -> list[SimulationResult]:
+    """Return the result of running each of the given command scripts from initial_location_id in game,
+    in the same order as scripts, spreading the work across a pool of max_workers processes.
+
+    Each worker receives the already loaded game once, when it starts, instead of reading the game data
+    itself. Scripts are sent to the workers in chunks of chunk_size scripts to cut down on inter-process
+    communication; by default each worker gets about four chunks. max_workers defaults to the number of CPUs.
+
+    Preconditions:
+        - every script satisfies the preconditions of AdventureGameSimulation
+        - max_workers is None or max_workers >= 1
+        - chunk_size is None or chunk_size >= 1
+    """
+    if not scripts:
+        return []
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = math.ceil(len(scripts) / (max_workers * 4))
+    chunks = [scripts[i:i + chunk_size] for i in range(0, len(scripts), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(game,)) as executor:
+        results = []
+        for chunk_results in executor.map(_run_chunk, [initial_location_id] * len(chunks), chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def _init_worker(game: AdventureGame) -> None:
+    """Store the world shared by every script run in this worker process."""
+    global _worker_game
+    _worker_game = game
 
-        while current_event:
-            print(current_event.description)
-            if current_event is not self._events.last:
-                print("You choose:", current_event.next_command)
 
-            current_event = current_event.next
+def _run_chunk(initial_location_id: int, scripts: list[list[str]]) -> list[SimulationResult]:
+    """Return the results of running the given chunk of scripts against this worker's world."""
+    return simulate_batch(_worker_game, initial_location_id, scripts)
 
 
 if __name__ == "__main__":
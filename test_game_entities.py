@@ -0,0 +1,80 @@
+"""CSC111 Project 1: Text Adventure Game - Entity Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains pytest tests for the entity classes in `game_entities`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import pytest
+
+from adventure import AdventureGame
+from game_entities import Player, Puzzle
+
+
+def test_starting_inventory_is_weighed() -> None:
+    """Test that a player's starting inventory counts towards its weight and the weight check."""
+    game = AdventureGame('game_data.json', 1)
+    player = Player(['Monitor'], 0, game.item_weight)
+    assert player.get_weight() == game.item_weight('Monitor') > 0
+    assert game.sum_inv_weight(player) == player.get_weight()
+
+
+def test_starting_inventory_needs_weights() -> None:
+    """Test that no item can be added without a weight when the player has no way to weigh it."""
+    with pytest.raises(ValueError):
+        Player(['Monitor'], 0)
+    with pytest.raises(ValueError):
+        Player([], 0).add_item('Monitor')
+
+
+def test_added_items_are_weighed() -> None:
+    """Test that added items are weighed by the player unless a weight is given, and that rounding error in the
+    total weight does not affect equality."""
+    game = AdventureGame('game_data.json', 1)
+    player = Player([], 0, game.item_weight)
+    for item in ['USB Drive', 'Laptop Charger', 'Monitor']:
+        player.add_item(item)
+    assert player.get_weight() == game.item_weight('USB Drive') + game.item_weight('Laptop Charger') + 10.0
+    other = Player([], 0, game.item_weight)
+    other.add_item('Monitor', 0.1)
+    assert other.get_weight() == 0.1
+
+    weights = {'a': 0.1, 'b': 0.2, 'c': 0.3}
+    juggled, direct = Player([], 0, weights.get), Player(['c'], 0, weights.get)
+    for item in 'abc':
+        juggled.add_item(item)
+    juggled.remove_item('a')
+    juggled.remove_item('b')
+    assert juggled.get_weight() != direct.get_weight()
+    assert juggled == direct
+
+
+def test_puzzle_kind_is_required() -> None:
+    """Test that a puzzle cannot be built without a kind, since the right kind depends on the puzzle."""
+    with pytest.raises(TypeError):
+        Puzzle(1, 'What comes after O, T, T, F, F, S, S, E?', 'n')
+    assert Puzzle(1, 'What comes after O, T, T, F, F, S, S, E?', 'n', 'logic').kind == 'logic'
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pytest.main(['test_game_entities.py'])
@@ -0,0 +1,50 @@
+"""CSC111 Project 1: Text Adventure Game - World Overlay Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains pytest tests for the copy-on-write overlay in `game_overlay`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import pytest
+
+from adventure import AdventureGame
+
+
+@pytest.mark.parametrize('touched', [False, True])
+def test_items_cannot_be_changed_in_place(touched: bool) -> None:
+    """Test that a location's items are a tuple, whether or not the game has copied them into its overlay, so
+    that they can only be changed through the overlay."""
+    game = AdventureGame('game_data.json', 1)
+    location = game.get_location(4)
+    if touched:
+        location.add_item('Room Key')
+    items = location.items
+    assert isinstance(items, tuple)
+    with pytest.raises(AttributeError):
+        items.append('Monitor')
+    location.remove_item('USB Drive')
+    assert 'USB Drive' in items and 'USB Drive' not in game.get_location(4).items
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pytest.main(['test_game_overlay.py'])
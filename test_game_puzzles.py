@@ -0,0 +1,49 @@
+"""CSC111 Project 1: Text Adventure Game - Puzzle Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains pytest tests for the puzzles in `game_puzzles`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import pytest
+
+from adventure import AdventureGame
+from game_session import GameSession
+from proj1_event_logger import CompactEventList, EventList
+
+
+@pytest.mark.parametrize('log_class', [EventList, CompactEventList])
+def test_order_puzzle_with_short_log_fails(log_class: type) -> None:
+    """Test that the order puzzle guarding the Crystal Key fails, rather than crashing, when it is attempted
+    before two events have been logged (by starting at its location, 2)."""
+    session = GameSession(AdventureGame('game_data.json', 2), log=log_class())
+    session.start()
+    session.step('pickitem')
+    result = session.step('Crystal Key')
+    assert 'Failed puzzle' in result.output
+    assert 'Crystal Key' not in session.player.get_inventory()
+    assert result.ongoing
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pytest.main(['test_game_puzzles.py'])
@@ -0,0 +1,58 @@
+"""CSC111 Project 1: Text Adventure Game - Replay Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains pytest tests for the replays in `game_replay`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import pytest
+
+from adventure import AdventureGame
+from game_replay import Replay
+from game_session import GameSession
+from game_solver import session_inputs
+
+
+def test_replay_agrees_with_session() -> None:
+    """Test that replaying the log of a game, with moves, pickups (including one of an item that was picked up
+    before) and drops, ends in the same state as the session that played it."""
+    game = AdventureGame('game_data.json', 1)
+    commands = ["Picked up Item Room Key", "go south 2", "go east", "Picked up Item Laptop Charger",
+                "Dropped Item Laptop Charger", "Picked up Item Laptop Charger", "go west", "Dropped Item Room Key"]
+    session = GameSession(AdventureGame('game_data.json', 1))
+    session.start()
+    for line in session_inputs(game, commands):
+        session.step(line)
+    assert len(session.log) == len(commands) + 1
+
+    replay = Replay.from_log(game, session.log)
+    state = replay.seek(len(replay) - 1)
+    assert (state.steps_remaining, state.score) == (session.steps_remaining, session.player.score)
+    assert list(state.inventory) == session.player.get_inventory()
+    assert list(state.picked_items) == session.picked_items
+    for loc_id in session.game.get_graph().location_ids:
+        assert sorted(replay.items_at(state, loc_id)) == sorted(session.game.get_location(loc_id).items)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pytest.main(['test_game_replay.py'])
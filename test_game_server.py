@@ -0,0 +1,129 @@
+"""CSC111 Project 1: Text Adventure Game - Game Server Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains pytest tests for the game server in `game_server`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import asyncio
+import gc
+import os
+import weakref
+
+from adventure import AdventureGame
+from game_server import FAILED_REPLY, REPLY_END, TOO_LONG_REPLY, GameServer
+from game_session import GameSession
+
+
+class _TrackingServer(GameServer):
+    """A GameServer that keeps a weak reference to every session it starts."""
+    sessions: list[weakref.ref]
+
+    def new_session(self) -> GameSession:
+        """Return a new session, remembering a weak reference to it."""
+        session = super().new_session()
+        self.sessions.append(weakref.ref(session))
+        return session
+
+
+def test_parked_session_is_freed(tmp_path) -> None:
+    """Test that a parked session is only held by its file, and is restored when the client sends input."""
+    server = _TrackingServer(AdventureGame('game_data.json', 1), 1, park_after=0.01, park_dir=str(tmp_path))
+    server.sessions = []
+
+    async def play() -> None:
+        listener = await server.start(path=str(tmp_path / 'game.sock'))
+        reader, writer = await asyncio.open_unix_connection(str(tmp_path / 'game.sock'))
+        await reader.readuntil(REPLY_END)
+        await asyncio.sleep(0.2)
+        gc.collect()
+        assert server.parked_sessions == 1
+        assert server.sessions[0]() is None
+        assert len([name for name in os.listdir(tmp_path) if name.startswith('session-')]) == 1
+
+        writer.write(b'look\n')
+        reply = await reader.readuntil(REPLY_END)
+        assert b'Location 1' in reply
+        assert server.parked_sessions == 0
+        assert not [name for name in os.listdir(tmp_path) if name.startswith('session-')]
+        writer.close()
+        listener.close()
+
+    asyncio.run(play())
+
+
+class _FailingServer(GameServer):
+    """A GameServer whose sessions raise an error on every step."""
+
+    def new_session(self) -> GameSession:
+        """Return a new session whose step method raises a RuntimeError."""
+        session = super().new_session()
+
+        def step(_: str) -> None:
+            """Raise a RuntimeError."""
+            raise RuntimeError('step failed')
+
+        session.step = step
+        return session
+
+
+async def _exchange(server: GameServer, tmp_path, line: bytes) -> tuple[bytes, bytes, list[dict]]:
+    """Connect to server, send line after the first reply, and return the next reply, whatever the server sends
+    after that before closing the connection, and the contexts of any errors reported to the event loop."""
+    errors = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+    listener = await server.start(path=str(tmp_path / 'game.sock'))
+    reader, writer = await asyncio.open_unix_connection(str(tmp_path / 'game.sock'))
+    await reader.readuntil(REPLY_END)
+    writer.write(line)
+    reply = await reader.readuntil(REPLY_END)
+    rest = await reader.read()
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    return reply, rest, errors
+
+
+def test_too_long_line_closes_cleanly(tmp_path) -> None:
+    """Test that a line longer than the stream's limit gets a reply and closes the connection, without an error
+    escaping to the event loop."""
+    server = GameServer(AdventureGame('game_data.json', 1), 1)
+    reply, rest, errors = asyncio.run(_exchange(server, tmp_path, b'x' * (1 << 17) + b'\n'))
+    assert reply == TOO_LONG_REPLY and rest == b''
+    assert not errors
+    assert server.active_sessions == 0 and server.failed_sessions == 0
+
+
+def test_failing_session_closes_cleanly(tmp_path) -> None:
+    """Test that a session raising an error gets a reply and closes the connection, without the error escaping
+    to the event loop."""
+    server = _FailingServer(AdventureGame('game_data.json', 1), 1)
+    reply, rest, errors = asyncio.run(_exchange(server, tmp_path, b'look\n'))
+    assert reply == FAILED_REPLY and rest == b''
+    assert not errors
+    assert server.active_sessions == 0 and server.failed_sessions == 1
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    import pytest
+    pytest.main(['test_game_server.py'])
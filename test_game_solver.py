@@ -0,0 +1,72 @@
+"""CSC111 Project 1: Text Adventure Game - Walkthrough Solver Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains pytest tests for the walkthrough solver in `game_solver`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import pytest
+
+from adventure import AdventureGame
+from game_puzzles import PUZZLE_KINDS, register_puzzle_kind
+from game_solver import WalkthroughSolver
+
+
+def _write_world(tmp_path, weights: dict[str, float], answer: float, kind: str = 'weight') -> str:
+    """Write a copy of game_data.json with the given item weights, and the given answer and kind for the weight
+    puzzle guarding the Lucky Mug, to tmp_path, and return its filename."""
+    with open('game_data.json') as f:
+        data = json.load(f)
+    for item_data in data['items']:
+        item_data['weight'] = weights[item_data['name']]
+    data['puzzles'][2].update(answer=answer, kind=kind)
+    filename = str(tmp_path / 'game_data.json')
+    with open(filename, 'w') as f:
+        json.dump(data, f)
+    return filename
+
+
+def test_weight_puzzle_with_rounding_error(tmp_path) -> None:
+    """Test that the solver accepts the weight puzzle when the weights only add up to its answer up to rounding
+    error, as the game does."""
+    weights = {'USB Drive': 0.1, 'Laptop Charger': 0.2, 'Monitor': 0.3, 'Lucky Mug': 0.0}
+    assert 0.1 + 0.2 + 0.3 != 0.6
+    solution = WalkthroughSolver(AdventureGame(_write_world(tmp_path, weights, 0.6), 1)).solve(1)
+    assert solution is not None and 'Picked up Item Lucky Mug' in solution.commands
+
+
+def test_unknown_puzzle_kind(tmp_path) -> None:
+    """Test that the solver refuses a puzzle of a kind it cannot check, instead of treating it as solved."""
+    register_puzzle_kind('never', False, lambda puzzle: lambda attempt: False)
+    try:
+        game = AdventureGame(_write_world(tmp_path, {'USB Drive': 2, 'Laptop Charger': 4, 'Monitor': 10,
+                                                     'Lucky Mug': 5}, 21, 'never'), 1)
+        with pytest.raises(ValueError):
+            WalkthroughSolver(game)
+    finally:
+        del PUZZLE_KINDS['never']
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pytest.main(['test_game_solver.py'])
@@ -0,0 +1,44 @@
+"""CSC111 Project 1: Text Adventure Game - Game State Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains pytest tests for the snapshots in `game_state`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import pytest
+
+from game_state import PersistentArray
+
+
+def test_negative_index_raises() -> None:
+    """Test that reading or setting a negative index raises an IndexError instead of hanging."""
+    array = PersistentArray().set(3, 'x')
+    with pytest.raises(IndexError):
+        array.set(-1, 'y')
+    with pytest.raises(IndexError):
+        array.get(-1)
+    assert array.get(3) == 'x' and array.get(1000) is None
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pytest.main(['test_game_state.py'])
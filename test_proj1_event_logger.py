@@ -0,0 +1,66 @@
+"""CSC111 Project 1: Text Adventure Game - Event Logger Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains pytest tests for the event lists in `proj1_event_logger`.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import pytest
+
+from adventure import AdventureGame
+from game_commands import PICK_PREFIX
+from proj1_event_logger import CompactEventList, Event, EventList
+
+
+@pytest.mark.parametrize('log_class', [EventList, CompactEventList])
+def test_commands_are_kept_per_list(log_class: type) -> None:
+    """Test that the commands of a list, whether or not they are commands of its game, are kept by the list
+    and the game's command table rather than in any table shared by every list."""
+    game = AdventureGame('game_data.json', 1)
+    table = game.get_command_table()
+    events = log_class(game.describe, table)
+    events.add_event(Event(1))
+    events.add_event(Event(1), ''.join([PICK_PREFIX, 'Room Key']))
+    events.add_event(Event(2), 'go south 1')
+    events.add_event(Event(2), 'teleport')
+    commands = []
+    event = events.first
+    while event.next is not None:
+        commands.append(event.next_command)
+        event = event.next
+    assert commands == ['Picked up Item Room Key', 'go south 1', 'teleport']
+    assert 'teleport' not in table.texts
+
+
+def test_event_list_shares_table_commands() -> None:
+    """Test that an EventList's events hold the command table's copy of each of its commands."""
+    game = AdventureGame('game_data.json', 1)
+    table = game.get_command_table()
+    events = EventList(game.describe, table)
+    events.add_event(Event(1))
+    events.add_event(Event(1), ''.join([PICK_PREFIX, 'Room Key']))
+    assert events.first.next_command is table.texts[table.token('Picked up Item Room Key')]
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    # import python_ta
+    # python_ta.check_all(config={
+    #     'max-line-length': 120,
+    #     'disable': ['R1705', 'E9998', 'E9999']
+    # })
+    pytest.main(['test_proj1_event_logger.py'])